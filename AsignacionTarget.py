@@ -0,0 +1,226 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Nombres de las columnas del archivo de target que corresponden a los índices de la serie de porcentajes
+COLUMNAS_TARGET = {'CLIENTE': 'CADENA', 'LINEA LG': 'LINEA'}
+
+
+def PrepararTarget(df_target):
+    """
+    Prepara la tabla de target para operarla con la serie de porcentajes por sede.
+
+    Parámetros:
+    - df_target (pandas.DataFrame): Tabla cargada de "BASE TARGET.xlsx", con las columnas 'CLIENTE' y 'LINEA LG'
+      seguidas de una columna de unidades por mes.
+
+    Retorna:
+    - df_target (pandas.DataFrame): Tabla con índice (CADENA, LINEA) y una columna por mes.
+    """
+
+    # Cambiar los nombres de las dos primeras columnas para que coincidan con los indices de la serie de porcentajes
+    df_target = df_target.rename(columns = COLUMNAS_TARGET)
+
+    # Convertir las dos primeras columnas en índices para poder operar el dataframe con la serie
+    return df_target.set_index(['CADENA', 'LINEA'])
+
+
+def AsignarTarget(df_target, porcentajes_por_sede):
+    """
+    Reparte el target mensual de cada cadena y línea entre sus puntos de venta según su peso en las ventas.
+
+    Parámetros:
+    - df_target (pandas.DataFrame): Tabla de target con índice (CADENA, LINEA) y una columna por mes
+      (ver `PrepararTarget`).
+    - porcentajes_por_sede (pandas.Series): Peso de cada punto de venta, con índice (CADENA, LINEA, PUNTO DE VENTA)
+      (ver `CalcularDistribucion`).
+
+    Retorna:
+    - df_target_por_sede (pandas.DataFrame): Target de unidades de cada punto de venta por mes, con el mismo índice de
+      `porcentajes_por_sede` y las mismas columnas de `df_target`. Las sedes de una cadena y línea sin target
+      quedan vacías.
+    - df_target_sin_distribucion (pandas.DataFrame): Filas de `df_target` cuya cadena y línea no tienen ventas,
+      por lo que su target no se pudo repartir.
+
+    Cada fila de porcentajes se asocia a su fila de target por posición (una búsqueda por cada cadena y línea
+    distinta), y todos los meses se calculan con una sola multiplicación de la matriz de target por el vector de
+    porcentajes, sin recorrer los meses.
+
+    Ejemplo:
+    >>> df_target_por_sede, df_target_sin_distribucion = AsignarTarget(df_target, porcentajes_por_sede)
+    >>> print(df_target_por_sede.loc['ALKOSTO'].head(2))
+                            ENERO    FEBRERO  ...      JULIO     AGOSTO
+    LINEA     PUNTO DE VENTA                  ...
+    Dual Cool AK170      20.754011  44.318182  ...  44.318182  77.417112
+              AKB30      20.289282  43.325793  ...  43.325793  75.683598
+    """
+
+    # Posición en la tabla de target de cada cadena y línea distinta de la serie de porcentajes
+    pares = porcentajes_por_sede.index.droplevel(-1)
+    codigos, pares_unicos = pares.factorize()
+    indice_target = pd.MultiIndex.from_arrays([np.asarray(nivel, dtype = object)
+        for nivel in (df_target.index.get_level_values(0), df_target.index.get_level_values(1))])
+    posiciones_unicas = indice_target.get_indexer(pd.MultiIndex.from_arrays([np.asarray(nivel, dtype = object)
+        for nivel in (pares_unicos.get_level_values(0), pares_unicos.get_level_values(1))]))
+    posiciones = posiciones_unicas[codigos]
+
+    # Multiplicar la fila de target de cada sede por su porcentaje, para todos los meses a la vez
+    valores_target = np.vstack([df_target.to_numpy(dtype = np.float64),
+                                np.full((1, df_target.shape[1]), np.nan)])   # Fila vacía para las posiciones -1
+    matriz = valores_target[posiciones] * porcentajes_por_sede.to_numpy(dtype = np.float64)[:, np.newaxis]
+
+    df_target_por_sede = pd.DataFrame(matriz, index = porcentajes_por_sede.index, columns = df_target.columns)
+
+    # Filas de target que no recibieron ninguna sede
+    con_sedes = np.zeros(len(df_target), dtype = bool)
+    con_sedes[posiciones_unicas[posiciones_unicas >= 0]] = True
+    df_target_sin_distribucion = df_target[~con_sedes]
+
+    return df_target_por_sede, df_target_sin_distribucion
+
+
+def ReasignarTarget(df_target_por_sede, df_target, porcentajes_por_sede, Cadenas):
+    """
+    Vuelve a repartir el target solo para las cadenas indicadas, conservando la asignación de las demás.
+
+    Parámetros:
+    - df_target_por_sede (pandas.DataFrame): Asignación anterior (ver `AsignarTarget`).
+    - df_target (pandas.DataFrame): Tabla de target con índice (CADENA, LINEA).
+    - porcentajes_por_sede (pandas.Series): Porcentajes por sede que incluyen al menos las cadenas indicadas. Como el
+      peso de cada sede solo depende de las ventas de su cadena, pueden calcularse solo con las ventas nuevas
+      de esas cadenas.
+    - Cadenas (list): Cadenas cuyas ventas cambiaron.
+
+    Retorna:
+    - df_target_por_sede (pandas.DataFrame): Asignación actualizada, ordenada por su índice y con las columnas de
+      `df_target`. Las filas de las demás cadenas son las de la asignación anterior, sin cambios.
+    - df_target_sin_distribucion (pandas.DataFrame): Filas de `df_target` de las cadenas indicadas cuya línea no
+      tiene ventas (ver `AsignarTarget`).
+
+    Ejemplo:
+    >>> porcentajes_jumbo = CalcularPorcentajesPorSede(df_ventas[df_ventas['CADENA'] == 'JUMBO'])
+    >>> df_target_por_sede, df_target_sin_distribucion = ReasignarTarget(df_target_por_sede, df_target,
+    ...                                                                  porcentajes_jumbo, ['JUMBO'])
+    """
+
+    # Recalcular solo las filas de las cadenas indicadas
+    en_cadenas = porcentajes_por_sede.index.get_level_values('CADENA').isin(Cadenas)
+    target_en_cadenas = df_target.index.get_level_values('CADENA').isin(Cadenas)
+    df_nuevas, df_target_sin_distribucion = AsignarTarget(df_target[target_en_cadenas],
+                                                          porcentajes_por_sede[en_cadenas])
+
+    # Conservar las filas de las demás cadenas
+    conservar = ~df_target_por_sede.index.get_level_values('CADENA').isin(Cadenas)
+    df_resultado = pd.concat([df_target_por_sede[conservar], df_nuevas])
+    return df_resultado.reindex(columns = df_target.columns).sort_index(), df_target_sin_distribucion
+
+
+def TargetFormatoLargo(df_target_por_sede, NombreValor = 'TARGET UNIDADES'):
+    """
+    Convierte el target por sede a formato largo, con una fila por sede y mes.
+
+    Parámetros:
+    - df_target_por_sede (pandas.DataFrame): Target por sede con una columna por mes (ver `AsignarTarget`).
+    - NombreValor (str): Nombre de la columna con el target.
+
+    Retorna:
+    - df_target_largo (pandas.DataFrame): DataFrame con las columnas del índice, 'MES' y `NombreValor`. Las sedes
+      y meses sin target (las sedes de una cadena y línea que no está en el archivo de target) no se incluyen.
+
+    Las columnas del índice y 'MES' se construyen como categóricas repitiendo los códigos enteros, de modo que
+    el producto de sedes, líneas y meses solo ocupa un entero por celda, además del valor del target.
+    Los meses quedan en el orden de las columnas de `df_target_por_sede`.
+
+    Ejemplo:
+    >>> print(TargetFormatoLargo(df_target_por_sede))
+            CADENA       LINEA PUNTO DE VENTA      MES  TARGET UNIDADES
+    0      ALKOSTO  Dual Cool          AK170    ENERO        20.754011
+    1      ALKOSTO  Dual Cool          AK170  FEBRERO        44.318182
+    ...
+    """
+
+    meses = df_target_por_sede.columns
+    filas = len(df_target_por_sede)
+    indice = df_target_por_sede.index
+
+    # Descartar las celdas sin target antes de construir las columnas
+    valores = df_target_por_sede.to_numpy(dtype = np.float64).ravel()
+    con_target = ~np.isnan(valores)
+
+    columnas = {}
+    for nivel, nombre in enumerate(indice.names):
+        codigos = np.repeat(indice.codes[nivel], len(meses))[con_target]
+        columnas[nombre] = pd.Categorical.from_codes(codigos, categories = indice.levels[nivel].astype(object))
+
+    columnas['MES'] = pd.Categorical.from_codes(np.tile(np.arange(len(meses)), filas)[con_target],
+                                                categories = list(meses), ordered = True)
+    columnas[NombreValor] = valores[con_target]
+
+    return pd.DataFrame(columnas)
+
+
+def TargetFormatoAncho(df_target_largo, NombreValor = 'TARGET UNIDADES'):
+    """
+    Convierte el target en formato largo de nuevo a una columna por mes (inverso de `TargetFormatoLargo`).
+
+    Parámetros:
+    - df_target_largo (pandas.DataFrame): Target en formato largo, con las columnas del índice, 'MES' y
+      `NombreValor`.
+    - NombreValor (str): Nombre de la columna con el target.
+
+    Retorna:
+    - df_target_por_sede (pandas.DataFrame): Target por sede con índice (CADENA, LINEA, PUNTO DE VENTA) y una
+      columna por mes, en el orden en que aparecen los meses. Las celdas sin target quedan vacías.
+    """
+
+    columnas_indice = [columna for columna in df_target_largo.columns if columna not in ('MES', NombreValor)]
+    meses = list(pd.unique(df_target_largo['MES']))
+
+    df_target_por_sede = df_target_largo.pivot(index = columnas_indice, columns = 'MES', values = NombreValor)
+    return df_target_por_sede.reindex(columns = meses).rename_axis(columns = None)
+
+
+def ActualizarTargetPorSede(df_target, porcentajes_por_sede, RutaArchivo, Cadenas = None):
+    """
+    Reparte el target entre los puntos de venta y guarda el resultado en formato largo.
+
+    Parámetros:
+    - df_target (pandas.DataFrame): Tabla de target con índice (CADENA, LINEA) (ver `PrepararTarget`).
+    - porcentajes_por_sede (pandas.Series): Peso de cada punto de venta (ver `CalcularPorcentajesPorSede`).
+    - RutaArchivo (str): Ruta del archivo CSV con el target por sede y mes de todas las cadenas. Se crea si no
+      existe.
+    - Cadenas (list, opcional): Cadenas cuyas ventas se cargaron en esta ejecución. Si se especifica y el archivo
+      existe, solo se reparte el target de esas cadenas y las demás conservan la asignación guardada (ver
+      `ReasignarTarget`). Por defecto se reparte el target de todas las cadenas y se reemplaza el archivo.
+
+    Retorna:
+    - df_target_por_sede (pandas.DataFrame): Target por sede de todas las cadenas, con una columna por mes.
+    - df_target_sin_distribucion (pandas.DataFrame): Filas de target de las cadenas repartidas cuya línea no
+      tiene ventas, por lo que su target no se asignó a ninguna sede.
+    - df_target_largo (pandas.DataFrame): Target en formato largo guardado en `RutaArchivo`
+      (ver `TargetFormatoLargo`).
+
+    Ejemplo:
+    >>> df_target_por_sede, df_target_sin_distribucion, df_target_largo = ActualizarTargetPorSede(
+    ...     df_target, porcentajes_jumbo, os.path.join(carpeta_target, 'TARGET POR SEDE.csv'), Cadenas = ['JUMBO'])
+    """
+
+    if Cadenas is not None and os.path.exists(RutaArchivo):
+        # Leer los valores exactos que se guardaron, para que las cadenas no repartidas no cambien
+        df_anterior = TargetFormatoAncho(pd.read_csv(RutaArchivo, float_precision = 'round_trip',
+            dtype = {'CADENA': str, 'LINEA': str, 'PUNTO DE VENTA': str, 'MES': str}))
+        df_target_por_sede, df_target_sin_distribucion = ReasignarTarget(df_anterior, df_target,
+                                                                         porcentajes_por_sede, Cadenas)
+    else:
+        df_target_por_sede, df_target_sin_distribucion = AsignarTarget(df_target, porcentajes_por_sede)
+
+    df_target_largo = TargetFormatoLargo(df_target_por_sede)
+
+    carpeta = os.path.dirname(RutaArchivo)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok = True)
+    df_target_largo.to_csv(RutaArchivo, index = False)
+
+    return df_target_por_sede, df_target_sin_distribucion, df_target_largo
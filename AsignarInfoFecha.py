@@ -1,6 +1,12 @@
+import numpy as np
 import pandas as pd
-import datetime as dt
-import locale
+
+# Nombre de cada mes en español y en mayúsculas, en orden de calendario
+MESES = ['ENERO', 'FEBRERO', 'MARZO', 'ABRIL', 'MAYO', 'JUNIO', 'JULIO', 'AGOSTO', 'SEPTIEMBRE',
+	'OCTUBRE', 'NOVIEMBRE', 'DICIEMBRE']
+
+# Etiqueta de cada semana del calendario ISO
+SEMANAS = ['W%02d' % semana for semana in range(1, 54)]
 
 def AsignarInfoFecha(df_entrada):
 	"""
@@ -12,8 +18,12 @@ def AsignarInfoFecha(df_entrada):
     Retorna:
     - df_entrada (pandas.DataFrame): DataFrame modificado con las columnas 'NUMERO SEMANA' y 'MES' agregadas.
 
-    Esta función calcula el número de semana correspondiente para cada fecha en la columna 'FECHA' del DataFrame de entrada.
-    Luego configura el locale a español y asigna el nombre en mayúsculas del mes correspondiente a la columna 'MES'.
+    Esta función calcula el número de semana ISO correspondiente para cada fecha en la columna 'FECHA' del DataFrame
+    de entrada y el nombre en mayúsculas del mes, tomado de la lista `MESES` (sin depender del locale del sistema).
+    Los cálculos se hacen una sola vez por cada fecha distinta y luego se asignan a todas las filas con esa fecha.
+    Ambas columnas se agregan como categóricas: 'NUMERO SEMANA' con las categorías de `SEMANAS` y 'MES' con las
+    categorías de `MESES` en orden de calendario. Las filas sin fecha quedan sin valor en las dos columnas.
+    La función no modifica ningún estado global, por lo que puede usarse desde varios procesos o hilos a la vez.
 
     Ejemplo:
     >>> df = pd.DataFrame({'FECHA': ['2023-01-15', '2023-02-20', '2023-03-25']})
@@ -24,14 +34,17 @@ def AsignarInfoFecha(df_entrada):
     2 2023-03-25            	W12      MARZO
     """
 
-	# Calcular número de semana correspondiente
-	df_entrada['NUMERO SEMANA'] = df_entrada['FECHA'].apply(
-        lambda x: 'W' + x.strftime("%V"))
+	# Identificar las fechas distintas y la posición de cada fila en esa lista (-1 para las filas sin fecha)
+	codigos_fecha, fechas_unicas = pd.factorize(df_entrada['FECHA'])
+	fechas_unicas = pd.DatetimeIndex(pd.to_datetime(fechas_unicas))
 
-	# Configurar locale a Español
-	locale.setlocale(locale.LC_TIME, 'es_ES')
+	# Calcular número de semana ISO y mes para cada fecha distinta. Se agrega -1 al final de cada tabla para
+	# que las filas sin fecha (código -1) tomen ese valor y queden sin categoría.
+	tabla_semanas = np.append(fechas_unicas.isocalendar()['week'].to_numpy(dtype = np.int64) - 1, -1)
+	tabla_meses = np.append(fechas_unicas.month.to_numpy(dtype = np.int64) - 1, -1)
 
-	# Asignar el nombre de mes correspondiente en mayúsculas
-	df_entrada['MES'] = df_entrada['FECHA'].dt.strftime('%B').str.upper()
+	# Asignar el número de semana y el nombre de mes correspondiente a cada fila
+	df_entrada['NUMERO SEMANA'] = pd.Categorical.from_codes(tabla_semanas[codigos_fecha], categories = SEMANAS)
+	df_entrada['MES'] = pd.Categorical.from_codes(tabla_meses[codigos_fecha], categories = MESES, ordered = True)
 
-	return df_entrada
\ No newline at end of file
+	return df_entrada
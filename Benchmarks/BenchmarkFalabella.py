@@ -0,0 +1,85 @@
+"""
+Compara la transformación de Falabella con la conversión de fecha fila por fila usada anteriormente.
+
+Genera hojas sintéticas de montos y unidades con la misma estructura del archivo de Falabella (FECHA como serial
+de Excel, EAN, MODELO y una columna por sucursal, con la mayoría de celdas en cero) y mide el tiempo de
+`TransformarFalabella` frente a la versión anterior, que convertía la fecha con `apply` después del JOIN.
+
+Para ejecutarlo, desde la carpeta principal:
+
+Ejemplo:
+>>> python Benchmarks/BenchmarkFalabella.py
+"""
+
+import os
+import sys
+import time
+import datetime as dt
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CargarFalabella import TransformarFalabella
+from EsquemaVentas import AplicarEsquema
+from DatosSinteticos import GenerarHojasFalabella
+
+
+def _TransformarFalabellaAnterior(df_monto, df_unidades):
+    # Transformación anterior: melt, filtro, JOIN y conversión de fecha fila por fila con apply
+    df_monto = pd.melt(df_monto, id_vars = df_monto.columns[[0, 1, 2]],
+                       var_name = 'PUNTO DE VENTA', value_name = 'VALOR TOTAL')
+    df_unidades = pd.melt(df_unidades, id_vars = df_unidades.columns[[0, 1, 2]],
+                          var_name = 'PUNTO DE VENTA', value_name = 'UNIDADES')
+    df_monto = df_monto[df_monto['VALOR TOTAL'] != 0]
+    df_unidades = df_unidades[df_unidades['UNIDADES'] != 0]
+    df_falabella = pd.merge(df_monto, df_unidades)
+    df_falabella['FECHA'] = df_falabella['FECHA'].apply(
+        lambda x: dt.datetime.fromordinal(dt.datetime(1900, 1, 1).toordinal() + x - 2))
+    return df_falabella.reindex(columns = ['PUNTO DE VENTA', 'EAN', 'MODELO',
+        'UNIDADES', 'VALOR TOTAL', 'FECHA'])
+
+
+def _MedirSegundos(funcion, *argumentos, Repeticiones = 3):
+    # Mejor tiempo de varias repeticiones, junto con el último resultado
+    mejor = float('inf')
+    for _ in range(Repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(*argumentos)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def BenchmarkFalabella(Escalas = (100, 400, 1600), Repeticiones = 3):
+    """
+    Mide la transformación anterior y la actual de Falabella para varios tamaños de hoja.
+
+    Parámetros:
+    - Escalas (tuple): Números de productos por fecha a probar.
+    - Repeticiones (int): Número de repeticiones de cada medición (se reporta la más rápida).
+
+    Retorna:
+    - df_resultados (pandas.DataFrame): Filas de la hoja ancha, filas resultantes, segundos de cada versión
+      y aceleración obtenida para cada escala.
+    """
+
+    registros = []
+    for productos in Escalas:
+        df_monto, df_unidades = GenerarHojasFalabella(Productos = productos)
+        segundos_anterior, df_anterior = _MedirSegundos(_TransformarFalabellaAnterior, df_monto, df_unidades,
+                                                        Repeticiones = Repeticiones)
+        segundos_actual, df_actual = _MedirSegundos(TransformarFalabella, df_monto, df_unidades,
+                                                    Repeticiones = Repeticiones)
+
+        # Verificar que ambas versiones producen las mismas ventas (la anterior no aplicaba los tipos del esquema)
+        iguales = AplicarEsquema(df_anterior).equals(df_actual)
+
+        registros.append({'FILAS HOJA': len(df_monto), 'FILAS RESULTADO': len(df_actual),
+                          'SEGUNDOS ANTERIOR': segundos_anterior, 'SEGUNDOS ACTUAL': segundos_actual,
+                          'ACELERACION': segundos_anterior / segundos_actual, 'IGUALES': iguales})
+
+    return pd.DataFrame(registros)
+
+
+if __name__ == '__main__':
+    print(BenchmarkFalabella().to_string())
@@ -0,0 +1,236 @@
+"""
+Mide cada etapa del flujo de ventas con datos sintéticos de distintos tamaños y los compara con una línea base.
+
+Para cada escala (número total de filas de ventas) se generan las fuentes con `DatosSinteticos` y se mide:
+
+- La carga de cada cadena desde sus archivos de Excel (sin la caché), mientras las hojas quepan en Excel y no
+  superen `MaximoFilasExcel`, ya que escribir los libros es mucho más lento que leerlos.
+- La carga de las dimensiones desde la tabla 'INVENTARIO_2' en SQLite.
+- `AsignarInfoFecha`, la unión de dimensiones, el cálculo de distribución (PASO 2) y la exportación a SQLite
+  (mientras no supere `MaximoFilasExportacion`), sobre ventas generadas directamente en memoria.
+
+Cada medición registra los segundos, el tiempo de CPU, el aumento del pico de memoria del proceso y los segundos
+por millón de filas, que deberían mantenerse estables entre escalas si la etapa crece de forma lineal.
+
+Para ejecutarlo, desde la carpeta principal:
+
+Ejemplo:
+>>> python Benchmarks/BenchmarkFlujo.py --escalas 10000,100000 --guardar-linea-base
+>>> python Benchmarks/BenchmarkFlujo.py --escalas 10000,100000 --comparar
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import platform
+import argparse
+import tempfile
+import datetime as dt
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PerfilEtapas import MedirLlamada
+from RegistroCadenas import CrearTareasFuentes
+from EsquemaVentas import COLUMNAS_VENTAS, AplicarEsquema
+from CargarInventario import CargarDimensionesInventario
+from AsignarInfoFecha import AsignarInfoFecha
+from UnionDimensiones import UnirDimensiones
+from DistribucionVentas import CalcularDistribucion
+from DatosSinteticos import (CrearUniverso, EscribirFuentes, GenerarVentasSimple,
+                             EscribirInventarioSQLite, FilasPorCadena, MAXIMO_FILAS_HOJA)
+
+
+# Escalas por defecto, en número total de filas de ventas
+ESCALAS = (10000, 100000, 1000000, 10000000)
+
+# Ruta por defecto de la línea base
+RUTA_LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'LineaBase', 'linea_base.json')
+
+
+def _Medir(registros, Filas, Etapa, funcion, *argumentos, Repeticiones = 1):
+    # Ejecutar una etapa varias veces, registrar la medición más rápida y retornar el último resultado
+    mejor = None
+    for _ in range(Repeticiones):
+        with MedirLlamada(Etapa) as medicion:
+            resultado = funcion(*argumentos)
+            medicion['SALIDA'] = resultado
+        if mejor is None or medicion['SEGUNDOS'] < mejor['SEGUNDOS']:
+            mejor = medicion
+
+    registros.append({'FILAS': Filas, 'ETAPA': Etapa, 'SEGUNDOS': mejor['SEGUNDOS'],
+                      'CPU SEGUNDOS': mejor['CPU SEGUNDOS'], 'MB AUMENTO PICO RSS': mejor['MB AUMENTO PICO RSS'],
+                      'FILAS SALIDA': mejor.get('FILAS SALIDA'), 'MB SALIDA': mejor.get('MB SALIDA'),
+                      'SEGUNDOS POR MILLON': mejor['SEGUNDOS'] / Filas * 1e6})
+    return resultado
+
+
+def _CargarFuente(Nombre, Rutas):
+    # Ejecutar en este proceso todas las tareas de carga de una fuente, sin pasar por la caché
+    return [getattr(funcion, '__wrapped__', funcion)(*argumentos)
+            for _, _, funcion, argumentos in CrearTareasFuentes([Nombre], Rutas)]
+
+
+def _CargarInventarioSQLite(RutaArchivo):
+    conn = sqlite3.connect(RutaArchivo)
+    try:
+        return CargarDimensionesInventario(conexion = conn)
+    finally:
+        conn.close()
+
+
+def _Union(df_ventas_simple, df_productos, df_sedes):
+    df_ventas, _ = UnirDimensiones(df_ventas_simple,
+        [(df_productos, 'EAN'), (df_sedes, 'PUNTO DE VENTA')], Columnas = COLUMNAS_VENTAS)
+    return AplicarEsquema(df_ventas)
+
+
+def _Exportar(df_ventas, RutaArchivo):
+    from sqlalchemy import create_engine
+    from ExportarVentas import ExportarVentasSQL
+
+    motor_sql = create_engine('sqlite:///' + RutaArchivo)
+    try:
+        return ExportarVentasSQL(df_ventas, motor_sql, 'Ventas', TamanoLote = 20000, if_exists = 'replace')
+    finally:
+        motor_sql.dispose()
+
+
+def BenchmarkFlujo(Escalas = ESCALAS, MaximoFilasExcel = 200000, MaximoFilasExportacion = 1000000,
+                   Repeticiones = 1, Carpeta = None, Semilla = 0):
+    """
+    Mide la carga de cada fuente y las etapas del flujo para varios tamaños de datos sintéticos.
+
+    Parámetros:
+    - Escalas (tuple): Números totales de filas de ventas a probar.
+    - MaximoFilasExcel (int): Máximo de filas para escribir y medir las fuentes de Excel.
+    - MaximoFilasExportacion (int): Máximo de filas para medir la exportación a SQLite.
+    - Repeticiones (int): Número de repeticiones de cada medición (se reporta la más rápida).
+    - Carpeta (str, opcional): Carpeta donde se escriben los datos sintéticos. Por defecto se usa una carpeta
+      temporal que se elimina al terminar.
+    - Semilla (int): Semilla del generador de números aleatorios.
+
+    Retorna:
+    - df_resultados (pandas.DataFrame): Una fila por escala y etapa con FILAS, ETAPA, SEGUNDOS, CPU SEGUNDOS,
+      MB AUMENTO PICO RSS, FILAS SALIDA, MB SALIDA y SEGUNDOS POR MILLON.
+
+    El aumento del pico de memoria es relativo al pico alcanzado por el proceso hasta ese momento, por lo que
+    una etapa que usa menos memoria que otra anterior registra cero.
+    """
+
+    universo = CrearUniverso(Semilla = Semilla)
+    registros = []
+
+    with tempfile.TemporaryDirectory() as carpeta_temporal:
+        for filas in Escalas:
+            carpeta = os.path.join(Carpeta or carpeta_temporal, f'filas_{filas}')
+
+            # Cargar las fuentes desde Excel solo si caben en una hoja y no tardan demasiado en escribirse
+            if filas <= MaximoFilasExcel and max(FilasPorCadena(filas).values()) <= MAXIMO_FILAS_HOJA:
+                rutas = EscribirFuentes(carpeta, filas, universo, Semilla = Semilla)
+                for nombre in ['alkosto', 'falabella', 'jumbo', 'exito']:
+                    _Medir(registros, filas, 'CARGA ' + nombre.upper(), _CargarFuente, nombre, rutas,
+                           Repeticiones = Repeticiones)
+            else:
+                # Solo el inventario, que en SQLite no tiene límite de filas
+                os.makedirs(carpeta, exist_ok = True)
+                rutas = {'inventario': os.path.join(carpeta, 'INVENTARIO_2.db')}
+                EscribirInventarioSQLite(universo, filas, rutas['inventario'], Semilla = Semilla + 4)
+
+            df_productos, df_sedes = _Medir(registros, filas, 'CARGA INVENTARIO', _CargarInventarioSQLite,
+                                            rutas['inventario'], Repeticiones = Repeticiones)
+
+            # Etapas posteriores a la ingesta sobre ventas generadas en memoria
+            df_ventas_simple = GenerarVentasSimple(universo, filas, Semilla)
+            df_ventas_simple['TIPO2'] = 'SO'
+            df_ventas_simple = _Medir(registros, filas, 'INFO FECHA', AsignarInfoFecha, df_ventas_simple,
+                                      Repeticiones = Repeticiones)
+            df_ventas = _Medir(registros, filas, 'UNION DIMENSIONES', _Union, df_ventas_simple, df_productos,
+                               df_sedes, Repeticiones = Repeticiones)
+            del df_ventas_simple
+            _Medir(registros, filas, 'DISTRIBUCION', CalcularDistribucion, df_ventas, Repeticiones = Repeticiones)
+
+            if filas <= MaximoFilasExportacion:
+                _Medir(registros, filas, 'EXPORTACION SQL', _Exportar, df_ventas,
+                       os.path.join(carpeta, 'ventas.db'), Repeticiones = Repeticiones)
+            del df_ventas
+
+    return pd.DataFrame(registros)
+
+
+def GuardarLineaBase(df_resultados, RutaArchivo = RUTA_LINEA_BASE):
+    """
+    Guarda los resultados de `BenchmarkFlujo` como línea base, junto con la información del entorno.
+
+    Parámetros:
+    - df_resultados (pandas.DataFrame): Resultados de `BenchmarkFlujo`.
+    - RutaArchivo (str): Ruta del archivo JSON. Por defecto `RUTA_LINEA_BASE`.
+
+    Retorna:
+    - RutaArchivo (str): Ruta del archivo guardado.
+    """
+
+    os.makedirs(os.path.dirname(RutaArchivo), exist_ok = True)
+    linea_base = {'FECHA': dt.datetime.now().isoformat(timespec = 'seconds'),
+                  'PYTHON': platform.python_version(), 'PANDAS': pd.__version__, 'PLATAFORMA': platform.platform(),
+                  'RESULTADOS': json.loads(df_resultados.to_json(orient = 'records'))}
+    with open(RutaArchivo, 'w', encoding = 'utf-8') as archivo:
+        json.dump(linea_base, archivo, ensure_ascii = False, indent = 2)
+    return RutaArchivo
+
+
+def CompararLineaBase(df_resultados, RutaArchivo = RUTA_LINEA_BASE, Tolerancia = 1.25):
+    """
+    Compara los resultados de `BenchmarkFlujo` con la línea base guardada.
+
+    Parámetros:
+    - df_resultados (pandas.DataFrame): Resultados de `BenchmarkFlujo`.
+    - RutaArchivo (str): Ruta de la línea base. Por defecto `RUTA_LINEA_BASE`.
+    - Tolerancia (float): Razón de tiempos a partir de la cual una etapa se marca como regresión.
+
+    Retorna:
+    - df_comparacion (pandas.DataFrame): FILAS, ETAPA, SEGUNDOS, SEGUNDOS BASE, RAZON (SEGUNDOS / SEGUNDOS BASE)
+      y REGRESION. Las etapas sin línea base quedan con RAZON vacía.
+
+    Ejemplo:
+    >>> print(CompararLineaBase(BenchmarkFlujo(Escalas = (10000,))))
+       FILAS              ETAPA  SEGUNDOS  SEGUNDOS BASE  RAZON  REGRESION
+    0  10000      CARGA ALKOSTO     0.171          0.168  1.018      False
+    ...
+    """
+
+    with open(RutaArchivo, encoding = 'utf-8') as archivo:
+        linea_base = json.load(archivo)
+
+    df_base = pd.DataFrame(linea_base['RESULTADOS'])[['FILAS', 'ETAPA', 'SEGUNDOS']]
+    df_comparacion = df_resultados[['FILAS', 'ETAPA', 'SEGUNDOS']].merge(
+        df_base.rename(columns = {'SEGUNDOS': 'SEGUNDOS BASE'}), on = ['FILAS', 'ETAPA'], how = 'left')
+    df_comparacion['RAZON'] = df_comparacion['SEGUNDOS'] / df_comparacion['SEGUNDOS BASE']
+    df_comparacion['REGRESION'] = df_comparacion['RAZON'] > Tolerancia
+    return df_comparacion
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Mide las etapas del flujo de ventas con datos sintéticos.')
+    parser.add_argument('--escalas', default = ','.join(str(filas) for filas in ESCALAS),
+                        help = 'Números totales de filas separados por comas.')
+    parser.add_argument('--maximo-filas-excel', type = int, default = 200000)
+    parser.add_argument('--maximo-filas-exportacion', type = int, default = 1000000)
+    parser.add_argument('--repeticiones', type = int, default = 1)
+    parser.add_argument('--carpeta', default = None, help = 'Conservar los datos sintéticos en esta carpeta.')
+    parser.add_argument('--linea-base', default = RUTA_LINEA_BASE)
+    parser.add_argument('--guardar-linea-base', action = 'store_true')
+    parser.add_argument('--comparar', action = 'store_true')
+    opciones = parser.parse_args()
+
+    df_resultados = BenchmarkFlujo([int(filas) for filas in opciones.escalas.split(',')],
+                                   opciones.maximo_filas_excel, opciones.maximo_filas_exportacion,
+                                   opciones.repeticiones, opciones.carpeta)
+    print(df_resultados.to_string())
+
+    if opciones.comparar:
+        print(CompararLineaBase(df_resultados, opciones.linea_base).to_string())
+    if opciones.guardar_linea_base:
+        print('Línea base guardada en', GuardarLineaBase(df_resultados, opciones.linea_base))
@@ -0,0 +1,347 @@
+"""
+Genera datos sintéticos con la misma estructura de cada fuente de ventas y del inventario.
+
+Todas las fuentes se generan a partir de un mismo universo de productos y sedes (ver `CrearUniverso`), de modo
+que las ventas generadas encuentran sus productos y sedes en el inventario, salvo una pequeña fracción de
+productos que se deja fuera a propósito, como ocurre con los archivos reales.
+
+- Alkosto: archivo plano con una sola hoja ('VENTAS ALKOSTO.xlsx').
+- Falabella: hojas anchas 'MONTO' y 'UNIDADES', con la fecha como serial de Excel y una columna por sucursal.
+- Jumbo: un archivo plano por mes en la carpeta 'jumbo'.
+- Éxito: un archivo con una hoja plana por categoría de producto ('EXITO.xlsx').
+- Inventario: tabla 'INVENTARIO_2' con las columnas del formato de ventas, en una base de datos SQLite.
+
+Ejemplo:
+>>> rutas = EscribirFuentes('datos_sinteticos', 100000)
+>>> rutas['jumbo']
+'datos_sinteticos/Ventas/jumbo'
+"""
+
+import os
+import sys
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AsignarInfoFecha import MESES
+from EsquemaVentas import COLUMNAS_VENTAS, AplicarEsquema, ConcatenarVentas
+
+
+# Fracción de las filas de ventas que corresponde a cada cadena (similar a los archivos reales)
+PROPORCION_CADENAS = {'ALKOSTO': 0.34, 'FALABELLA': 0.10, 'JUMBO': 0.28, 'EXITO': 0.28}
+
+# Número de sedes de cada cadena en el universo por defecto
+SEDES_POR_CADENA = {'ALKOSTO': 120, 'FALABELLA': 30, 'JUMBO': 40, 'EXITO': 150}
+
+# Hojas del archivo de Éxito, una por categoría de producto
+HOJAS_EXITO = ['FRIOS', 'MOBILE', 'IT', 'LINEA BLANCA', 'AUDIO', 'TELEVISION']
+
+LINEAS = ['OLED', 'NanoCell', 'UHD', 'Monitores', 'Barras de sonido', 'F/D', 'F/L', 'Dual Cool', 'Artcool',
+          'Accesorios']
+CIUDADES = ['BOGOTA', 'MEDELLIN', 'CALI', 'BARRANQUILLA', 'BUCARAMANGA', 'CARTAGENA']
+REGIONALES = ['CENTRO', 'ANTIOQUIA', 'OCCIDENTE', 'COSTA', 'ORIENTE', 'COSTA']
+
+# Rango de fechas de las ventas (enero a agosto, como los archivos reales)
+FECHA_INICIAL = np.datetime64('2021-01-01')
+DIAS = 243
+
+# Serial de Excel de FECHA_INICIAL (días desde 1899-12-30)
+SERIAL_FECHA_INICIAL = 44197
+
+# Máximo de filas de una hoja de Excel, sin contar el encabezado
+MAXIMO_FILAS_HOJA = 1048575
+
+
+def CrearUniverso(Productos = 2000, SedesPorCadena = None, Semilla = 0):
+    """
+    Crea las tablas de productos y de sedes de las que se toman todas las fuentes sintéticas.
+
+    Parámetros:
+    - Productos (int): Número de productos (EAN).
+    - SedesPorCadena (dict, opcional): Número de sedes de cada cadena. Por defecto `SEDES_POR_CADENA`.
+    - Semilla (int): Semilla del generador de números aleatorios.
+
+    Retorna:
+    - universo (dict): Diccionario con las tablas 'PRODUCTOS' (columnas de producto del inventario, el precio y
+      la hoja de Éxito de cada producto) y 'SEDES' (columnas de sede del inventario).
+
+    Los EAN y los modelos siguen la misma numeración de `GenerarHojasFalabella`, y las sedes de Falabella se
+    llaman 'SUCURSAL 00', 'SUCURSAL 01', etc., como sus columnas.
+    """
+
+    rng = np.random.default_rng(Semilla)
+    sedes_por_cadena = SedesPorCadena or SEDES_POR_CADENA
+
+    df_productos = pd.DataFrame({
+        'EAN': 8806000000000 + np.arange(Productos, dtype = np.int64),
+        'MODELO': [f'MODELO {i}' for i in range(Productos)],
+        'REFERENCIA HOMOLOGADA': [f'REF {i // 4}' for i in range(Productos)],
+        'CATEGORIA': rng.choice(['AV', 'HA', 'MC'], Productos),
+        'SUBCATEGORIA': rng.choice(['TV', 'AUDIO', 'REFRIGERACION', 'LAVADO', 'AIRE', 'MOVILES'], Productos),
+        'LINEA': rng.choice(LINEAS, Productos),
+        'SUBLINEA': rng.choice(['ALTA', 'MEDIA', 'BASICA'], Productos),
+        'PRECIO': rng.integers(100, 5000, Productos) * 1000.0,
+        'HOJA EXITO': rng.choice(HOJAS_EXITO, Productos)})
+
+    nombres = {'ALKOSTO': 'AK{:03d}', 'FALABELLA': 'SUCURSAL {:02d}', 'JUMBO': 'Jumbo Sede {:02d}',
+               'EXITO': 'EXITO SEDE {:03d}'}
+    list_df_sedes = []
+    for cadena, sedes in sedes_por_cadena.items():
+        ciudad = rng.integers(0, len(CIUDADES), sedes)
+        list_df_sedes.append(pd.DataFrame({
+            'PUNTO DE VENTA': [nombres[cadena].format(i) for i in range(sedes)],
+            'HOMOLOGA ALMACEN': [f'{cadena} {i}' for i in range(sedes)],
+            'TIPO': rng.choice(['OFFLINE', 'ONLINE'], sedes, p = [0.9, 0.1]),
+            'CANAL': 'HYPER',
+            'CADENA': cadena,
+            'SUBCADENA': cadena,
+            'REGIONAL': np.array(REGIONALES)[ciudad],
+            'CIUDAD': np.array(CIUDADES)[ciudad],
+            'CORE STORE': rng.choice(['SI', 'NO'], sedes),
+            'PROMOTER': rng.choice(['SI', 'NO'], sedes)}))
+
+    return {'PRODUCTOS': df_productos, 'SEDES': pd.concat(list_df_sedes, ignore_index = True)}
+
+
+def GenerarVentasCadena(universo, Cadena, Filas, Semilla = 0):
+    """
+    Genera ventas planas de una cadena con las columnas de los archivos de Alkosto, Jumbo y Éxito.
+
+    Parámetros:
+    - universo (dict): Universo creado con `CrearUniverso`.
+    - Cadena (str): Cadena de las sedes que venden.
+    - Filas (int): Número de filas.
+    - Semilla (int): Semilla del generador de números aleatorios.
+
+    Retorna:
+    - df_cadena (pandas.DataFrame): Ventas con las columnas PUNTO DE VENTA, EAN, MODELO, UNIDADES, VALOR TOTAL y
+      FECHA, ordenadas por fecha. PUNTO DE VENTA y MODELO son categóricas, para generar millones de filas sin
+      crear un objeto de texto por fila.
+    """
+
+    rng = np.random.default_rng(Semilla)
+    df_productos = universo['PRODUCTOS']
+    sedes = universo['SEDES'].loc[universo['SEDES']['CADENA'] == Cadena, 'PUNTO DE VENTA'].to_numpy()
+
+    producto = rng.integers(0, len(df_productos), Filas)
+    dia = np.sort(rng.integers(0, DIAS, Filas))
+    unidades = rng.integers(1, 10, Filas)
+
+    return pd.DataFrame({
+        'PUNTO DE VENTA': pd.Categorical.from_codes(rng.integers(0, len(sedes), Filas), categories = sedes),
+        'EAN': df_productos['EAN'].to_numpy()[producto],
+        'MODELO': pd.Categorical.from_codes(producto, categories = df_productos['MODELO']),
+        'UNIDADES': unidades,
+        'VALOR TOTAL': unidades * df_productos['PRECIO'].to_numpy()[producto],
+        'FECHA': FECHA_INICIAL + dia.astype('timedelta64[D]')})
+
+
+def FilasPorCadena(Filas):
+    """
+    Reparte un número total de filas de ventas entre las cadenas según `PROPORCION_CADENAS`.
+
+    Parámetros:
+    - Filas (int): Número total de filas.
+
+    Retorna:
+    - filas_por_cadena (dict): Número de filas de cada cadena (al menos una).
+    """
+
+    return {cadena: max(1, int(round(Filas * proporcion))) for cadena, proporcion in PROPORCION_CADENAS.items()}
+
+
+def GenerarVentasSimple(universo, Filas, Semilla = 0):
+    """
+    Genera directamente en memoria el formato de ventas simple (las ventas de todas las cadenas unidas).
+
+    Parámetros:
+    - universo (dict): Universo creado con `CrearUniverso`.
+    - Filas (int): Número total de filas, repartido entre las cadenas según `PROPORCION_CADENAS`.
+    - Semilla (int): Semilla del generador de números aleatorios.
+
+    Retorna:
+    - df_ventas_simple (pandas.DataFrame): Ventas con los tipos de `AplicarEsquema`, como las retorna la ingesta.
+
+    Permite medir las etapas posteriores a la ingesta con tamaños que no caben en una hoja de Excel.
+    """
+
+    return ConcatenarVentas([AplicarEsquema(GenerarVentasCadena(universo, cadena, filas, Semilla + i))
+                             for i, (cadena, filas) in enumerate(FilasPorCadena(Filas).items())])
+
+
+def GenerarHojasFalabella(Fechas = 210, Productos = 400, Sucursales = 30, Densidad = 0.1, Semilla = 0):
+    """
+    Genera hojas sintéticas de montos y unidades con la estructura del archivo de Falabella.
+
+    Parámetros:
+    - Fechas (int): Número de fechas distintas.
+    - Productos (int): Número de productos (EAN) por fecha.
+    - Sucursales (int): Número de columnas de sucursal.
+    - Densidad (float): Fracción de celdas con ventas (el resto queda en cero).
+    - Semilla (int): Semilla del generador de números aleatorios.
+
+    Retorna:
+    - df_monto (pandas.DataFrame): Hoja sintética de montos.
+    - df_unidades (pandas.DataFrame): Hoja sintética de unidades.
+    """
+
+    rng = np.random.default_rng(Semilla)
+    filas = Fechas * Productos
+
+    columnas_id = {'FECHA': np.repeat(SERIAL_FECHA_INICIAL + np.arange(Fechas), Productos),
+                   'EAN': np.tile(8806000000000 + np.arange(Productos), Fechas),
+                   'MODELO': np.tile(np.array([f'MODELO {i}' for i in range(Productos)], dtype = object), Fechas)}
+
+    con_venta = rng.random((filas, Sucursales)) < Densidad
+    unidades = np.where(con_venta, rng.integers(1, 10, (filas, Sucursales)), 0)
+    monto = unidades * rng.integers(100000, 5000000, (filas, Sucursales)).astype(float)
+
+    sucursales = [f'SUCURSAL {i:02d}' for i in range(Sucursales)]
+    df_monto = pd.DataFrame({**columnas_id, **dict(zip(sucursales, monto.T))})
+    df_unidades = pd.DataFrame({**columnas_id, **dict(zip(sucursales, unidades.T))})
+    return df_monto, df_unidades
+
+
+def GenerarInventario(universo, Filas, FraccionSinInventario = 0.01, RecorrerUniverso = True, Semilla = 0):
+    """
+    Genera la tabla 'INVENTARIO_2' con las columnas del formato de ventas.
+
+    Parámetros:
+    - universo (dict): Universo creado con `CrearUniverso`.
+    - Filas (int): Número de filas del inventario.
+    - FraccionSinInventario (float): Fracción de los productos (los últimos EAN) que no aparecen en el inventario,
+      para que la unión de dimensiones tenga llaves sin coincidencia como con los datos reales.
+    - RecorrerUniverso (bool): Si es True, las primeras filas recorren todos los productos (salvo los excluidos)
+      y todas las sedes; el resto se elige al azar. Solo el primer bloque de un inventario grande lo necesita.
+    - Semilla (int): Semilla del generador de números aleatorios.
+
+    Retorna:
+    - df_inventario (pandas.DataFrame): Inventario con las columnas de `COLUMNAS_VENTAS`.
+    """
+
+    rng = np.random.default_rng(Semilla)
+    df_productos = universo['PRODUCTOS']
+    df_sedes = universo['SEDES']
+    productos = len(df_productos) - int(len(df_productos) * FraccionSinInventario)
+
+    producto = rng.integers(0, productos, Filas)
+    sede = rng.integers(0, len(df_sedes), Filas)
+    if RecorrerUniverso:
+        producto[:productos] = np.arange(productos)[:Filas]
+        sede[:len(df_sedes)] = np.arange(len(df_sedes))[:Filas]
+    dia = rng.integers(0, DIAS, Filas)
+    fechas = FECHA_INICIAL + dia.astype('timedelta64[D]')
+
+    columnas_producto = df_productos.drop(columns = ['PRECIO', 'HOJA EXITO'])
+    df_inventario = pd.concat([columnas_producto.take(producto).reset_index(drop = True),
+                               df_sedes.take(sede).reset_index(drop = True)], axis = 1)
+    df_inventario['TIPO2'] = 'INV'
+    df_inventario['UNIDADES'] = rng.integers(0, 50, Filas)
+    df_inventario['VALOR TOTAL'] = df_inventario['UNIDADES'] * df_productos['PRECIO'].to_numpy()[producto]
+    df_inventario['FECHA'] = pd.DatetimeIndex(fechas).strftime('%Y-%m-%d')
+    df_inventario['NUMERO SEMANA'] = pd.DatetimeIndex(fechas).isocalendar()['week'].map('W{:02d}'.format).to_numpy()
+    df_inventario['MES'] = np.array(MESES)[pd.DatetimeIndex(fechas).month - 1]
+    return df_inventario[COLUMNAS_VENTAS]
+
+
+def EscribirInventarioSQLite(universo, Filas, RutaArchivo, TamanoBloque = 500000, Semilla = 0):
+    """
+    Genera el inventario por bloques y lo guarda como la tabla 'INVENTARIO_2' de una base de datos SQLite.
+
+    Parámetros:
+    - universo (dict): Universo creado con `CrearUniverso`.
+    - Filas (int): Número de filas del inventario.
+    - RutaArchivo (str): Ruta de la base de datos. Si la tabla ya existe, se reemplaza.
+    - TamanoBloque (int): Número de filas que se generan y escriben en cada bloque, para que la memoria usada
+      no dependa del tamaño del inventario.
+    - Semilla (int): Semilla del generador de números aleatorios.
+    """
+
+    conn = sqlite3.connect(RutaArchivo)
+    try:
+        for numero, inicio in enumerate(range(0, Filas, TamanoBloque)):
+            df_bloque = GenerarInventario(universo, min(TamanoBloque, Filas - inicio),
+                                          RecorrerUniverso = numero == 0, Semilla = Semilla + numero)
+            df_bloque.to_sql('INVENTARIO_2', conn, index = False, if_exists = 'replace' if numero == 0 else 'append')
+    finally:
+        conn.close()
+
+
+def _ValidarHoja(df, Nombre):
+    # Verificar que la hoja cabe en Excel antes de empezar a escribirla
+    if len(df) > MAXIMO_FILAS_HOJA:
+        raise ValueError(f"La hoja '{Nombre}' tendría {len(df)} filas y Excel admite {MAXIMO_FILAS_HOJA}. "
+                         "Use GenerarVentasSimple para medir las etapas con más filas.")
+
+
+def EscribirFuentes(Carpeta, Filas, universo = None, FilasInventario = None, Semilla = 0):
+    """
+    Escribe los archivos de ventas de las cuatro cadenas y la base de datos de inventario.
+
+    Parámetros:
+    - Carpeta (str): Carpeta de destino. Se crean 'Ventas' (con la carpeta 'jumbo') y 'INVENTARIO_2.db'.
+    - Filas (int): Número total de filas de ventas, repartido entre las cadenas según `PROPORCION_CADENAS`.
+    - universo (dict, opcional): Universo creado con `CrearUniverso`. Por defecto se crea uno con la semilla dada.
+    - FilasInventario (int, opcional): Número de filas del inventario. Por defecto, igual a `Filas`.
+    - Semilla (int): Semilla del generador de números aleatorios.
+
+    Retorna:
+    - rutas (dict): Ruta de cada fuente con los nombres del registro de fuentes ('alkosto', 'falabella', 'jumbo',
+      'exito' e 'inventario'), para usarlas con `CrearTareasFuentes(..., Rutas = rutas)`.
+
+    Lanza ValueError si alguna hoja supera el máximo de filas de Excel.
+    """
+
+    universo = universo or CrearUniverso(Semilla = Semilla)
+    filas_por_cadena = FilasPorCadena(Filas)
+
+    carpeta_ventas = os.path.join(Carpeta, 'Ventas')
+    carpeta_jumbo = os.path.join(carpeta_ventas, 'jumbo')
+    os.makedirs(carpeta_jumbo, exist_ok = True)
+    rutas = {'alkosto': os.path.join(carpeta_ventas, 'VENTAS ALKOSTO.xlsx'),
+             'falabella': os.path.join(carpeta_ventas, 'VENTAS FALABELLA.xlsx'),
+             'jumbo': carpeta_jumbo,
+             'exito': os.path.join(carpeta_ventas, 'EXITO.xlsx'),
+             'inventario': os.path.join(Carpeta, 'INVENTARIO_2.db')}
+
+    # Alkosto: una sola hoja plana
+    df_alkosto = GenerarVentasCadena(universo, 'ALKOSTO', filas_por_cadena['ALKOSTO'], Semilla)
+    _ValidarHoja(df_alkosto, 'ALKOSTO')
+    df_alkosto.to_excel(rutas['alkosto'], sheet_name = 'SO', index = False)
+
+    # Falabella: hojas anchas con una fila por fecha y producto, y tantas celdas con venta como filas pedidas
+    sucursales = int((universo['SEDES']['CADENA'] == 'FALABELLA').sum())
+    productos = int(np.ceil(filas_por_cadena['FALABELLA'] / (DIAS * sucursales * 0.1)))
+    productos = min(len(universo['PRODUCTOS']), max(1, productos))
+    densidad = min(1.0, filas_por_cadena['FALABELLA'] / (DIAS * productos * sucursales))
+    df_monto, df_unidades = GenerarHojasFalabella(DIAS, productos, sucursales, densidad, Semilla + 1)
+    _ValidarHoja(df_monto, 'FALABELLA')
+    with pd.ExcelWriter(rutas['falabella']) as escritor:
+        df_monto.to_excel(escritor, sheet_name = 'MONTO', index = False)
+        df_unidades.to_excel(escritor, sheet_name = 'UNIDADES', index = False)
+
+    # Jumbo: un archivo por mes
+    df_jumbo = GenerarVentasCadena(universo, 'JUMBO', filas_por_cadena['JUMBO'], Semilla + 2)
+    meses = df_jumbo['FECHA'].dt.month.to_numpy()
+    for mes in np.unique(meses):
+        df_mes = df_jumbo[meses == mes]
+        _ValidarHoja(df_mes, 'JUMBO ' + MESES[mes - 1])
+        df_mes.to_excel(os.path.join(carpeta_jumbo, MESES[mes - 1] + '.xlsx'), index = False)
+
+    # Éxito: una hoja por categoría de producto
+    df_exito = GenerarVentasCadena(universo, 'EXITO', filas_por_cadena['EXITO'], Semilla + 3)
+    hoja_producto = pd.Series(universo['PRODUCTOS']['HOJA EXITO'].to_numpy(), index = universo['PRODUCTOS']['EAN'])
+    hojas = hoja_producto.reindex(df_exito['EAN']).to_numpy()
+    with pd.ExcelWriter(rutas['exito']) as escritor:
+        for hoja in HOJAS_EXITO:
+            df_hoja = df_exito[hojas == hoja]
+            _ValidarHoja(df_hoja, 'EXITO ' + hoja)
+            df_hoja.to_excel(escritor, sheet_name = hoja, index = False)
+
+    # Inventario en SQLite
+    EscribirInventarioSQLite(universo, FilasInventario or Filas, rutas['inventario'], Semilla = Semilla + 4)
+
+    return rutas
@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import hashlib
+import functools
+
+import pandas as pd
+
+
+# Versión del formato de la caché. Debe incrementarse cuando cambie la forma en que los cargadores
+# normalizan los datos, para que las entradas guardadas con la lógica anterior no se reutilicen.
+VERSION_CACHE = 3
+
+# Carpeta por defecto para la caché (se puede cambiar con la variable de entorno CARPETA_CACHE_VENTAS)
+CARPETA_CACHE = os.environ.get('CARPETA_CACHE_VENTAS', os.path.join(os.getcwd(), '.cache_ventas'))
+
+# Tamaño de los bloques usados para calcular el hash del contenido de los archivos
+TAMANO_BLOQUE_HASH = 1024 * 1024
+
+
+def _HashArchivo(RutaArchivo):
+    # Calcular el hash SHA-256 del contenido del archivo leyéndolo por bloques
+    hash_archivo = hashlib.sha256()
+    with open(RutaArchivo, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE_HASH), b''):
+            hash_archivo.update(bloque)
+    return hash_archivo.hexdigest()
+
+
+def _EscribirAtomico(ruta, escribir):
+    # Escribir primero en un archivo temporal y luego reemplazar, para que otro proceso nunca lea un archivo a medias
+    ruta_temporal = f'{ruta}.{os.getpid()}.tmp'
+    try:
+        escribir(ruta_temporal)
+        os.replace(ruta_temporal, ruta)
+    finally:
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+
+
+def _EliminarEntrada(ruta_meta, meta):
+    # Eliminar el archivo de datos y el archivo de metadatos de una entrada
+    ruta_datos = os.path.join(os.path.dirname(ruta_meta), meta.get('datos', ''))
+    for ruta in (ruta_datos, ruta_meta):
+        if os.path.isfile(ruta):
+            os.remove(ruta)
+
+
+def LeerConCache(funcion, RutaArchivo, *argumentos, CarpetaCache = None, **opciones):
+    """
+    Llama a una función de carga de Excel, reutilizando el resultado guardado si el archivo no ha cambiado.
+
+    Parámetros:
+    - funcion (callable): Función de carga que recibe la ruta del archivo como primer argumento y retorna un DataFrame.
+    - RutaArchivo (str): Ruta al archivo de origen.
+    - *argumentos, **opciones: Argumentos adicionales para la función de carga (por ejemplo, el nombre de la hoja).
+    - CarpetaCache (str, opcional): Carpeta de la caché. Por defecto se usa `CARPETA_CACHE`.
+
+    Retorna:
+    - df (pandas.DataFrame): DataFrame retornado por la función de carga, o la copia guardada en la caché.
+
+    Cada entrada se identifica por la ruta absoluta del archivo, la función y los argumentos usados, y guarda
+    el tamaño, la fecha de modificación y el hash SHA-256 del contenido del archivo de origen. Si el tamaño y la
+    fecha coinciden, se lee el DataFrame guardado (en formato Feather, o pickle si alguna columna mezcla tipos)
+    sin abrir el archivo de Excel. Si no coinciden pero el hash es el mismo (el archivo solo fue copiado o
+    tocado), se actualizan los metadatos y también se reutiliza. En cualquier otro caso se vuelve a cargar el
+    archivo y se reemplaza la entrada anterior.
+
+    Cada entrada se guarda en sus propios archivos, por lo que varios procesos de la ingesta paralela pueden
+    usar la caché al mismo tiempo. Si pyarrow no está instalado, la función de carga se llama directamente.
+
+    Ejemplo:
+    >>> df_target = LeerConCache(pd.read_excel, os.path.join(carpeta_target, 'BASE TARGET.xlsx'))
+    """
+
+    if not _FeatherDisponible():
+        return funcion(RutaArchivo, *argumentos, **opciones)
+
+    carpeta = CarpetaCache or CARPETA_CACHE
+    os.makedirs(carpeta, exist_ok = True)
+
+    # Identificar la entrada por archivo, función y argumentos
+    ruta_absoluta = os.path.abspath(RutaArchivo)
+    variante = f'{funcion.__module__}.{funcion.__qualname__}{argumentos!r}{sorted(opciones.items())!r}'
+    clave = hashlib.sha1(f'{VERSION_CACHE}|{ruta_absoluta}|{variante}'.encode('utf-8')).hexdigest()
+    ruta_meta = os.path.join(carpeta, clave + '.json')
+
+    estado = os.stat(ruta_absoluta)
+    hash_contenido = None
+    meta = None
+    if os.path.isfile(ruta_meta):
+        with open(ruta_meta, encoding = 'utf-8') as archivo:
+            meta = json.load(archivo)
+
+    if meta is not None:
+        ruta_datos = os.path.join(carpeta, meta['datos'])
+        vigente = meta['tamano'] == estado.st_size and meta['mtime_ns'] == estado.st_mtime_ns
+        if not vigente and meta['tamano'] == estado.st_size:
+            hash_contenido = _HashArchivo(ruta_absoluta)
+        if not vigente and meta['hash'] == hash_contenido:
+            # El contenido no cambió: solo actualizar la fecha de modificación registrada
+            meta['mtime_ns'] = estado.st_mtime_ns
+            _EscribirAtomico(ruta_meta, lambda ruta: _GuardarJson(meta, ruta))
+            vigente = True
+        if vigente and os.path.isfile(ruta_datos):
+            os.utime(ruta_meta)   # Registrar el último uso para la limpieza de la caché
+            return _LeerDatos(ruta_datos)
+
+    # Cargar el archivo de Excel y guardar el resultado (el hash solo se calcula si no se calculó arriba)
+    if hash_contenido is None:
+        hash_contenido = _HashArchivo(ruta_absoluta)
+    df = funcion(RutaArchivo, *argumentos, **opciones)
+
+    nombre_datos = _GuardarDatos(df, carpeta, f'{clave}-{hash_contenido[:16]}')
+
+    meta_nueva = {'version': VERSION_CACHE, 'ruta': ruta_absoluta, 'variante': variante,
+                  'tamano': estado.st_size, 'mtime_ns': estado.st_mtime_ns, 'hash': hash_contenido,
+                  'datos': nombre_datos}
+    _EscribirAtomico(ruta_meta, lambda ruta: _GuardarJson(meta_nueva, ruta))
+
+    # Eliminar los datos de la versión anterior del archivo
+    if meta is not None and meta['datos'] != nombre_datos:
+        ruta_datos_anterior = os.path.join(carpeta, meta['datos'])
+        if os.path.isfile(ruta_datos_anterior):
+            os.remove(ruta_datos_anterior)
+
+    return df
+
+
+def ConCache(funcion):
+    """
+    Decorador que hace que una función de carga use `LeerConCache`.
+
+    La función decorada debe recibir la ruta del archivo como primer argumento. El resultado sigue siendo
+    una función de módulo, por lo que puede enviarse a los procesos de la ingesta paralela.
+
+    Ejemplo:
+    >>> @ConCache
+    ... def CargarArchivoJumbo(RutaArchivo):
+    ...     return pd.read_excel(RutaArchivo, parse_dates = ['FECHA'])
+    """
+
+    @functools.wraps(funcion)
+    def funcion_con_cache(RutaArchivo, *argumentos, **opciones):
+        return LeerConCache(funcion, RutaArchivo, *argumentos, **opciones)
+
+    return funcion_con_cache
+
+
+def LimpiarCache(CarpetaCache = None, DiasSinUso = None):
+    """
+    Elimina de la caché las entradas vencidas.
+
+    Parámetros:
+    - CarpetaCache (str, opcional): Carpeta de la caché. Por defecto se usa `CARPETA_CACHE`.
+    - DiasSinUso (float, opcional): Si se especifica, también se eliminan las entradas que no se han usado
+      en ese número de días.
+
+    Retorna:
+    - eliminadas (int): Número de entradas eliminadas.
+
+    Se eliminan las entradas de otra versión de la caché, las de archivos de origen que ya no existen o
+    cuyo tamaño cambió, las que no se usaron en el periodo indicado y los archivos de datos huérfanos.
+    No debe ejecutarse mientras otra carga está usando la misma carpeta de caché.
+    """
+
+    carpeta = CarpetaCache or CARPETA_CACHE
+    if not os.path.isdir(carpeta):
+        return 0
+
+    eliminadas = 0
+    limite_uso = None if DiasSinUso is None else time.time() - DiasSinUso * 24 * 3600
+    datos_vigentes = set()
+
+    for nombre in os.listdir(carpeta):
+        if not nombre.endswith('.json'):
+            continue
+        ruta_meta = os.path.join(carpeta, nombre)
+        with open(ruta_meta, encoding = 'utf-8') as archivo:
+            meta = json.load(archivo)
+
+        vencida = (meta.get('version') != VERSION_CACHE
+                   or not os.path.isfile(meta['ruta'])
+                   or os.path.getsize(meta['ruta']) != meta['tamano']
+                   or (limite_uso is not None and os.path.getmtime(ruta_meta) < limite_uso))
+
+        if vencida:
+            _EliminarEntrada(ruta_meta, meta)
+            eliminadas += 1
+        else:
+            datos_vigentes.add(meta['datos'])
+
+    # Eliminar los archivos de datos que ya no tienen metadatos
+    for nombre in os.listdir(carpeta):
+        if nombre.endswith(('.feather', '.pkl')) and nombre not in datos_vigentes:
+            os.remove(os.path.join(carpeta, nombre))
+
+    return eliminadas
+
+
+def _GuardarDatos(df, carpeta, nombre_base):
+    # Guardar el DataFrame en formato Feather. Las columnas con tipos mezclados (por ejemplo, un EAN con
+    # números y texto en la misma hoja) no se pueden representar en Arrow, y en ese caso se usa pickle.
+    df_guardar = df if isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1 \
+        else df.reset_index(drop = True)
+    try:
+        nombre_datos = nombre_base + '.feather'
+        _EscribirAtomico(os.path.join(carpeta, nombre_datos), lambda ruta: df_guardar.to_feather(ruta))
+    except (ValueError, TypeError):
+        nombre_datos = nombre_base + '.pkl'
+        _EscribirAtomico(os.path.join(carpeta, nombre_datos), lambda ruta: df_guardar.to_pickle(ruta))
+    return nombre_datos
+
+
+def _LeerDatos(ruta_datos):
+    if ruta_datos.endswith('.pkl'):
+        return pd.read_pickle(ruta_datos)
+    return pd.read_feather(ruta_datos)
+
+
+def _GuardarJson(datos, ruta):
+    with open(ruta, 'w', encoding = 'utf-8') as archivo:
+        json.dump(datos, archivo)
+
+
+@functools.lru_cache(maxsize = None)
+def _FeatherDisponible():
+    # El formato Feather requiere pyarrow, que es una dependencia opcional
+    try:
+        import pyarrow   # noqa: F401
+    except ImportError:
+        return False
+    return True
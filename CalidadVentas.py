@@ -0,0 +1,345 @@
+import os
+import math
+import decimal
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+from UnionDimensiones import PosicionesDimension
+
+
+# Número máximo de decimales que se buscan en las columnas decimales (un float64 no tiene más cifras significativas)
+ESCALA_MAXIMA = 20
+
+# Columnas del perfil de calidad, en orden
+COLUMNAS_PERFIL = ['CADENA', 'COLUMNA', 'TIPO', 'FILAS', 'NULOS', 'PORCENTAJE NULOS', 'LONGITUD MAXIMA',
+    'ESCALA MAXIMA', 'VALOR MAS DECIMALES', 'VALOR ABSOLUTO MAXIMO', 'FILAS SIN DIMENSION', 'LLAVES SIN DIMENSION']
+
+# Etiqueta de las filas sin cadena
+SIN_CADENA = 'SIN CADENA'
+
+
+def EscalasDecimales(valores, EscalaMaxima = ESCALA_MAXIMA):
+    """
+    Calcula el número de decimales de cada valor de un arreglo de decimales.
+
+    Parámetros:
+    - valores (numpy.ndarray): Valores de tipo float.
+    - EscalaMaxima (int): Número máximo de decimales que se busca. Los valores con más decimales (o infinitos)
+      quedan con esta escala.
+
+    Retorna:
+    - escalas (numpy.ndarray): Número de decimales de cada valor, o -1 si el valor está vacío.
+
+    El número de decimales es el de la representación más corta del valor (la de `str(valor)`, sin contar el
+    '.0' de los enteros): el menor k tal que el valor redondeado a k decimales es el mismo float. En lugar de
+    convertir cada valor a texto, se prueba cada escala sobre todo el arreglo a la vez, y en cada vuelta solo se
+    siguen revisando los valores que aún no se resuelven.
+
+    Ejemplo:
+    >>> EscalasDecimales(np.array([2465600.4, 10.0, 0.125, np.nan]))
+    array([ 1,  0,  3, -1])
+    """
+
+    valores = np.asarray(valores, dtype = np.float64)
+    escalas = np.full(len(valores), -1, dtype = np.int8)
+
+    pendientes = np.flatnonzero(np.isfinite(valores))
+    escalas[np.isinf(valores)] = EscalaMaxima
+    with np.errstate(over = 'ignore', invalid = 'ignore'):
+        for escala in range(EscalaMaxima):
+            # El redondeo solo es exacto mientras el valor por 10^escala sea un entero representable; los
+            # valores con más cifras significativas (muy pocos) se resuelven con su representación en texto
+            inexactos = np.abs(valores[pendientes]) * 10.0 ** escala >= 2 ** 53
+            for posicion in pendientes[inexactos]:
+                exponente = decimal.Decimal(repr(float(valores[posicion]))).as_tuple().exponent
+                escalas[posicion] = min(max(-exponente, 0), EscalaMaxima)
+            pendientes = pendientes[~inexactos]
+
+            resueltos = np.round(valores[pendientes], escala) == valores[pendientes]
+            escalas[pendientes[resueltos]] = escala
+            pendientes = pendientes[~resueltos]
+            if not len(pendientes):
+                break
+    escalas[pendientes] = EscalaMaxima
+
+    return escalas
+
+
+def _CodigosColumna(serie):
+    # Código de cada fila (-1 si está vacía) y valores distintos de la columna
+    if isinstance(serie.dtype, CategoricalDtype):
+        return serie.cat.codes.to_numpy(), pd.Index(serie.cat.categories)
+    codigos, unicos = pd.factorize(serie)
+    return codigos, pd.Index(unicos)
+
+
+def _MetricasColumna(serie):
+    # Métricas de cada fila de la columna. Cada métrica se calcula una vez por valor distinto y se pasa a las
+    # filas con sus códigos (el valor agregado al final de cada arreglo es para las filas vacías).
+    codigos, unicos = _CodigosColumna(serie)
+    metricas = {'NULOS': codigos < 0}
+
+    if pd.api.types.is_float_dtype(unicos.dtype):
+        valores = unicos.to_numpy(dtype = np.float64)
+        metricas['ESCALA MAXIMA'] = np.append(EscalasDecimales(valores), -1)[codigos]
+        metricas['VALOR ABSOLUTO MAXIMO'] = np.append(np.abs(valores), np.nan)[codigos]
+    elif pd.api.types.is_integer_dtype(unicos.dtype) or pd.api.types.is_object_dtype(unicos.dtype) \
+            or pd.api.types.is_string_dtype(unicos.dtype):
+        longitudes = unicos.astype(str).str.len().to_numpy(dtype = np.int64)
+        metricas['LONGITUD MAXIMA'] = np.append(longitudes, -1)[codigos]
+        if pd.api.types.is_integer_dtype(unicos.dtype):
+            metricas['VALOR ABSOLUTO MAXIMO'] = np.append(np.abs(unicos.to_numpy(dtype = np.float64)),
+                                                          np.nan)[codigos]
+
+    return metricas, codigos
+
+
+def PerfilarVentas(df_ventas, Grupos = 'CADENA', Dimensiones = None):
+    """
+    Calcula el perfil de calidad de cada columna de las ventas, por cadena.
+
+    Parámetros:
+    - df_ventas (pandas.DataFrame): Ventas en el formato de ventas (o cualquier DataFrame con el esquema de ventas).
+    - Grupos (str o array): Columna de `df_ventas` con la cadena de cada fila, o un arreglo con una etiqueta por
+      fila (por ejemplo, la fuente de la que se cargó cada fila). Las filas sin cadena quedan en `SIN_CADENA`.
+    - Dimensiones (list, opcional): Lista de tuplas (df_dimension, llave), como en `UnirDimensiones`, para contar
+      las filas y llaves de ventas que no existen en cada dimensión.
+
+    Retorna:
+    - df_perfil (pandas.DataFrame): Una fila por cadena y columna con las columnas de `COLUMNAS_PERFIL`:
+      filas, nulos y porcentaje de nulos; longitud máxima como texto (columnas de texto, categóricas y enteras);
+      número máximo de decimales, el valor con más decimales y el mayor valor absoluto (columnas decimales); y
+      las filas y llaves distintas sin dimensión (solo en las columnas llave de `Dimensiones`).
+
+    Cada columna se recorre una sola vez: las métricas se calculan sobre los valores distintos de la columna
+    (las categorías en las columnas categóricas) y se agregan por cadena con un solo `groupby`. Como el perfil
+    de cada cadena solo depende de sus filas, se puede calcular solo para las cadenas que cambiaron y combinar
+    con los perfiles guardados (ver `ActualizarPerfilCadenas`).
+
+    El perfil describe los valores tal como se exportan: en el formato de ventas 'VALOR TOTAL' ya está redondeado
+    a `ESCALA_VALOR_TOTAL` decimales por `AplicarEsquema`, por lo que su escala máxima no supera ese número.
+
+    Ejemplo:
+    >>> df_perfil = PerfilarVentas(df_ventas, Dimensiones = [(df_productos, 'EAN'), (df_sedes, 'PUNTO DE VENTA')])
+    >>> print(df_perfil[df_perfil['COLUMNA'] == 'VALOR TOTAL'])
+           CADENA      COLUMNA     TIPO  FILAS  NULOS  ...  ESCALA MAXIMA  VALOR MAS DECIMALES  VALOR ABSOLUTO MAXIMO ...
+    15    ALKOSTO  VALOR TOTAL  float64  61910      0  ...              4           1361344.5378               47966386.0 ...
+    ...
+    """
+
+    # Código de la cadena de cada fila
+    grupos = df_ventas[Grupos] if isinstance(Grupos, str) else pd.Series(np.asarray(Grupos), index = df_ventas.index)
+    if len(grupos) != len(df_ventas):
+        raise ValueError(f'Se esperaba una cadena por fila ({len(df_ventas)}), pero se recibieron {len(grupos)}')
+    codigos_grupo, nombres_grupo = pd.factorize(grupos, sort = True)
+    nombres_grupo = list(nombres_grupo)
+    if (codigos_grupo < 0).any():
+        codigos_grupo = np.where(codigos_grupo < 0, len(nombres_grupo), codigos_grupo)
+        nombres_grupo.append(SIN_CADENA)
+
+    # Filas de cada llave que no existe en su dimensión
+    llaves_dimension = {}
+    for df_dimension, llave in Dimensiones or []:
+        posiciones_dimension, _ = PosicionesDimension(df_ventas[llave], df_dimension[llave])
+        llaves_dimension[llave] = posiciones_dimension < 0
+
+    list_df = []
+    for columna in df_ventas.columns:
+        serie = df_ventas[columna]
+        metricas, codigos = _MetricasColumna(serie)
+
+        df_metricas = pd.DataFrame(metricas)
+        df_metricas['FILAS'] = 1
+        if columna in llaves_dimension:
+            # Las filas con la llave vacía se cuentan en los nulos, no como llaves sin dimension
+            sin_dimension = llaves_dimension[columna] & (codigos >= 0)
+            df_metricas['FILAS SIN DIMENSION'] = sin_dimension
+            df_metricas['LLAVES SIN DIMENSION'] = np.where(sin_dimension, codigos, -1)
+
+        agrupado = df_metricas.groupby(codigos_grupo)
+        df_columna = agrupado[['FILAS', 'NULOS']].sum()
+        for metrica in ['LONGITUD MAXIMA', 'ESCALA MAXIMA', 'VALOR ABSOLUTO MAXIMO']:
+            if metrica in df_metricas:
+                df_columna[metrica] = agrupado[metrica].max()
+        if 'ESCALA MAXIMA' in df_metricas:
+            # Valor con más decimales de cada cadena
+            posiciones = agrupado['ESCALA MAXIMA'].idxmax().to_numpy()
+            df_columna['VALOR MAS DECIMALES'] = serie.to_numpy(dtype = np.float64, na_value = np.nan)[posiciones]
+        if columna in llaves_dimension:
+            df_columna['FILAS SIN DIMENSION'] = agrupado['FILAS SIN DIMENSION'].sum()
+            df_columna['LLAVES SIN DIMENSION'] = agrupado['LLAVES SIN DIMENSION'].agg(
+                lambda llaves: llaves[llaves >= 0].nunique())
+
+        df_columna.index = [nombres_grupo[codigo] for codigo in df_columna.index]
+        list_df.append(df_columna.assign(COLUMNA = columna, TIPO = str(serie.dtype)))
+
+    df_perfil = pd.concat(list_df).rename_axis('CADENA').reset_index()
+    df_perfil['PORCENTAJE NULOS'] = df_perfil['NULOS'] / df_perfil['FILAS']
+
+    # Ordenar por cadena, conservando el orden de las columnas de las ventas
+    df_perfil = df_perfil.reindex(columns = COLUMNAS_PERFIL)
+    return df_perfil.sort_values('CADENA', kind = 'stable', ignore_index = True)
+
+
+def CombinarPerfiles(df_perfil):
+    """
+    Combina los perfiles de varias cadenas en el perfil total de cada columna.
+
+    Parámetros:
+    - df_perfil (pandas.DataFrame): Perfil por cadena (ver `PerfilarVentas`).
+
+    Retorna:
+    - df_total (pandas.DataFrame): Una fila por columna con las mismas métricas, sin la columna 'CADENA'.
+
+    Las filas, los nulos y las filas sin dimensión se suman y las longitudes, escalas y valores absolutos se toman
+    como el máximo entre cadenas. 'LLAVES SIN DIMENSION' es la suma de las llaves sin dimensión de cada cadena,
+    por lo que una llave que falta en dos cadenas se cuenta dos veces.
+    """
+
+    agrupado = df_perfil.groupby('COLUMNA', sort = False)
+    df_total = agrupado.agg(TIPO = ('TIPO', 'first'), FILAS = ('FILAS', 'sum'), NULOS = ('NULOS', 'sum'))
+    for metrica in ['LONGITUD MAXIMA', 'ESCALA MAXIMA', 'VALOR ABSOLUTO MAXIMO']:
+        df_total[metrica] = agrupado[metrica].max()
+    for metrica in ['FILAS SIN DIMENSION', 'LLAVES SIN DIMENSION']:
+        df_total[metrica] = agrupado[metrica].sum(min_count = 1)
+
+    # Valor con más decimales de la cadena con la mayor escala de cada columna
+    escalas = df_perfil['ESCALA MAXIMA'].fillna(-1)
+    posiciones = escalas.groupby(df_perfil['COLUMNA'], sort = False).idxmax()
+    df_total['VALOR MAS DECIMALES'] = df_perfil['VALOR MAS DECIMALES'].reindex(posiciones).to_numpy()
+
+    df_total['PORCENTAJE NULOS'] = df_total['NULOS'] / df_total['FILAS']
+    columnas = [columna for columna in COLUMNAS_PERFIL if columna != 'CADENA']
+    return df_total.reset_index().reindex(columns = columnas)
+
+
+def ActualizarPerfilCadenas(df_perfil, RutaArchivo):
+    """
+    Reemplaza en el perfil guardado las cadenas perfiladas en esta ejecución.
+
+    Parámetros:
+    - df_perfil (pandas.DataFrame): Perfil por cadena de las cadenas cargadas (ver `PerfilarVentas`).
+    - RutaArchivo (str): Ruta del archivo CSV con el perfil de todas las cadenas. Se crea si no existe.
+
+    Retorna:
+    - df_perfil_completo (pandas.DataFrame): Perfil de todas las cadenas: las de `df_perfil` y las demás cadenas
+      del archivo, que no se modifican.
+
+    Permite perfilar solo las cadenas que se volvieron a cargar (por ejemplo, con `--cadenas jumbo`) y obtener el
+    perfil total con `CombinarPerfiles` sin volver a recorrer las ventas de las demás cadenas.
+
+    Ejemplo:
+    >>> df_perfil_completo = ActualizarPerfilCadenas(PerfilarVentas(df_jumbo), 'calidad_ventas.csv')
+    >>> print(ProponerDDL(df_perfil_completo))
+    """
+
+    if os.path.exists(RutaArchivo):
+        df_anterior = pd.read_csv(RutaArchivo, dtype = {'CADENA': str, 'COLUMNA': str, 'TIPO': str})
+        df_anterior = df_anterior[~df_anterior['CADENA'].isin(df_perfil['CADENA'])]
+        df_perfil = pd.concat([df_anterior, df_perfil], ignore_index = True)
+        df_perfil = df_perfil.sort_values('CADENA', kind = 'stable', ignore_index = True)
+
+    carpeta = os.path.dirname(RutaArchivo)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok = True)
+    df_perfil.to_csv(RutaArchivo, index = False)
+
+    return df_perfil
+
+
+def _Digitos(valor):
+    # Número de cifras de la parte entera de un valor (al menos 1)
+    return len(str(int(valor))) if valor >= 1 else 1
+
+
+def ProponerTiposSQL(df_perfil, Holgura = 1.2):
+    """
+    Propone el tipo de cada columna de la tabla 'Ventas' a partir del perfil de calidad.
+
+    Parámetros:
+    - df_perfil (pandas.DataFrame): Perfil por cadena (ver `PerfilarVentas`) o total (ver `CombinarPerfiles`).
+    - Holgura (float): Factor por el que se multiplican las longitudes y los valores máximos observados, para que
+      la tabla admita cargas futuras algo mayores.
+
+    Retorna:
+    - df_tipos (pandas.DataFrame): Una fila por columna de la tabla con 'COLUMNA', 'COLUMNA SQL', 'TIPO ACTUAL'
+      (el de "Creación base de datos.sql") y 'TIPO PROPUESTO'.
+
+    La clase de cada tipo (texto, entero, decimal o fecha) es la de `TIPOS_SQL`; el perfil decide el tamaño.
+    Las columnas de texto (incluido el EAN, que se exporta como texto) usan VARCHAR con la longitud máxima;
+    'ValorTotal' usa DECIMAL con la escala máxima (a lo sumo `ESCALA_VALOR_TOTAL`, el redondeo del esquema) y las
+    cifras enteras del mayor valor absoluto; las enteras usan INT o BIGINT según el mayor valor. Una columna sin
+    valores, o que no está en el formato de ventas (como 'CadenaFuente'), conserva su tipo actual.
+
+    Ejemplo:
+    >>> print(ProponerTiposSQL(df_perfil))
+                      COLUMNA           COLUMNA SQL      TIPO ACTUAL  TIPO PROPUESTO
+    0                    TIPO                  Tipo      VARCHAR(10)      VARCHAR(9)
+    ...
+    15            VALOR TOTAL            ValorTotal  DECIMAL(26, 15)   DECIMAL(15, 6)
+    ...
+    """
+
+    from sqlalchemy.types import VARCHAR, Integer, DECIMAL
+    from ExportarVentas import COLUMNAS_SQL, TIPOS_SQL
+
+    if 'CADENA' in df_perfil.columns:
+        df_perfil = CombinarPerfiles(df_perfil)
+    df_perfil = df_perfil.set_index('COLUMNA')
+
+    columnas_ventas = {columna_sql: columna for columna, columna_sql in COLUMNAS_SQL.items()}
+
+    registros = []
+    for columna_sql, tipo_actual in TIPOS_SQL.items():
+        columna = columnas_ventas.get(columna_sql)
+        tipo_propuesto = str(tipo_actual)
+
+        if columna in df_perfil.index:
+            metricas = df_perfil.loc[columna]
+            if isinstance(tipo_actual, VARCHAR) and metricas['LONGITUD MAXIMA'] >= 0:
+                tipo_propuesto = f"VARCHAR({max(1, math.ceil(metricas['LONGITUD MAXIMA'] * Holgura))})"
+            elif isinstance(tipo_actual, DECIMAL) and metricas['ESCALA MAXIMA'] >= 0:
+                escala = int(metricas['ESCALA MAXIMA'])
+                precision = min(38, _Digitos(metricas['VALOR ABSOLUTO MAXIMO'] * Holgura) + escala)
+                tipo_propuesto = f'DECIMAL({precision}, {min(escala, precision)})'
+            elif isinstance(tipo_actual, Integer) and metricas['VALOR ABSOLUTO MAXIMO'] >= 0:
+                tipo_propuesto = 'INT' if metricas['VALOR ABSOLUTO MAXIMO'] * Holgura < 2 ** 31 else 'BIGINT'
+
+        registros.append({'COLUMNA': columna, 'COLUMNA SQL': columna_sql, 'TIPO ACTUAL': str(tipo_actual),
+                          'TIPO PROPUESTO': tipo_propuesto})
+
+    return pd.DataFrame(registros)
+
+
+def ProponerDDL(df_perfil, Tabla = 'Ventas', Holgura = 1.2):
+    """
+    Genera la sentencia CREATE TABLE de la tabla de ventas con los tipos propuestos por `ProponerTiposSQL`.
+
+    Parámetros:
+    - df_perfil (pandas.DataFrame): Perfil por cadena (ver `PerfilarVentas`) o total (ver `CombinarPerfiles`).
+    - Tabla (str): Nombre de la tabla.
+    - Holgura (float): Ver `ProponerTiposSQL`.
+
+    Retorna:
+    - ddl (str): Sentencia con la misma estructura de "Creación base de datos.sql".
+
+    Ejemplo:
+    >>> print(ProponerDDL(df_perfil))
+    CREATE TABLE Ventas(
+    	VentasID INT IDENTITY(1,1) NOT NULL,
+    	Tipo VARCHAR(9),
+    	...
+    	PRIMARY KEY (VentasID),
+    );
+    """
+
+    df_tipos = ProponerTiposSQL(df_perfil, Holgura)
+    tipos = {'INTEGER': 'INT'}
+    lineas = [f'\t{Tabla}ID INT IDENTITY(1,1) NOT NULL,']
+    lineas += [f"\t{fila['COLUMNA SQL']} {tipos.get(fila['TIPO PROPUESTO'], fila['TIPO PROPUESTO'])},"
+               for fila in df_tipos.to_dict('records')]
+    lineas.append(f'\tPRIMARY KEY ({Tabla}ID),')
+
+    return f'CREATE TABLE {Tabla}(\n' + '\n'.join(lineas) + '\n);'
@@ -0,0 +1,33 @@
+from CacheExcel import ConCache
+from LectorXlsx import LeerHojaVentas
+
+@ConCache
+def CargarAlkosto(NombreArchivo):
+    """
+    Carga los datos de ventas de Alkosto desde un archivo de Excel con una sola hoja.
+
+    Parámetros:
+    - NombreArchivo (str): Nombre del archivo que contiene los datos de ventas de Alkosto.
+
+    Retorna:
+    - df_alkosto (pandas.DataFrame): DataFrame que contiene los datos de ventas de Alkosto.
+
+    El archivo de Alkosto ya tiene la misma estructura del formato de ventas simple, por lo que solo se
+    carga la hoja con `LeerHojaVentas`, que la lee por bloques y aplica los tipos de `AplicarEsquema`
+    (incluida la conversión de 'FECHA' a tipo datetime).
+
+    Ejemplo:
+    >>> carpeta_ventas = os.path.join(os.getcwd(), 'Ventas')
+    >>> df_alkosto = CargarAlkosto(os.path.join(carpeta_ventas, 'VENTAS ALKOSTO.xlsx'))
+    >>> print(df_alkosto)
+          PUNTO DE VENTA            EAN  ... VALOR TOTAL      FECHA
+    0              ALAPA  8806098384846  ...      975515 2021-01-10
+    1              ALAPA  8806091987631  ...      135263 2021-01-10
+    2              ALAPA  8806098683802  ...      303330 2021-01-10
+    ...              ...            ...  ...         ...        ...
+
+    [61910 rows x 6 columns]
+    """
+
+    # Cargar la hoja del archivo por bloques y retornar el resultado
+    return LeerHojaVentas(NombreArchivo)
@@ -1,4 +1,6 @@
-import pandas as pd
+from CacheExcel import ConCache
+from EsquemaVentas import ConcatenarVentas
+from LectorXlsx import ListarHojasXlsx, LeerHojaVentas
 
 def CargarExito(NombreArchivo):
     """
@@ -10,15 +12,13 @@ def CargarExito(NombreArchivo):
     Retorna:
     - df_exito (pandas.DataFrame): DataFrame que contiene los datos combinados de ventas de Éxito.
 
-    Esta función carga las hojas del archivo especificado en un diccionario de DataFrames, donde cada elemento del diccionario corresponde a una hoja.
-    Luego, convierte el diccionario a una lista de DataFrames.
-    A continuación, combina todos los DataFrames de la lista en uno solo usando la función `pd.concat()`.
+    Esta función carga cada hoja del archivo especificado en una lista de DataFrames, donde cada elemento de la lista corresponde a una hoja.
+    A continuación, combina todos los DataFrames de la lista en uno solo usando la función `ConcatenarVentas()`.
     El resultado es un DataFrame que contiene los datos combinados de ventas de Éxito y se devuelve como resultado.
 
     Ejemplo:
     >>> carpeta_ventas = os.path.join(os.getcwd(), 'Ventas')
-    >>> archivo_exito = '\\EXITO.xlsx'
-    >>> df_exito = CargarExito(carpeta_ventas + archivo_exito)
+    >>> df_exito = CargarExito(os.path.join(carpeta_ventas, 'EXITO.xlsx'))
     >>> print(df_exito)
                         PUNTO DE VENTA            EAN  ...   VALOR TOTAL      FECHA
     0            EXITO BARRANCABERMEJA  8806098363391  ...  1.702879e+06 2021-01-08
@@ -36,12 +36,40 @@ def CargarExito(NombreArchivo):
     [53184 rows x 6 columns]
     """
 
-    # Crear un diccionario, donde cada elemento es un dataframe correspondiendo a una hoja del archivo de Excel
-    dict_df_exito = pd.read_excel(NombreArchivo, sheet_name = None, parse_dates = ['FECHA'])
-
-    # Convertir el diccionario a lista
-    list_df_exito = list(dict_df_exito.values())
+    # Crear una lista, donde cada elemento es un dataframe correspondiendo a una hoja del archivo de Excel
+    list_df_exito = [CargarHojaExito(NombreArchivo, hoja) for hoja in ListarHojasExito(NombreArchivo)]
 
     # Concatenar los dataframe en la lista y retornar el resultado
-    df_exito = pd.concat(list_df_exito)
-    return df_exito
\ No newline at end of file
+    df_exito = ConcatenarVentas(list_df_exito)
+    return df_exito
+
+
+def ListarHojasExito(NombreArchivo):
+    """
+    Lista los nombres de las hojas del archivo de ventas de Éxito, en el orden en que aparecen en el libro.
+
+    Parámetros:
+    - NombreArchivo (str): Nombre del archivo que contiene las hojas de datos de ventas de Éxito.
+
+    Retorna:
+    - hojas (list): Lista con el nombre de cada hoja.
+    """
+
+    return ListarHojasXlsx(NombreArchivo)
+
+
+@ConCache
+def CargarHojaExito(NombreArchivo, NombreHoja):
+    """
+    Carga una sola hoja del archivo de ventas de Éxito.
+
+    Parámetros:
+    - NombreArchivo (str): Nombre del archivo que contiene las hojas de datos de ventas de Éxito.
+    - NombreHoja (str): Nombre de la hoja a cargar.
+
+    Retorna:
+    - df_hoja (pandas.DataFrame): DataFrame con las ventas de la hoja, con los tipos de `AplicarEsquema`.
+    """
+
+    # Leer la hoja por bloques (ver `LeerHojaVentas`), sin cargar las demás hojas del libro
+    return LeerHojaVentas(NombreArchivo, NombreHoja)
@@ -1,6 +1,11 @@
+import numpy as np
 import pandas as pd
-import datetime as dt
 
+from CacheExcel import ConCache
+from EsquemaVentas import AplicarEsquema
+from LectorXlsx import LeerHojasXlsx
+
+@ConCache
 def CargarFalabella(NombreArchivo):
     """
     Carga y combina los datos de ventas de Falabella desde un archivo con dos hojas.
@@ -11,18 +16,18 @@ def CargarFalabella(NombreArchivo):
     Retorna:
     - df_falabella (pandas.DataFrame): DataFrame que contiene los datos combinados de ventas de Falabella.
 
-    Esta función carga las hojas del archivo especificado en dos DataFrames separados: uno para los montos y otro para las unidades.
-    Luego, transforma los DataFrames a un formato estrecho, donde las sucursales se convierten en atributos utilizando la función `pd.melt()`.
-    A continuación, se eliminan las filas que no tienen valores en las columnas 'VALOR TOTAL' y 'UNIDADES'.
+    Esta función lee por bloques las hojas del archivo especificado: una para los montos y otra para las unidades.
+    En cada bloque la columna 'FECHA' se convierte del formato serial de Excel a tipo datetime y el bloque se
+    transforma a un formato estrecho, donde las sucursales se convierten en atributos utilizando la función `pd.melt()`,
+    y se eliminan las filas que no tienen valores en las columnas 'VALOR TOTAL' y 'UNIDADES'. Así, de cada hoja ancha
+    solo se conserva en memoria un bloque a la vez, además de las ventas registradas.
     Después, se realiza una unión (JOIN) entre los dos DataFrames utilizando la función `pd.merge()`.
-    La columna 'FECHA' se convierte del formato serial de Excel a un objeto datetime utilizando una conversión basada en el número de días.
     Luego, las columnas se reorganizan para seguir la misma estructura que los otros archivos.
     Por último, el DataFrame resultante se devuelve como resultado.
 
     Ejemplo:
     >>> carpeta_ventas = os.path.join(os.getcwd(), 'Ventas')
-    >>> archivo_falabella = '\\VENTAS FALABELLA.xlsx'
-    >>> df_falabella = CargarFalabella(carpeta_ventas + archivo_falabella)
+    >>> df_falabella = CargarFalabella(os.path.join(carpeta_ventas, 'VENTAS FALABELLA.xlsx'))
     >>> print(df_falabella)
           PUNTO DE VENTA            EAN  ... VALOR TOTAL      FECHA
     0              ACQUA  8806098683802  ...   1165700.0 2021-01-04
@@ -40,38 +45,76 @@ def CargarFalabella(NombreArchivo):
     [18327 rows x 6 columns]
     """
 
-    # Cargar cada hoja del archivo a un dataframe separado
-    df_monto = pd.read_excel(NombreArchivo, sheet_name = 0)
-    df_unidades = pd.read_excel(NombreArchivo, sheet_name = 1)
+    # Leer cada hoja del archivo por bloques, pasando cada bloque a formato angosto
+    df_monto = _LeerHojaAngosta(NombreArchivo, 0, 'VALOR TOTAL')
+    df_unidades = _LeerHojaAngosta(NombreArchivo, 1, 'UNIDADES')
+
+    # Unir las dos hojas en el formato de ventas y retornar el resultado
+    return _UnirHojasFalabella(df_monto, df_unidades)
+
 
-    # Pasar las tablas a formato angosto (sucursales como atributo)
-    df_monto = pd.melt(df_monto,
-                       id_vars = df_monto.columns[[0, 1, 2]],
-                       var_name = 'PUNTO DE VENTA',
-                       value_name = 'VALOR TOTAL')
+def TransformarFalabella(df_monto, df_unidades):
+    """
+    Convierte las hojas de montos y de unidades de Falabella (una columna por sucursal) al formato de ventas.
 
-    df_unidades = pd.melt(df_unidades,
-                          id_vars = df_unidades.columns[[0, 1, 2]],
-                          var_name = 'PUNTO DE VENTA',
-                          value_name = 'UNIDADES')
+    Parámetros:
+    - df_monto (pandas.DataFrame): Hoja de montos, con las columnas 'FECHA' (serial de Excel), 'EAN' y 'MODELO'
+      seguidas de una columna por sucursal.
+    - df_unidades (pandas.DataFrame): Hoja de unidades, con la misma estructura que la hoja de montos.
 
-    # Remover filas sin valores
-    df_monto = df_monto[df_monto['VALOR TOTAL'] != 0]
-    df_unidades = df_unidades[df_unidades['UNIDADES'] != 0]
+    Retorna:
+    - df_falabella (pandas.DataFrame): DataFrame con las columnas 'PUNTO DE VENTA', 'EAN', 'MODELO', 'UNIDADES',
+      'VALOR TOTAL' y 'FECHA'.
 
+    La fecha se convierte antes de pasar las tablas a formato angosto, cuando cada hoja tiene una fila por
+    producto y fecha y no una fila por producto, fecha y sucursal. La conversión es vectorizada: el serial de
+    Excel es el número de días desde el 30 de diciembre de 1899. Al final se aplican los tipos de `AplicarEsquema`.
+    """
+
+    return _UnirHojasFalabella(_AngostarHoja(df_monto, 'VALOR TOTAL'), _AngostarHoja(df_unidades, 'UNIDADES'))
+
+
+def _AngostarHoja(df_hoja, NombreValor):
+    # Convertir la fecha serial de Excel a tipo datetime
+    df_hoja = df_hoja.assign(FECHA = _ConvertirFechaExcel(df_hoja['FECHA']))
+
+    # Pasar la tabla a formato angosto (sucursales como atributo)
+    df_hoja = pd.melt(df_hoja,
+                      id_vars = df_hoja.columns[[0, 1, 2]],
+                      var_name = 'PUNTO DE VENTA',
+                      value_name = NombreValor)
+
+    # Remover filas sin valores antes del JOIN, para que la unión solo procese las ventas registradas
+    return df_hoja[df_hoja[NombreValor] != 0]
+
+
+def _LeerHojaAngosta(NombreArchivo, Hoja, NombreValor):
+    # Leer una hoja ancha por bloques y pasar cada bloque a formato angosto en cuanto se lee
+    list_df = []
+    for _, df_bloque in LeerHojasXlsx(NombreArchivo, [Hoja]):
+        sucursales = list(df_bloque.columns[3:])
+        list_df.append(_AngostarHoja(df_bloque, NombreValor))
+
+    df_hoja = pd.concat(list_df, ignore_index = True)
+    if len(list_df) > 1:
+        # Ordenar por sucursal, como al pasar la hoja completa a formato angosto (dentro de cada sucursal los
+        # bloques ya están en el orden de la hoja)
+        codigos = pd.Categorical(df_hoja['PUNTO DE VENTA'], categories = sucursales).codes
+        df_hoja = df_hoja.take(np.argsort(codigos, kind = 'stable')).reset_index(drop = True)
+    return df_hoja
+
+
+def _UnirHojasFalabella(df_monto, df_unidades):
     # Hacer un JOIN entre las dos tablas
     df_falabella = pd.merge(df_monto, df_unidades)
 
-    # Convertir la fecha serial de Excel a tipo datetime
-    df_falabella['FECHA'] = df_falabella['FECHA'].apply(
-        lambda x: dt.datetime.fromordinal(
-            dt.datetime(1900, 1, 1).toordinal() + x - 2
-            )
-        )
-    
     # Reorganizar las columnas para que sigan la misma estructura de los otros archivos
     df_falabella = df_falabella.reindex(columns = ['PUNTO DE VENTA', 'EAN', 'MODELO', 
         'UNIDADES', 'VALOR TOTAL', 'FECHA'])
 
-    # Retornar el resultado
-    return df_falabella
\ No newline at end of file
+    return AplicarEsquema(df_falabella)
+
+
+def _ConvertirFechaExcel(serial):
+    # El día 0 del serial de Excel es el 30 de diciembre de 1899 (incluye el 29 de febrero de 1900 inexistente)
+    return pd.to_datetime(serial, unit = 'D', origin = '1899-12-30')
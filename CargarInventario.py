@@ -1,6 +1,15 @@
 import os
 import pandas as pd
-import pyodbc
+
+from EsquemaVentas import AplicarEsquema
+
+
+# Columnas del inventario que describen cada producto (la primera es la llave)
+COLUMNAS_PRODUCTO = ['EAN', 'REFERENCIA HOMOLOGADA', 'CATEGORIA', 'SUBCATEGORIA', 'LINEA', 'SUBLINEA']
+
+# Columnas del inventario que describen cada sede (la primera es la llave)
+COLUMNAS_SEDE = ['PUNTO DE VENTA', 'HOMOLOGA ALMACEN', 'TIPO', 'CANAL', 'CADENA', 'SUBCADENA',
+                 'REGIONAL', 'CIUDAD', 'CORE STORE', 'PROMOTER']
 
 
 def CargarInventario(NombreArchivo):
@@ -13,14 +22,12 @@ def CargarInventario(NombreArchivo):
     Retorna:
     - df_inventario (pandas.DataFrame): DataFrame que contiene los datos de inventario.
 
-    Esta función construye la ruta completa al archivo de inventario utilizando el directorio actual y el nombre del archivo especificado.
-    Luego, crea la cadena de conexión para acceder al archivo de Access utilizando el controlador de Microsoft Access.
-    A continuación, establece una conexión con el archivo de Access utilizando la cadena de conexión.
+    Esta función establece una conexión con el archivo de Access utilizando `ConectarInventario`.
     Se extrae toda la información de la tabla 'INVENTARIO_2' en el archivo de Access y se almacena en un DataFrame de Pandas.
     Finalmente, se cierra la conexión y se devuelve el DataFrame de inventario como resultado.
 
     Ejemplo:
-    >>> archivo_inventario = '\\BASE_INVENTARIO.accdb'
+    >>> archivo_inventario = 'BASE_INVENTARIO.accdb'
     >>> df_inventario = CargarInventario(archivo_inventario)
     >>> print(df_inventario)
 	           TIPO  CANAL     CADENA  ...       CIUDAD CORE STORE PROMOTER
@@ -39,19 +46,110 @@ def CargarInventario(NombreArchivo):
 	[649628 rows x 17 columns]
     """
 	
+	# Conectar al archivo
+	conn = ConectarInventario(NombreArchivo)
+
+	# Extraer toda la información de la tabla y almacenar en un dataframe
+	sql_query = 'SELECT * FROM INVENTARIO_2'
+	df_inventario = pd.read_sql(sql_query, conn)
+
+	# Cerrar la conexión y retornar el dataframe con los tipos del esquema de ventas
+	conn.close()
+	return AplicarEsquema(df_inventario)
+
+
+def ConectarInventario(NombreArchivo):
+	"""
+	Abre una conexión al archivo de inventario de Microsoft Access.
+
+	Parámetros:
+	- NombreArchivo (str): Nombre del archivo de inventario de Microsoft Access, relativo al directorio actual.
+
+	Retorna:
+	- conn (pyodbc.Connection): Conexión abierta al archivo.
+
+	Construye la ruta completa al archivo utilizando el directorio actual y crea la cadena de conexión con el
+	controlador de Microsoft Access. pyodbc se importa solo al conectarse, para que el resto del módulo pueda
+	usarse con otras conexiones (por ejemplo, una base de datos SQLite local).
+	"""
+
+	import pyodbc
+
 	# Ruta al archivo de inventario
-	archivo_inventario = os.getcwd() + NombreArchivo
+	archivo_inventario = os.path.join(os.getcwd(), NombreArchivo)
 
 	# Crear la cadena de conexión
 	cadena_conexion_access = f'DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={archivo_inventario}'
 
 	# Conectar al archivo
-	conn = pyodbc.connect(cadena_conexion_access)
+	return pyodbc.connect(cadena_conexion_access)
 
-	# Extraer toda la información de la tabla y almacenar en un dataframe
-	sql_query = 'SELECT * FROM INVENTARIO_2'
-	df_inventario = pd.read_sql(sql_query, conn)
 
-	# Cerrar la conexión y retornar el dataframe
-	conn.close()
-	return df_inventario
+def CargarDimensionesInventario(NombreArchivo = None, conexion = None, TamanoBloque = 50000):
+	"""
+	Construye las tablas de productos y de sedes leyendo el inventario por bloques.
+
+	Parámetros:
+	- NombreArchivo (str, opcional): Nombre del archivo de inventario de Microsoft Access.
+	- conexion (opcional): Conexión DB-API ya abierta que contiene la tabla 'INVENTARIO_2' (por ejemplo,
+	  `sqlite3.connect(...)`). Si se especifica, se usa en lugar de `NombreArchivo` y no se cierra al terminar.
+	- TamanoBloque (int): Número de filas que se extraen de la base de datos en cada bloque.
+
+	Retorna:
+	- df_productos (pandas.DataFrame): Tabla con las columnas `COLUMNAS_PRODUCTO`, una fila por EAN.
+	- df_sedes (pandas.DataFrame): Tabla con las columnas `COLUMNAS_SEDE`, una fila por punto de venta.
+
+	La consulta solo selecciona las columnas de producto y de sede, y las filas se extraen por bloques con
+	`pd.read_sql(..., chunksize = TamanoBloque)`, que internamente usa `fetchmany` del cursor.
+	De cada bloque se conservan únicamente los productos y sedes que no habían aparecido en bloques anteriores,
+	por lo que el resultado es el mismo que `drop_duplicates(keep = 'first')` sobre la tabla completa, pero la
+	memoria usada depende del tamaño de las tablas de dimensiones y no del número de filas del inventario.
+	Las dos tablas se retornan con los tipos de `AplicarEsquema`.
+
+	Ejemplo:
+	>>> df_productos, df_sedes = CargarDimensionesInventario(archivo_inventario)
+	>>> print(df_sedes.shape)
+	(1191, 10)
+	"""
+
+	conn = conexion if conexion is not None else ConectarInventario(NombreArchivo)
+
+	# Seleccionar solo las columnas necesarias para las dos tablas
+	columnas = COLUMNAS_PRODUCTO + [columna for columna in COLUMNAS_SEDE if columna not in COLUMNAS_PRODUCTO]
+	sql_query = 'SELECT ' + ', '.join(f'[{columna}]' for columna in columnas) + ' FROM INVENTARIO_2'
+
+	list_df_productos = []
+	list_df_sedes = []
+	eans_vistos = pd.Index([])
+	sedes_vistas = pd.Index([])
+
+	try:
+		for df_bloque in pd.read_sql(sql_query, conn, chunksize = TamanoBloque):
+
+			# Agregar los productos que aparecen por primera vez
+			df_nuevos = df_bloque[COLUMNAS_PRODUCTO].drop_duplicates(subset = ['EAN'], keep = 'first')
+			df_nuevos = df_nuevos[~df_nuevos['EAN'].isin(eans_vistos)]
+			if len(df_nuevos):
+				list_df_productos.append(df_nuevos)
+				eans_vistos = eans_vistos.append(pd.Index(df_nuevos['EAN']))
+
+			# Agregar las sedes que aparecen por primera vez
+			df_nuevas = df_bloque[COLUMNAS_SEDE].drop_duplicates(subset = ['PUNTO DE VENTA'], keep = 'first')
+			df_nuevas = df_nuevas[~df_nuevas['PUNTO DE VENTA'].isin(sedes_vistas)]
+			if len(df_nuevas):
+				list_df_sedes.append(df_nuevas)
+				sedes_vistas = sedes_vistas.append(pd.Index(df_nuevas['PUNTO DE VENTA']))
+	finally:
+		if conexion is None:
+			conn.close()
+
+	df_productos = AplicarEsquema(_ConcatenarDimension(list_df_productos, COLUMNAS_PRODUCTO))
+	df_sedes = AplicarEsquema(_ConcatenarDimension(list_df_sedes, COLUMNAS_SEDE))
+	return df_productos, df_sedes
+
+
+def _ConcatenarDimension(list_df, columnas):
+	# Unir los bloques de una tabla de dimensión (o retornar una tabla vacía si el inventario no tiene filas)
+	if not list_df:
+		return pd.DataFrame(columns = columnas)
+	return pd.concat(list_df, ignore_index = True)
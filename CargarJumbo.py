@@ -1,5 +1,8 @@
 import os
-import pandas as pd
+
+from CacheExcel import ConCache
+from EsquemaVentas import ConcatenarVentas
+from LectorXlsx import LeerHojaVentas
 
 def CargarJumbo(NombreCarpeta):
     """
@@ -12,13 +15,13 @@ def CargarJumbo(NombreCarpeta):
     - df_jumbo (pandas.DataFrame): DataFrame que contiene los datos combinados de todas las ventas mensuales de Jumbo.
 
     Esta función toma el nombre de una carpeta y construye la ruta completa a esa carpeta dentro del directorio actual.
-    Luego, itera sobre los archivos en la carpeta y carga cada archivo en un DataFrame de Pandas, agregándolos a una lista.
-    Después, combina todos los DataFrames de la lista en uno solo usando la función `pd.concat()` y lo devuelve como resultado.
+    Luego, itera sobre los archivos en la carpeta (en orden alfabético) y carga cada archivo en un DataFrame de Pandas,
+    agregándolos a una lista.
+    Después, combina todos los DataFrames de la lista en uno solo usando la función `ConcatenarVentas()` y lo devuelve como resultado.
 
     Ejemplo:
     >>> carpeta_ventas = os.path.join(os.getcwd(), 'Ventas')
-    >>> carpeta_jumbo = '\\jumbo'
-    >>> df_jumbo = CargarJumbo(carpeta_ventas + carpeta_jumbo)
+    >>> df_jumbo = CargarJumbo(os.path.join(carpeta_ventas, 'jumbo'))
     >>> print(df_jumbo)
               PUNTO DE VENTA            EAN  ... VALOR TOTAL      FECHA
     0      Jumbo 20 De Julio  8806098384709  ...  2390691.30 2021-04-04
@@ -36,16 +39,47 @@ def CargarJumbo(NombreCarpeta):
     [50369 rows x 6 columns]
     """
 
-    # Ruta a la carpeta con las ventas mensuales de Jumbo
-    carpeta_jumbo = os.path.join(os.getcwd(), NombreCarpeta)  # Create the full folder path
-
     # Crear un dataframe para cada archivo y agregarlo a la lista
-    list_df_jumbo = []
-    for archivo_mensual in os.listdir(carpeta_jumbo):
-        ruta_archivo = os.path.join(carpeta_jumbo, archivo_mensual)
-        df_mensual = pd.read_excel(ruta_archivo, parse_dates = ['FECHA'])
-        list_df_jumbo.append(df_mensual)  
+    list_df_jumbo = [CargarArchivoJumbo(ruta_archivo) for ruta_archivo in ListarArchivosJumbo(NombreCarpeta)]
 
     # Concatenar los dataframe en la lista y retornar el resultado
-    df_jumbo = pd.concat(list_df_jumbo, ignore_index = True)
-    return df_jumbo
\ No newline at end of file
+    df_jumbo = ConcatenarVentas(list_df_jumbo)
+    return df_jumbo
+
+
+def ListarArchivosJumbo(NombreCarpeta):
+    """
+    Lista las rutas de los archivos de ventas mensuales de Jumbo en orden alfabético.
+
+    Parámetros:
+    - NombreCarpeta (str): Nombre de la carpeta que contiene los archivos de ventas mensuales de Jumbo.
+
+    Retorna:
+    - rutas (list): Lista con la ruta completa de cada archivo mensual.
+
+    El orden es fijo para que el resultado combinado no dependa del orden en que el sistema operativo
+    devuelve los archivos de la carpeta.
+    """
+
+    # Ruta a la carpeta con las ventas mensuales de Jumbo
+    carpeta_jumbo = os.path.join(os.getcwd(), NombreCarpeta)
+
+    # Construir la ruta de cada archivo mensual
+    return [os.path.join(carpeta_jumbo, archivo_mensual)
+            for archivo_mensual in sorted(os.listdir(carpeta_jumbo))]
+
+
+@ConCache
+def CargarArchivoJumbo(RutaArchivo):
+    """
+    Carga un archivo de ventas mensuales de Jumbo.
+
+    Parámetros:
+    - RutaArchivo (str): Ruta al archivo de ventas mensuales de Jumbo.
+
+    Retorna:
+    - df_mensual (pandas.DataFrame): DataFrame con las ventas del mes, con los tipos de `AplicarEsquema`.
+    """
+
+    # Leer la hoja por bloques (ver `LeerHojaVentas`)
+    return LeerHojaVentas(RutaArchivo)
@@ -49,120 +49,333 @@ JUMBO    Ultrawide   Jumbo Calle 170        0.292135
                      Jumbo Santa Ana        0.168539
                      Jumbo Valle De Lili    0.067416
 Name: UNIDADES, Length: 6501, dtype: float64	
+
+Desde la línea de comandos se pueden seleccionar las cadenas a cargar y la última etapa a ejecutar (ingesta,
+ventas, distribucion o target). Solo se importan los módulos que necesitan las etapas y cadenas seleccionadas,
+por ejemplo, el inventario (y pyodbc) no se carga si solo se ejecuta la ingesta de algunas cadenas:
+
+Ejemplo:
+$ python Cargar_ventas_a_SQL.py --cadenas jumbo,exito --etapa ingesta
+$ python Cargar_ventas_a_SQL.py --cadenas jumbo --exportar-sql
+$ python Cargar_ventas_a_SQL.py --cadenas jumbo --etapa ventas --calidad calidad_ventas.csv
+
+Las ventas se pueden guardar en un lago de archivos Parquet particionado por cadena y mes, y luego calcular la
+distribución y el target sobre una parte del lago sin volver a cargar los archivos de Excel ni el inventario:
+
+Ejemplo:
+$ python Cargar_ventas_a_SQL.py --etapa ventas --lago LagoVentas
+$ python Cargar_ventas_a_SQL.py --desde-lago LagoVentas --cadenas jumbo --meses marzo,abril
 """
 
 import os
-import pandas as pd
-import datetime as dt
-from sqlalchemy import create_engine
+import argparse
 
-from CargarFalabella import *
-from CargarJumbo import *
-from CargarExito import *
-from CargarInventario import *
-from AsignarInfoFecha import *
+from RegistroCadenas import *
 
 
-# Rutas a las carpetas
-carpeta_ventas = os.path.join(os.getcwd(), 'Ventas')
+# Rutas a las carpetas (las rutas de los archivos de ventas y del inventario están en RegistroCadenas.py)
 carpeta_target = os.path.join(os.getcwd(), 'TG')
 
 # Variables para la conexion a la base de datos
 servidor_sql = 'GERMAN'
 db_sql = 'PruebaDB'
 tabla_sql_ventas = 'Ventas'
+exportar_sql = False
+exportar_sql_incremental = True
+tamano_lote_sql = 20000
+escritores_sql = 4
 
 # Variables para los archivos
-archivo_alkosto = '\\VENTAS ALKOSTO.xlsx'
-archivo_falabella = '\\VENTAS FALABELLA.xlsx'
-carpeta_jumbo = '\\jumbo'
-archivo_exito = '\\EXITO.xlsx'
-archivo_inventario = '\\BASE_INVENTARIO.accdb'
-archivo_target = '\\BASE TARGET.xlsx'
-
-
-# PASO 1 - CREACION DEL FORMATO DE VENTAS
-
-
-# Cargar las ventas de cada cadena a su propio dataframe
-df_alkosto = pd.read_excel(carpeta_ventas + archivo_alkosto, parse_dates = ['FECHA'])
-df_falabella = CargarFalabella(carpeta_ventas + archivo_falabella)
-df_jumbo = CargarJumbo(carpeta_ventas + carpeta_jumbo)
-df_exito = CargarExito(carpeta_ventas + archivo_exito)
-
-# Unir todas las ventas en un único dataframe
-df_ventas_simple = pd.concat([df_alkosto, df_falabella, df_jumbo, df_exito], 
-	ignore_index = True)
-
-# Cargar el inventario a un dataframe
-df_inventario = CargarInventario(archivo_inventario)
-
-# Descartar las columnas de inventario que deberán ser recalculadas/reasignadas
-df_inventario.drop(['TIPO2', 'UNIDADES', 'VALOR TOTAL', 'NUMERO SEMANA', 'FECHA', 'MES'], 
-	axis = 1, inplace = True)
-
-# Construir tabla con información de producto
-df_productos = df_inventario.drop_duplicates(subset = ['EAN'], keep = 'first')
-df_productos = df_productos[['EAN', 'REFERENCIA HOMOLOGADA', 'CATEGORIA', 'SUBCATEGORIA', 
-	'LINEA', 'SUBLINEA']]
-
-# Construir tabla con información de sedes
-df_sedes = df_inventario.drop_duplicates(subset = ['PUNTO DE VENTA'], keep = 'first')
-df_sedes = df_sedes[['PUNTO DE VENTA', 'HOMOLOGA ALMACEN', 'TIPO', 'CANAL', 'CADENA', 'SUBCADENA',
-        'REGIONAL', 'CIUDAD', 'CORE STORE', 'PROMOTER']]
-
-# Hacer dos LEFT JOIN para asociar la información de producto y sede a las ventas
-df_ventas = pd.merge(df_ventas_simple, df_productos, how = 'left', on = ['EAN'])
-df_ventas = pd.merge(df_ventas, df_sedes, how = 'left', on = ['PUNTO DE VENTA'])
-
-# Agregar información para columnas TIPO2, NUMERO SEMANA y MES
-df_ventas['TIPO2'] = 'SO'   # Código para ventas
-df_ventas = AsignarInfoFecha(df_ventas)
-
-# Reorganizar las columnas según el formato de ventas
-df_ventas = df_ventas.reindex(columns = ['TIPO', 'TIPO2', 'CANAL', 'CADENA', 'SUBCADENA',
- 	'PUNTO DE VENTA', 'HOMOLOGA ALMACEN', 'EAN', 'MODELO', 'REFERENCIA HOMOLOGADA', 
- 	'CATEGORIA', 'SUBCATEGORIA', 'LINEA', 'SUBLINEA', 'UNIDADES', 'VALOR TOTAL', 
- 	'REGIONAL', 'CIUDAD', 'NUMERO SEMANA', 'FECHA', 'MES', 'CORE STORE', 'PROMOTER'])
-
-'''
-# Crear la cadena de conexión con Windows Authentication
-cadena_conexion_sql = f'mssql+pyodbc://{servidor_sql}/{db_sql}?trusted_connection=yes&driver=ODBC+Driver+17+for+SQL+Server'
-
-# Crear el motor de conexión SQLAlchemy
-motor_sql = create_engine(cadena_conexion_sql)
-
-# Exportar el dataframe a la tabla de ventas en SQL
-df_ventas.to_sql(tabla_sql_ventas, motor_sql, if_exists = 'replace', index = False)
-'''
-
-# PASO 2 - CALCULO DE DISTRIBUCION DE VENTAS POR CADENA, LINEA DE PRODUCTO Y PUNTO DE VENTA
-
-
-# Calcular los totales de unidades vendidas por cadena y linea
-totales_por_linea = df_ventas.groupby(['CADENA', 'LINEA'])['UNIDADES'].sum()
-
-# Calcular los totales de unidades vendidas por cadena, linea y venta
-totales_por_sede = df_ventas.groupby(['CADENA', 'LINEA', 'PUNTO DE VENTA'])['UNIDADES'].sum()
-
-# Comparar las dos series para encontrar el peso de cada punto de venta
-idx = pd.IndexSlice
-subconjuntos_linea = totales_por_linea.loc[idx[:, :]]   # Hallar los subconjuntos excluyendo el
-                                                                     # indice del punto de venta para poder
-                                                                     # realizar la división correctamente
-porcentajes_por_sede = (totales_por_sede / subconjuntos_linea)
-
-
-# PROXIMA FASE - CREACION DEL FORMATO DE TARGET
-
-# Cargar el target a un dataframe
-df_target = pd.read_excel(carpeta_target + archivo_target)
-
-# Cambiar los nombres de las dos primeras columnas para que coincidan con los indices de la serie de porcentajes
-df_target = df_target.rename(columns = {"CLIENTE": "CADENA", "LINEA LG": "LINEA"})
-
-# Convertir las dos primeras columnas en índices para poder operar el dataframe con la serie
-df_target = df_target.set_index(['CADENA', 'LINEA'])
-
-# Hallar el target de unidades a vender en cada sede mensualmente
-#monthly_target_units = df_target.mul(porcentajes_por_sede, level=['CADENA', 'LINEA'])
+archivo_target = 'BASE TARGET.xlsx'
+archivo_target_sede = 'TARGET POR SEDE.csv'
+
+# Variables para la medición de las etapas (desactivada por defecto). Con una carpeta de perfiles se guarda
+# un reporte JSON con el tiempo, la memoria y las filas de cada etapa.
+carpeta_perfiles = None
+perfilar_funciones = False
+medir_asignaciones = False
+
+# Archivo del perfil de calidad de las columnas de las ventas por cadena (desactivado por defecto). Con un archivo
+# se calculan la longitud máxima, los decimales, los nulos y las llaves sin dimensión de cada columna, y se
+# propone el tamaño de las columnas de la tabla 'Ventas'.
+archivo_calidad = None
+
+# Carpeta del lago de ventas en Parquet (desactivado por defecto). Con `carpeta_lago` las ventas se guardan en el
+# lago al terminar la etapa de ventas; con `carpeta_lago_lectura` se leen del lago en lugar de ejecutar el PASO 1.
+carpeta_lago = None
+carpeta_lago_lectura = None
+
+# Etapas del flujo, en orden. Cada etapa ejecuta también las anteriores.
+ETAPAS = ['ingesta', 'ventas', 'distribucion', 'target']
+ALIAS_ETAPAS = {'ingest': 'ingesta', 'sales': 'ventas', 'distribution': 'distribucion'}
+
+
+def LeerArgumentos(argumentos = None):
+    """
+    Lee las opciones de la línea de comandos.
+
+    Parámetros:
+    - argumentos (list, opcional): Lista de argumentos. Por defecto se usa sys.argv, que en IDLE está vacío,
+      por lo que `exec()` ejecuta todas las cadenas y todas las etapas.
+
+    Retorna:
+    - opciones (argparse.Namespace): Opciones con los atributos cadenas, etapa, exportar_sql, procesos, perfil,
+      cprofile, tracemalloc, calidad, lago, desde_lago, meses, limpiar_cache y dias_sin_uso.
+    """
+
+    parser = argparse.ArgumentParser(description = 'Carga las ventas de las cadenas y calcula la distribución '
+                                                   'de ventas y el target por punto de venta.')
+    parser.add_argument('--cadenas', '--chains', default = None,
+                        help = f"Fuentes a cargar separadas por comas ({','.join(FUENTES)}). Por defecto, todas.")
+    parser.add_argument('--etapa', '--stage', default = ETAPAS[-1],
+                        type = lambda etapa: ALIAS_ETAPAS.get(etapa.lower(), etapa.lower()), choices = ETAPAS,
+                        help = 'Última etapa a ejecutar. Por defecto, todas.')
+    parser.add_argument('--exportar-sql', action = 'store_true',
+                        help = 'Exportar las ventas a SQL en la etapa de ventas.')
+    parser.add_argument('--procesos', type = int, default = None,
+                        help = 'Número de procesos para la ingesta. Por defecto, uno por núcleo.')
+    parser.add_argument('--perfil', default = None, metavar = 'CARPETA',
+                        help = 'Medir cada etapa y guardar el reporte JSON en esta carpeta.')
+    parser.add_argument('--cprofile', action = 'store_true',
+                        help = 'Guardar además un archivo de cProfile por etapa y por tarea de ingesta.')
+    parser.add_argument('--tracemalloc', action = 'store_true',
+                        help = 'Medir el pico de memoria asignada por etapa con tracemalloc (más lento).')
+    parser.add_argument('--calidad', default = None, metavar = 'ARCHIVO',
+                        help = 'Actualizar el perfil de calidad de las cadenas cargadas en este archivo CSV y '
+                               'mostrar la tabla de ventas propuesta.')
+    parser.add_argument('--lago', default = None, metavar = 'CARPETA',
+                        help = 'Guardar las ventas de las cadenas cargadas en el lago Parquet de esta carpeta.')
+    parser.add_argument('--desde-lago', default = None, metavar = 'CARPETA',
+                        help = 'Leer las ventas del lago Parquet de esta carpeta en lugar de cargarlas de Excel '
+                               '(no se puede usar con --calidad, --lago ni --exportar-sql).')
+    parser.add_argument('--meses', default = None,
+                        help = 'Meses a leer del lago separados por comas (por ejemplo, enero,febrero). '
+                               'Por defecto, todos.')
+    parser.add_argument('--limpiar-cache', action = 'store_true',
+                        help = 'Eliminar de la caché de Excel las entradas vencidas antes de cargar.')
+    parser.add_argument('--dias-sin-uso', type = float, default = None, metavar = 'DIAS',
+                        help = 'Con --limpiar-cache, eliminar también las entradas sin usar en este número de días.')
+    opciones = parser.parse_args(argumentos)
+
+    # Todas las etapas trabajan sobre las ventas, por lo que se necesita al menos una cadena de ventas
+    try:
+        fuentes_ventas = SeleccionarFuentes(opciones.cadenas, Tipo = 'VENTAS')
+    except ValueError as error:
+        parser.error(str(error))
+    if not fuentes_ventas:
+        parser.error(f"--cadenas debe incluir al menos una cadena de ventas "
+                     f"({','.join(SeleccionarFuentes(Tipo = 'VENTAS'))}).")
+
+    # Al leer del lago no se ejecuta la etapa de ventas, y las ventas del lago no tienen la fuente de cada fila ni
+    # las tablas del inventario, que necesitan el perfil de calidad, la escritura del lago y la exportación a SQL
+    if opciones.desde_lago or carpeta_lago_lectura:
+        incompatibles = [opcion for opcion, activa in [('--calidad', opciones.calidad or archivo_calidad),
+                                                       ('--lago', opciones.lago or carpeta_lago),
+                                                       ('--exportar-sql', opciones.exportar_sql or exportar_sql)]
+                         if activa]
+        if incompatibles:
+            parser.error(f"--desde-lago no se puede usar con {', '.join(incompatibles)}: estas opciones se "
+                         f"aplican a las ventas cargadas de Excel en la etapa de ventas.")
+
+    return opciones
+
+
+def EjecutarEtapa(Etapa):
+    # Indica si la etapa está incluida en la etapa seleccionada
+    return ETAPAS.index(Etapa) <= ETAPAS.index(etapa)
+
+
+# La ingesta usa varios procesos; en Windows cada proceso vuelve a importar este script, por lo que el
+# flujo principal solo debe ejecutarse en el proceso original (también al usar exec() en IDLE)
+if __name__ == '__main__':
+
+    opciones = LeerArgumentos()
+    etapa = opciones.etapa
+    exportar_sql = exportar_sql or opciones.exportar_sql
+    carpeta_perfiles = opciones.perfil or carpeta_perfiles
+    perfilar_funciones = perfilar_funciones or opciones.cprofile
+    medir_asignaciones = medir_asignaciones or opciones.tracemalloc
+    archivo_calidad = opciones.calidad or archivo_calidad
+    carpeta_lago = opciones.lago or carpeta_lago
+    carpeta_lago_lectura = opciones.desde_lago or carpeta_lago_lectura
+
+    # Cadenas de ventas seleccionadas. El inventario se carga si se pide explícitamente o si alguna etapa
+    # posterior a la ingesta lo necesita (sin --cadenas, la ingesta sola no lo carga).
+    fuentes_ventas = SeleccionarFuentes(opciones.cadenas, Tipo = 'VENTAS')
+    fuentes_ingesta = SeleccionarFuentes(opciones.cadenas) if opciones.cadenas is not None else fuentes_ventas
+    if EjecutarEtapa('ventas'):
+        fuentes_ingesta = SeleccionarFuentes(fuentes_ingesta + SeleccionarFuentes(Tipo = 'DIMENSIONES'))
+
+    # Las dependencias de cada etapa se importan solo si la etapa se ejecuta
+    import pandas as pd
+    from PerfilEtapas import *
+    from IngestaParalela import *
+    from EsquemaVentas import *
+
+    # Eliminar de la caché las entradas de archivos que cambiaron o ya no existen (y las que no se usan hace
+    # tiempo), antes de que la ingesta vuelva a guardar las de los archivos actuales
+    if opciones.limpiar_cache:
+        from CacheExcel import LimpiarCache
+        print('Entradas de caché eliminadas:', LimpiarCache(DiasSinUso = opciones.dias_sin_uso))
+
+    # Registro de la medición de las etapas (None si está desactivada: las etapas se ejecutan sin medir)
+    perfil = None
+    if carpeta_perfiles is not None:
+        perfil = CrearPerfil(carpeta_perfiles, perfilar_funciones, medir_asignaciones)
+
+
+    # PASO 1 - CREACION DEL FORMATO DE VENTAS
+
+
+    # Leer las ventas del lago en lugar de cargarlas: solo las particiones de las cadenas y meses seleccionados y,
+    # si solo se calculan la distribución y el target, solo las columnas que usa el PASO 2
+    if carpeta_lago_lectura is not None:
+        from LagoVentas import *
+        from DistribucionVentas import GRANO_SEDE
+
+        with MedirEtapa(perfil, 'LECTURA LAGO') as medicion:
+            df_ventas = LeerLagoVentas(carpeta_lago_lectura,
+                Cadenas = [FUENTES[fuente]['GRUPO'] for fuente in fuentes_ventas] if opciones.cadenas else None,
+                Meses = [mes.strip().upper() for mes in opciones.meses.split(',')] if opciones.meses else None,
+                Columnas = GRANO_SEDE + ['UNIDADES'] if EjecutarEtapa('distribucion') else None)
+            medicion['SALIDA'] = df_ventas
+
+    else:
+        # Cargar las ventas de las cadenas seleccionadas y el inventario en paralelo (un proceso por archivo u
+        # hoja). Cada tarea se mide dentro de su proceso, por lo que la etapa no usa cProfile.
+        with MedirEtapa(perfil, 'INGESTA', Perfilar = False) as medicion:
+            tareas_ingesta = CrearTareasFuentes(fuentes_ingesta)
+            resultados_ingesta, df_tiempos_ingesta = EjecutarIngesta(tareas_ingesta, opciones.procesos,
+                CarpetaPerfiles = os.path.join(carpeta_perfiles, perfil['ID'] + '_ingesta')
+                if perfil is not None and perfilar_funciones else None)
+            medicion['SALIDA'] = resultados_ingesta
+            medicion['DETALLE'] = df_tiempos_ingesta.to_dict('records')
+        print(df_tiempos_ingesta.to_string())
+
+        # Unir las ventas de todas las cadenas en un único dataframe (conservando las columnas categóricas)
+        with MedirEtapa(perfil, 'CONCATENAR VENTAS') as medicion:
+            df_ventas_simple = ConcatenarVentas([resultados_ingesta[FUENTES[fuente]['GRUPO']]
+                                                 for fuente in fuentes_ventas])
+            medicion['SALIDA'] = df_ventas_simple
+
+    if EjecutarEtapa('ventas') and carpeta_lago_lectura is None:
+        from AsignarInfoFecha import *
+        from UnionDimensiones import *
+
+        # Tomar las tablas con información de producto y de sedes construidas a partir del inventario
+        # (el inventario se lee por bloques, sin cargar la tabla completa en memoria)
+        df_productos, df_sedes = resultados_ingesta['INVENTARIO']
+
+        # Agregar información para columnas TIPO2, NUMERO SEMANA y MES
+        with MedirEtapa(perfil, 'INFO FECHA', Entrada = df_ventas_simple) as medicion:
+            df_ventas_simple['TIPO2'] = 'SO'   # Código para ventas
+            df_ventas_simple = AsignarInfoFecha(df_ventas_simple)
+            medicion['SALIDA'] = df_ventas_simple
+
+        # Asociar la información de producto y sede a las ventas (equivalente a dos LEFT JOIN), construyendo
+        # directamente las columnas del formato de ventas, y aplicar los tipos del esquema
+        with MedirEtapa(perfil, 'UNION DIMENSIONES', Entrada = df_ventas_simple) as medicion:
+            df_ventas, df_llaves_sin_dimension = UnirDimensiones(df_ventas_simple,
+            	[(df_productos, 'EAN'), (df_sedes, 'PUNTO DE VENTA')], Columnas = COLUMNAS_VENTAS)
+            df_ventas = AplicarEsquema(df_ventas)
+            medicion['SALIDA'] = df_ventas
+
+        # Cadena de cada fila según la fuente de la que se cargó (también para las filas cuyo punto de venta no
+        # está en el inventario y quedan sin la columna CADENA)
+        grupos_ventas = [FUENTES[fuente]['GRUPO'] for fuente in fuentes_ventas]
+        cadena_por_fila = pd.Index(grupos_ventas).repeat([len(resultados_ingesta[grupo]) for grupo in grupos_ventas])
+
+        # Perfil de calidad de cada columna de las ventas, por cadena. El perfil de las cadenas cargadas reemplaza
+        # su perfil anterior en el archivo, y los tamaños propuestos consideran todas las cadenas del archivo.
+        if archivo_calidad is not None:
+            from CalidadVentas import *
+
+            with MedirEtapa(perfil, 'CALIDAD', Entrada = df_ventas) as medicion:
+                df_calidad = ActualizarPerfilCadenas(
+                    PerfilarVentas(df_ventas, Grupos = cadena_por_fila,
+                                   Dimensiones = [(df_productos, 'EAN'), (df_sedes, 'PUNTO DE VENTA')]),
+                    archivo_calidad)
+                medicion['SALIDA'] = df_calidad
+            print(CombinarPerfiles(df_calidad).to_string())
+            print(ProponerDDL(df_calidad, tabla_sql_ventas))
+
+        # Guardar las ventas en el lago Parquet particionado por cadena y mes. Solo se reemplazan los archivos de
+        # las cadenas cargadas en esta ejecución.
+        if carpeta_lago is not None:
+            from LagoVentas import *
+
+            with MedirEtapa(perfil, 'ESCRITURA LAGO', Entrada = df_ventas) as medicion:
+                reporte_lago = EscribirLagoVentas(df_ventas, carpeta_lago, Fuentes = cadena_por_fila)
+                medicion['DETALLE'] = [reporte_lago]
+            print(reporte_lago)
+
+        # Exportar el dataframe a la tabla de ventas en SQL (desactivado por defecto: requiere acceso al servidor)
+        if exportar_sql:
+            from ExportarVentas import *
+
+            # Crear el motor de conexión SQLAlchemy con Windows Authentication y fast_executemany
+            motor_sql = CrearMotorSQL(servidor_sql, db_sql)
+
+            # Exportar el dataframe por lotes a la tabla de ventas creada con "Creación base de datos.sql".
+            # En modo incremental solo se reescriben las cadenas y meses que cambiaron desde la última carga,
+            # y solo se tocan las cadenas cargadas en esta ejecución (según la cadena de origen de cada fila,
+            # también para las filas cuyo punto de venta no está en el inventario).
+            with MedirEtapa(perfil, 'EXPORTACION SQL', Entrada = df_ventas) as medicion:
+                if exportar_sql_incremental:
+                    reporte_exportacion = ExportarVentasIncremental(df_ventas, motor_sql, tabla_sql_ventas,
+                        TamanoLote = tamano_lote_sql, Fuentes = cadena_por_fila)
+                else:
+                    reporte_exportacion = ExportarVentasSQL(df_ventas, motor_sql, tabla_sql_ventas,
+                        TamanoLote = tamano_lote_sql, Escritores = escritores_sql, Fuentes = cadena_por_fila)
+                medicion['DETALLE'] = [reporte_exportacion]
+
+    # PASO 2 - CALCULO DE DISTRIBUCION DE VENTAS POR CADENA, LINEA DE PRODUCTO Y PUNTO DE VENTA
+
+    if EjecutarEtapa('distribucion'):
+        from DistribucionVentas import *
+
+        # Calcular en una sola pasada el peso de cada punto de venta dentro de las unidades vendidas de su cadena
+        # y linea
+        with MedirEtapa(perfil, 'DISTRIBUCION', Entrada = df_ventas) as medicion:
+            porcentajes_por_sede = CalcularPorcentajesPorSede(df_ventas)
+            medicion['SALIDA'] = porcentajes_por_sede
+
+
+    # PASO 3 - CREACION DEL FORMATO DE TARGET
+
+    if EjecutarEtapa('target'):
+        from CacheExcel import *
+        from AsignacionTarget import *
+
+        with MedirEtapa(perfil, 'TARGET', Entrada = porcentajes_por_sede) as medicion:
+            # Cargar el target a un dataframe (reutilizando la caché si el archivo no cambió) con índice
+            # (CADENA, LINEA)
+            df_target = PrepararTarget(LeerConCache(pd.read_excel, os.path.join(carpeta_target, archivo_target)))
+
+            # Hallar el target de unidades a vender en cada sede mensualmente, y las cadenas y lineas sin ventas que
+            # no se pudieron repartir, y guardarlo en formato largo (una fila por sede y mes). Con solo algunas
+            # cadenas seleccionadas, el target se reparte solo para esas cadenas y las demás conservan el target
+            # guardado en la ejecución anterior.
+            df_target_por_sede, df_target_sin_distribucion, df_target_largo = ActualizarTargetPorSede(
+                df_target, porcentajes_por_sede, os.path.join(carpeta_target, archivo_target_sede),
+                Cadenas = [FUENTES[fuente]['GRUPO'] for fuente in fuentes_ventas] if opciones.cadenas else None)
+            medicion['SALIDA'] = df_target_largo
+
+        # Informar el target que no se pudo repartir porque su cadena y linea no tienen ventas
+        if len(df_target_sin_distribucion) > 0:
+            print(f'Target sin distribuir ({len(df_target_sin_distribucion)} cadenas y lineas sin ventas, '
+                  f'{df_target_sin_distribucion.to_numpy(dtype = float).sum():,.0f} unidades):')
+            print(df_target_sin_distribucion.to_string())
+
+    # Guardar el reporte de la medición de las etapas
+    if perfil is not None:
+        print(ReportePerfil(perfil).to_string())
+
+        # Memoria de cada columna de las ventas con y sin los tipos del esquema (fuera de las etapas medidas)
+        df_memoria = ReporteMemoria(df_ventas if EjecutarEtapa('ventas') or carpeta_lago_lectura is not None
+                                    else df_ventas_simple)
+        print(df_memoria.to_string())
+
+        ruta_reporte = GuardarReporte(perfil, Cadenas = fuentes_ingesta, Etapa = etapa,
+                                      Memoria = df_memoria.reset_index(names = 'COLUMNA').to_dict('records'))
+        print('Reporte de etapas:', ruta_reporte)
@@ -30,5 +30,6 @@ CREATE TABLE Ventas(
 	Mes VARCHAR(10),
 	CoreStore VARCHAR(3),
 	Promoter VARCHAR(3),
+	CadenaFuente VARCHAR(20),
 	PRIMARY KEY (VentasID),
 );
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+
+# Nivel de detalle y participación usados en el PASO 2: peso de cada punto de venta dentro de su cadena y línea
+GRANO_SEDE = ['CADENA', 'LINEA', 'PUNTO DE VENTA']
+PARTICIPACIONES_SEDE = {'PORCENTAJE': ['CADENA', 'LINEA']}
+
+# Límite para combinar los códigos de varias columnas en un solo entero sin desbordamiento
+_MAXIMO_CODIGO = 2 ** 62
+
+
+def _CombinarCodigos(list_codigos, list_tamanos):
+    # Combinar los códigos enteros de varias columnas en un solo código por fila, conservando el orden
+    # lexicográfico. Cuando el número de combinaciones posibles crece demasiado se vuelve a numerar.
+    combinado = np.zeros(len(list_codigos[0]), dtype = np.int64)
+    tamano_combinado = 1
+    for codigos, tamano in zip(list_codigos, list_tamanos):
+        if tamano_combinado * max(tamano, 1) >= _MAXIMO_CODIGO:
+            combinado, unicos = pd.factorize(combinado, sort = True)
+            tamano_combinado = len(unicos)
+        combinado = combinado * max(tamano, 1) + codigos
+        tamano_combinado *= max(tamano, 1)
+    return combinado
+
+
+def AgregarVentas(df_ventas, Grano = GRANO_SEDE, Valor = 'UNIDADES'):
+    """
+    Suma una columna de ventas por grupo en una sola pasada sobre códigos enteros.
+
+    Parámetros:
+    - df_ventas (pandas.DataFrame): DataFrame con el formato de ventas.
+    - Grano (list): Columnas que definen cada grupo.
+    - Valor (str): Columna a sumar.
+
+    Retorna:
+    - totales (pandas.Series): Suma de `Valor` por grupo, con un MultiIndex de las columnas de `Grano` ordenado
+      como en `groupby()`. Solo incluye los grupos que aparecen en las ventas.
+
+    Es equivalente a `df_ventas.groupby(Grano, observed = True)[Valor].sum()`. Cada columna de `Grano` se
+    convierte a códigos enteros con `pd.factorize()`, los códigos se combinan en un solo entero por fila y la suma
+    se hace con `np.bincount()`. Como en `groupby()`, se descartan las filas con alguna columna de `Grano` vacía
+    y los valores vacíos de `Valor` cuentan como cero.
+    """
+
+    # Convertir cada columna del grano a códigos enteros ordenados
+    list_codigos = []
+    list_niveles = []
+    for columna in Grano:
+        codigos, niveles = pd.factorize(df_ventas[columna], sort = True)
+        list_codigos.append(codigos)
+        list_niveles.append(pd.Index(niveles, name = columna))
+
+    # Descartar las filas con alguna columna del grano vacía
+    validas = np.logical_and.reduce([codigos >= 0 for codigos in list_codigos])
+    list_codigos = [codigos[validas] for codigos in list_codigos]
+    valores = df_ventas[Valor].to_numpy(dtype = np.float64, na_value = 0)[validas]
+
+    # Numerar los grupos presentes y sumar los valores de cada uno
+    combinado = _CombinarCodigos(list_codigos, [len(niveles) for niveles in list_niveles])
+    grupo, unicos = pd.factorize(combinado, sort = True)
+    sumas = np.bincount(grupo, weights = valores, minlength = len(unicos))
+
+    # Códigos de cada columna para cada grupo, tomados de la primera fila del grupo
+    primera_fila = np.empty(len(unicos), dtype = np.int64)
+    primera_fila[grupo[::-1]] = np.arange(len(grupo))[::-1]
+    indice = pd.MultiIndex(levels = list_niveles, codes = [codigos[primera_fila] for codigos in list_codigos],
+                           names = list(Grano), verify_integrity = False)
+
+    if pd.api.types.is_integer_dtype(df_ventas[Valor].dtype):
+        sumas = sumas.astype(np.int64)
+    return pd.Series(sumas, index = indice, name = Valor)
+
+
+def CalcularDistribucion(df_ventas, Grano = GRANO_SEDE, Participaciones = None, Valor = 'UNIDADES'):
+    """
+    Calcula los totales de ventas por grupo y la participación de cada grupo dentro de grupos más generales.
+
+    Parámetros:
+    - df_ventas (pandas.DataFrame): DataFrame con el formato de ventas.
+    - Grano (list): Columnas del nivel más detallado (por defecto, cadena, línea y punto de venta).
+    - Participaciones (dict, opcional): Diccionario nombre -> lista de columnas de `Grano` que definen el grupo
+      general contra el que se calcula cada participación. Por defecto, `PARTICIPACIONES_SEDE`.
+    - Valor (str): Columna a sumar.
+
+    Retorna:
+    - df_distribucion (pandas.DataFrame): Una fila por grupo de `Grano` con la columna `Valor` (total del grupo)
+      y una columna por cada participación (total del grupo / total de su grupo general).
+
+    Las ventas se recorren una sola vez con `AgregarVentas`. Los totales de los grupos generales se obtienen
+    sumando los totales del nivel detallado, por lo que cada participación adicional solo cuesta una pasada sobre
+    los grupos y no sobre las ventas. Para calcular participaciones por mes, semana o ciudad basta con agregar esa
+    columna a `Grano` y a los grupos generales que correspondan.
+
+    Ejemplo:
+    >>> df_distribucion = CalcularDistribucion(df_ventas,
+    ...     Grano = ['CADENA', 'LINEA', 'PUNTO DE VENTA', 'MES'],
+    ...     Participaciones = {'PORCENTAJE SEDE': ['CADENA', 'LINEA', 'MES'],
+    ...                        'PORCENTAJE MES': ['CADENA', 'LINEA', 'PUNTO DE VENTA']})
+    >>> print(df_distribucion)
+                                               UNIDADES  PORCENTAJE SEDE  PORCENTAJE MES
+    CADENA  LINEA      PUNTO DE VENTA MES
+    ALKOSTO Accesorios ACQUA          ENERO          15         0.002311        0.067568
+                                      FEBRERO        65         0.005606        0.292793
+                                      MARZO          20         0.001804        0.090090
+    ...
+    """
+
+    if Participaciones is None:
+        Participaciones = PARTICIPACIONES_SEDE
+
+    totales = AgregarVentas(df_ventas, Grano, Valor)
+    df_distribucion = totales.to_frame()
+    valores = totales.to_numpy(dtype = np.float64)
+
+    for nombre, columnas_generales in Participaciones.items():
+
+        # Numerar los grupos generales a partir de los códigos de los grupos detallados
+        niveles = [list(Grano).index(columna) for columna in columnas_generales]
+        combinado = _CombinarCodigos([totales.index.codes[nivel] for nivel in niveles],
+                                     [len(totales.index.levels[nivel]) for nivel in niveles])
+        grupo_general, unicos = pd.factorize(combinado)
+
+        # Sumar los totales de cada grupo general y dividir el total de cada grupo detallado por el de su grupo
+        totales_generales = np.bincount(grupo_general, weights = valores, minlength = len(unicos))
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            df_distribucion[nombre] = valores / totales_generales[grupo_general]
+
+    return df_distribucion
+
+
+def CalcularPorcentajesPorSede(df_ventas):
+    """
+    Calcula el peso de cada punto de venta en las unidades vendidas de su cadena y línea.
+
+    Parámetros:
+    - df_ventas (pandas.DataFrame): DataFrame con el formato de ventas.
+
+    Retorna:
+    - porcentajes_por_sede (pandas.Series): Serie 'UNIDADES' con índice (CADENA, LINEA, PUNTO DE VENTA), igual a
+      dividir `groupby(['CADENA', 'LINEA', 'PUNTO DE VENTA'])` entre `groupby(['CADENA', 'LINEA'])`.
+    """
+
+    df_distribucion = CalcularDistribucion(df_ventas)
+    return df_distribucion['PORCENTAJE'].rename('UNIDADES')
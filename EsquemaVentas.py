@@ -0,0 +1,157 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+
+# Columnas del formato de ventas, en el orden de la tabla 'Ventas'
+COLUMNAS_VENTAS = ['TIPO', 'TIPO2', 'CANAL', 'CADENA', 'SUBCADENA',
+    'PUNTO DE VENTA', 'HOMOLOGA ALMACEN', 'EAN', 'MODELO', 'REFERENCIA HOMOLOGADA',
+    'CATEGORIA', 'SUBCATEGORIA', 'LINEA', 'SUBLINEA', 'UNIDADES', 'VALOR TOTAL',
+    'REGIONAL', 'CIUDAD', 'NUMERO SEMANA', 'FECHA', 'MES', 'CORE STORE', 'PROMOTER']
+
+# Columnas de texto con pocos valores distintos que se guardan como categóricas
+COLUMNAS_CATEGORICAS = ['TIPO', 'TIPO2', 'CANAL', 'CADENA', 'SUBCADENA', 'PUNTO DE VENTA', 'HOMOLOGA ALMACEN',
+    'MODELO', 'REFERENCIA HOMOLOGADA', 'CATEGORIA', 'SUBCATEGORIA', 'LINEA', 'SUBLINEA', 'REGIONAL', 'CIUDAD',
+    'NUMERO SEMANA', 'MES', 'CORE STORE', 'PROMOTER']
+
+# Número de decimales con que se guarda 'VALOR TOTAL'. Elimina los residuos de punto flotante de las hojas de
+# Excel (por ejemplo, 2465600.4000000004) sin cambiar los valores con decimales reales.
+ESCALA_VALOR_TOTAL = 6
+
+
+def AplicarEsquema(df_entrada):
+    """
+    Convierte las columnas del formato de ventas presentes en el DataFrame a sus tipos compactos.
+
+    Parámetros:
+    - df_entrada (pandas.DataFrame): DataFrame con algunas o todas las columnas de `COLUMNAS_VENTAS`.
+
+    Retorna:
+    - df_salida (pandas.DataFrame): Copia del DataFrame con los tipos del esquema.
+
+    Las columnas de `COLUMNAS_CATEGORICAS` se convierten a categóricas. 'EAN' se convierte a entero de 64 bits
+    (Int64, que admite valores vacíos); los EAN que no son numéricos (por ejemplo, un modelo escrito en la
+    columna del EAN) quedan vacíos y se emite una advertencia con su número y algunos ejemplos. 'UNIDADES' se reduce al
+    entero más pequeño que contiene sus valores, 'VALOR TOTAL' se guarda como float64 redondeado a
+    `ESCALA_VALOR_TOTAL` decimales y 'FECHA' como datetime64[ns]. Las demás columnas no se modifican.
+
+    Ejemplo:
+    >>> df_jumbo = AplicarEsquema(CargarJumbo(os.path.join(carpeta_ventas, 'jumbo')))
+    >>> print(df_jumbo.dtypes)
+    PUNTO DE VENTA          category
+    EAN                        Int64
+    MODELO                  category
+    UNIDADES                   int16
+    VALOR TOTAL              float64
+    FECHA             datetime64[ns]
+    dtype: object
+    """
+
+    columnas = {}
+
+    for columna in df_entrada.columns.intersection(COLUMNAS_CATEGORICAS):
+        if not isinstance(df_entrada[columna].dtype, CategoricalDtype):
+            columnas[columna] = df_entrada[columna].astype('category')
+
+    if 'EAN' in df_entrada.columns:
+        ean = df_entrada['EAN']
+        columnas['EAN'] = pd.to_numeric(ean, errors = 'coerce').astype('Int64')
+
+        # Avisar de los EAN que no se pudieron convertir, ya que esas ventas no se podrán unir con su producto
+        no_numericos = ean.notna().to_numpy() & columnas['EAN'].isna().to_numpy()
+        if no_numericos.any():
+            ejemplos = pd.unique(ean[no_numericos].astype(str))[:5]
+            warnings.warn(f"{int(no_numericos.sum())} valores de 'EAN' no son numéricos y quedan vacíos "
+                          f"(por ejemplo: {', '.join(map(repr, ejemplos))})", stacklevel = 2)
+
+    if 'UNIDADES' in df_entrada.columns:
+        unidades = df_entrada['UNIDADES']
+        if unidades.isna().any():
+            columnas['UNIDADES'] = unidades.astype('Int32')
+        else:
+            columnas['UNIDADES'] = pd.to_numeric(unidades.astype(np.int64), downcast = 'integer')
+
+    if 'VALOR TOTAL' in df_entrada.columns:
+        columnas['VALOR TOTAL'] = df_entrada['VALOR TOTAL'].astype(np.float64).round(ESCALA_VALOR_TOTAL)
+
+    if 'FECHA' in df_entrada.columns:
+        columnas['FECHA'] = pd.to_datetime(df_entrada['FECHA']).astype('datetime64[ns]')
+
+    return df_entrada.assign(**columnas)
+
+
+def ConcatenarVentas(list_df):
+    """
+    Concatena DataFrames con el esquema de ventas conservando las columnas categóricas.
+
+    Parámetros:
+    - list_df (list): Lista de DataFrames con el esquema de ventas (ver `AplicarEsquema`).
+
+    Retorna:
+    - df_ventas (pandas.DataFrame): DataFrame concatenado, con índice nuevo.
+
+    `pd.concat()` convierte a texto una columna categórica si sus categorías no son las mismas en todos los
+    DataFrames. Aquí, antes de concatenar, cada columna categórica recibe la unión de las categorías de todos
+    los DataFrames, de modo que el resultado sigue siendo categórico y las cadenas comparten categorías.
+    """
+
+    list_df = list(list_df)
+    columnas_categoricas = [columna for columna in list_df[0].columns
+                            if all(columna in df.columns and isinstance(df[columna].dtype, CategoricalDtype)
+                                   for df in list_df)]
+
+    for columna in columnas_categoricas:
+        categorias = pd.Index(sorted(set().union(*(df[columna].cat.categories for df in list_df))))
+        list_df = [df.assign(**{columna: df[columna].cat.set_categories(categorias)}) for df in list_df]
+
+    return pd.concat(list_df, ignore_index = True)
+
+
+def ReporteMemoria(df_entrada):
+    """
+    Compara la memoria de cada columna con esquema y sin esquema.
+
+    Parámetros:
+    - df_entrada (pandas.DataFrame): DataFrame con el esquema de ventas aplicado.
+
+    Retorna:
+    - df_reporte (pandas.DataFrame): Tipo y megabytes de cada columna antes (categóricas como texto, enteros como
+      int64) y después del esquema, con una fila 'TOTAL'.
+
+    La memoria "antes" se calcula convirtiendo una columna a la vez, por lo que no es necesario tener las dos
+    versiones del DataFrame en memoria.
+
+    Ejemplo:
+    >>> print(ReporteMemoria(df_ventas))
+                           TIPO ANTES  MB ANTES    TIPO DESPUES  MB DESPUES
+    TIPO                           object    11.451        category       0.184
+    TIPO2                          object    10.844        category       0.184
+    ...
+    UNIDADES                        int64     1.470           int16       0.368
+    VALOR TOTAL                   float64     1.470         float64       1.470
+    ...
+    TOTAL                                   223.359                       8.972
+    """
+
+    registros = {}
+    for columna in df_entrada.columns:
+        serie = df_entrada[columna]
+        if isinstance(serie.dtype, CategoricalDtype):
+            serie_antes = serie.astype(object)
+        elif pd.api.types.is_integer_dtype(serie.dtype) and not serie.isna().any():
+            serie_antes = serie.astype(np.int64)
+        elif pd.api.types.is_integer_dtype(serie.dtype):
+            serie_antes = serie.astype(np.float64)
+        else:
+            serie_antes = serie
+
+        registros[columna] = {'TIPO ANTES': str(serie_antes.dtype),
+                              'MB ANTES': serie_antes.memory_usage(index = False, deep = True) / 1e6,
+                              'TIPO DESPUES': str(serie.dtype),
+                              'MB DESPUES': serie.memory_usage(index = False, deep = True) / 1e6}
+
+    df_reporte = pd.DataFrame.from_dict(registros, orient = 'index')
+    df_reporte.loc['TOTAL'] = ['', df_reporte['MB ANTES'].sum(), '', df_reporte['MB DESPUES'].sum()]
+    return df_reporte.round(3)
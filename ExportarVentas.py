@@ -0,0 +1,336 @@
+import time
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.types import VARCHAR, Integer, DECIMAL, Date, DateTime
+
+
+# Nombre de cada columna del formato de ventas en la tabla 'Ventas' (ver "Creación base de datos.sql")
+COLUMNAS_SQL = {
+    'TIPO': 'Tipo', 'TIPO2': 'Tipo2', 'CANAL': 'Canal', 'CADENA': 'Cadena', 'SUBCADENA': 'Subcadena',
+    'PUNTO DE VENTA': 'PuntoDeVenta', 'HOMOLOGA ALMACEN': 'HomologaAlmacen', 'EAN': 'EAN', 'MODELO': 'Modelo',
+    'REFERENCIA HOMOLOGADA': 'ReferenciaHomologada', 'CATEGORIA': 'Categoria', 'SUBCATEGORIA': 'Subcategoria',
+    'LINEA': 'Linea', 'SUBLINEA': 'Sublinea', 'UNIDADES': 'Unidades', 'VALOR TOTAL': 'ValorTotal',
+    'REGIONAL': 'Regional', 'CIUDAD': 'Ciudad', 'NUMERO SEMANA': 'NumeroSemana', 'FECHA': 'Fecha', 'MES': 'Mes',
+    'CORE STORE': 'CoreStore', 'PROMOTER': 'Promoter'}
+
+# Tipo de cada columna en la tabla 'Ventas' (ver "Creación base de datos.sql")
+TIPOS_SQL = {
+    'Tipo': VARCHAR(10), 'Tipo2': VARCHAR(2), 'Canal': VARCHAR(10), 'Cadena': VARCHAR(10),
+    'Subcadena': VARCHAR(20), 'PuntoDeVenta': VARCHAR(60), 'HomologaAlmacen': VARCHAR(3), 'EAN': VARCHAR(15),
+    'Modelo': VARCHAR(100), 'ReferenciaHomologada': VARCHAR(20), 'Categoria': VARCHAR(3),
+    'Subcategoria': VARCHAR(6), 'Linea': VARCHAR(15), 'Sublinea': VARCHAR(15), 'Unidades': Integer(),
+    'ValorTotal': DECIMAL(26, 15), 'Regional': VARCHAR(20), 'Ciudad': VARCHAR(20), 'NumeroSemana': VARCHAR(3),
+    'Fecha': Date(), 'Mes': VARCHAR(10), 'CoreStore': VARCHAR(3), 'Promoter': VARCHAR(3),
+    'CadenaFuente': VARCHAR(20)}
+
+# Tabla donde se registran las particiones cargadas por la exportación incremental
+TABLA_METADATOS = 'VentasCargas'
+
+# Tipo de cada columna en la tabla de metadatos de carga
+TIPOS_SQL_METADATOS = {
+    'Tabla': VARCHAR(60), 'CadenaFuente': VARCHAR(20), 'Periodo': VARCHAR(7), 'FechaMin': Date(), 'FechaMax': Date(),
+    'Filas': Integer(), 'Checksum': VARCHAR(16), 'FechaCarga': DateTime()}
+
+# Periodo de la partición de las ventas sin fecha
+PERIODO_SIN_FECHA = ''
+
+def CrearMotorSQL(Servidor, BaseDatos, Driver = 'ODBC Driver 17 for SQL Server'):
+    """
+    Crea el motor de conexión SQLAlchemy a SQL Server con Windows Authentication.
+
+    Parámetros:
+    - Servidor (str): Nombre del servidor de SQL Server.
+    - BaseDatos (str): Nombre de la base de datos.
+    - Driver (str): Nombre del controlador ODBC instalado.
+
+    Retorna:
+    - motor_sql (sqlalchemy.engine.Engine): Motor de conexión con `fast_executemany` activado, para que
+      pyodbc envíe cada lote de filas en una sola llamada en lugar de una sentencia por fila.
+
+    Ejemplo:
+    >>> motor_sql = CrearMotorSQL('GERMAN', 'PruebaDB')
+    """
+
+    driver = Driver.replace(' ', '+')
+    cadena_conexion_sql = f'mssql+pyodbc://{Servidor}/{BaseDatos}?trusted_connection=yes&driver={driver}'
+    return create_engine(cadena_conexion_sql, fast_executemany = True)
+
+
+def PrepararVentasSQL(df_ventas, Fuentes = None):
+    """
+    Convierte el formato de ventas a los nombres y tipos de columna de la tabla 'Ventas'.
+
+    Parámetros:
+    - df_ventas (pandas.DataFrame): DataFrame con el formato de ventas.
+    - Fuentes (array, opcional): Cadena de la que se cargó cada fila (por ejemplo, 'JUMBO'). Por defecto, la
+      columna 'CADENA'.
+
+    Retorna:
+    - df_sql (pandas.DataFrame): DataFrame con las columnas renombradas según `COLUMNAS_SQL`, el EAN como texto,
+      la fecha sin hora y la columna 'CadenaFuente'.
+
+    'CadenaFuente' es la cadena de origen de cada fila, que existe también en las filas cuyo punto de venta no
+    está en el inventario y quedan con 'Cadena' vacía.
+    """
+
+    df_sql = df_ventas.reindex(columns = list(COLUMNAS_SQL)).rename(columns = COLUMNAS_SQL)
+    df_sql['CadenaFuente'] = df_sql['Cadena'].astype(object) if Fuentes is None \
+        else np.asarray(Fuentes, dtype = object)
+
+    # El EAN se guarda como texto; los valores numéricos se escriben sin decimales
+    ean = df_sql['EAN']
+    if pd.api.types.is_float_dtype(ean):
+        ean = ean.astype('Int64')
+    df_sql['EAN'] = ean.astype('string').astype(object).where(ean.notna(), None)
+
+    # La columna de fecha es de tipo DATE
+    df_sql['Fecha'] = pd.to_datetime(df_sql['Fecha']).dt.date
+
+    return df_sql
+
+
+def ExportarVentasSQL(df_ventas, motor_sql, Tabla = 'Ventas', TamanoLote = 10000, Escritores = 1,
+                      if_exists = 'append', Fuentes = None):
+    """
+    Exporta el formato de ventas a la tabla de ventas en SQL por lotes.
+
+    Parámetros:
+    - df_ventas (pandas.DataFrame): DataFrame con el formato de ventas.
+    - motor_sql (sqlalchemy.engine.Engine): Motor de conexión a la base de datos.
+    - Tabla (str): Nombre de la tabla de destino.
+    - TamanoLote (int): Número de filas que se envían a la base de datos en cada lote.
+    - Escritores (int): Número de conexiones que escriben en paralelo, cada una sobre una partición del DataFrame.
+    - if_exists (str): 'append' para agregar a la tabla existente (creada con "Creación base de datos.sql"),
+      'replace' para volver a crearla o 'fail'.
+    - Fuentes (array, opcional): Cadena de la que se cargó cada fila (ver `PrepararVentasSQL`).
+
+    Retorna:
+    - reporte (dict): Número de filas, lotes, segundos y filas por segundo de la exportación.
+
+    Las columnas se renombran y se les asigna el tipo de la tabla 'Ventas' con `PrepararVentasSQL` y `TIPOS_SQL`.
+    Cada lote se envía con un solo `executemany`: con SQL Server y `fast_executemany` (ver `CrearMotorSQL`)
+    pyodbc manda todos los parámetros del lote en una llamada, y con los demás motores SQLAlchemy agrupa las
+    filas en sentencias INSERT de varias filas. Con varios escritores los lotes se reparten en particiones
+    contiguas y cada partición se escribe en su propia conexión y transacción. En SQLite siempre se usa un
+    solo escritor, porque la base de datos admite una sola escritura a la vez.
+
+    Ejemplo:
+    >>> motor_sql = create_engine('sqlite:///ventas.db')
+    >>> ExportarVentasSQL(df_ventas, motor_sql, tabla_sql_ventas, TamanoLote = 20000)
+    {'FILAS': 183790, 'LOTES': 10, 'SEGUNDOS': 5.647, 'FILAS POR SEGUNDO': 32549.1}
+    """
+
+    inicio = time.perf_counter()
+    df_sql = PrepararVentasSQL(df_ventas, Fuentes)
+
+    # SQLite admite un solo escritor a la vez, por lo que las particiones se escriben una tras otra
+    if motor_sql.dialect.name == 'sqlite':
+        Escritores = 1
+
+    # Crear (o validar) la tabla antes de repartir las filas entre los escritores
+    df_sql.head(0).to_sql(Tabla, motor_sql, if_exists = if_exists, index = False, dtype = TIPOS_SQL)
+
+    # Dividir el DataFrame en lotes y repartir los lotes entre las particiones de cada escritor
+    limites_lotes = list(range(0, len(df_sql), TamanoLote))
+    particiones = [lotes for lotes in np.array_split(np.array(limites_lotes, dtype = int), max(1, Escritores))
+                   if len(lotes)]
+
+    def EscribirParticion(lotes):
+        with motor_sql.begin() as conexion:
+            _EscribirLotes(df_sql, conexion, Tabla, TamanoLote, lotes)
+
+    if len(particiones) <= 1:
+        for lotes in particiones:
+            EscribirParticion(lotes)
+    else:
+        with ThreadPoolExecutor(max_workers = len(particiones)) as ejecutor:
+            list(ejecutor.map(EscribirParticion, particiones))
+
+    segundos = time.perf_counter() - inicio
+    return {'FILAS': len(df_sql), 'LOTES': len(limites_lotes), 'SEGUNDOS': round(segundos, 3),
+            'FILAS POR SEGUNDO': round(len(df_sql) / segundos, 1) if segundos > 0 else float('inf')}
+
+
+def _EscribirLotes(df_sql, conexion, Tabla, TamanoLote, lotes = None):
+    # Insertar las filas del DataFrame por lotes usando una conexión (y transacción) ya abierta
+    if lotes is None:
+        lotes = range(0, len(df_sql), TamanoLote)
+    for inicio_lote in lotes:
+        df_lote = df_sql.iloc[inicio_lote:inicio_lote + TamanoLote]
+        df_lote.to_sql(Tabla, conexion, if_exists = 'append', index = False, dtype = TIPOS_SQL)
+
+
+def CalcularParticionesVentas(df_sql):
+    """
+    Resume el formato de ventas en particiones por cadena de origen y mes, con un checksum del contenido de cada una.
+
+    Parámetros:
+    - df_sql (pandas.DataFrame): DataFrame con las columnas de la tabla 'Ventas' (ver `PrepararVentasSQL`).
+
+    Retorna:
+    - df_particiones (pandas.DataFrame): Una fila por partición con las columnas 'CadenaFuente', 'Periodo'
+      (AAAA-MM, o `PERIODO_SIN_FECHA` para las ventas sin fecha), 'FechaMin', 'FechaMax', 'Filas' y 'Checksum'.
+    - claves_filas (pandas.MultiIndex): Partición (CadenaFuente, Periodo) de cada fila de `df_sql`.
+
+    El checksum es la suma (módulo 2^64) del hash de cada fila calculado con `pd.util.hash_pandas_object()`,
+    por lo que no depende del orden de las filas y cambia si cambia cualquier valor de la partición.
+    Las ventas sin cadena de origen quedan en la partición con cadena vacía, y las ventas sin fecha de cada
+    cadena en una partición propia con el periodo `PERIODO_SIN_FECHA`.
+    """
+
+    fecha = pd.to_datetime(df_sql['Fecha'])
+    cadena = df_sql['CadenaFuente'].astype(object).where(df_sql['CadenaFuente'].notna(), '')
+    periodo = fecha.dt.strftime('%Y-%m').astype(object).where(fecha.notna(), PERIODO_SIN_FECHA).to_numpy()
+
+    df_claves = pd.DataFrame({'CadenaFuente': cadena.to_numpy(), 'Periodo': periodo, 'Fecha': fecha.to_numpy(),
+                              'Hash': pd.util.hash_pandas_object(df_sql, index = False).to_numpy()})
+
+    df_particiones = df_claves.groupby(['CadenaFuente', 'Periodo']).agg(
+        FechaMin = ('Fecha', 'min'), FechaMax = ('Fecha', 'max'), Filas = ('Hash', 'size'),
+        Checksum = ('Hash', 'sum')).reset_index()
+    df_particiones['Checksum'] = df_particiones['Checksum'].map('{:016x}'.format)
+
+    claves_filas = pd.MultiIndex.from_arrays([df_claves['CadenaFuente'], df_claves['Periodo']])
+    return df_particiones, claves_filas
+
+
+def LeerMetadatosCarga(motor_sql, Tabla = 'Ventas', TablaMetadatos = TABLA_METADATOS):
+    """
+    Lee las particiones registradas por cargas anteriores de la tabla indicada.
+
+    Parámetros:
+    - motor_sql (sqlalchemy.engine.Engine): Motor de conexión a la base de datos.
+    - Tabla (str): Nombre de la tabla de ventas.
+    - TablaMetadatos (str): Nombre de la tabla de metadatos de carga.
+
+    Retorna:
+    - df_metadatos (pandas.DataFrame): Una fila por partición cargada, con la fecha máxima cargada (marca de agua),
+      el checksum y la fecha de la carga. Vacío si la tabla de metadatos aún no existe.
+    """
+
+    if not inspect(motor_sql).has_table(TablaMetadatos):
+        return pd.DataFrame(columns = list(TIPOS_SQL_METADATOS))
+
+    consulta = text(f'SELECT * FROM {TablaMetadatos} WHERE Tabla = :tabla')
+    with motor_sql.connect() as conexion:
+        df_metadatos = pd.read_sql(consulta, conexion, params = {'tabla': Tabla})
+    df_metadatos['CadenaFuente'] = df_metadatos['CadenaFuente'].fillna('')
+    df_metadatos['Periodo'] = df_metadatos['Periodo'].fillna(PERIODO_SIN_FECHA)
+    return df_metadatos
+
+
+def ExportarVentasIncremental(df_ventas, motor_sql, Tabla = 'Ventas', TablaMetadatos = TABLA_METADATOS,
+                              TamanoLote = 10000, Fuentes = None):
+    """
+    Exporta a SQL solo las particiones (cadena de origen y mes) del formato de ventas que cambiaron desde la
+    última carga.
+
+    Parámetros:
+    - df_ventas (pandas.DataFrame): DataFrame con el formato de ventas.
+    - motor_sql (sqlalchemy.engine.Engine): Motor de conexión a la base de datos.
+    - Tabla (str): Nombre de la tabla de destino.
+    - TablaMetadatos (str): Nombre de la tabla donde se registran las particiones cargadas.
+    - TamanoLote (int): Número de filas que se envían a la base de datos en cada lote.
+    - Fuentes (array, opcional): Cadena de la que se cargó cada fila (ver `PrepararVentasSQL`). Debe pasarse
+      siempre que se exporten solo algunas cadenas y haya filas sin 'CADENA'; de lo contrario, esas filas
+      forman una sola partición para todas las cadenas y se reemplazan juntas.
+
+    Retorna:
+    - reporte (dict): Número de particiones, particiones escritas y eliminadas, filas escritas, segundos y
+      filas por segundo de la exportación.
+
+    Las ventas se dividen en particiones por cadena de origen ('CadenaFuente') y mes de la columna 'FECHA' y se
+    calcula un checksum de cada una con `CalcularParticionesVentas`. Las particiones nuevas o cuyo checksum es
+    distinto al registrado en la tabla de metadatos se borran de la tabla de ventas (todo el mes de esa cadena de
+    origen, o todas sus ventas sin fecha) y se vuelven a insertar. También se borran los meses que estaban
+    cargados para una cadena presente en `df_ventas` pero que ya no tienen ventas. Como los borrados usan la
+    cadena de origen y no la columna 'Cadena' del inventario, las filas de otras cadenas cuyo punto de venta no
+    está en el inventario no se tocan. Las cadenas que no están en `df_ventas` no se modifican, por lo que se puede
+    exportar solo una parte de las cadenas. Todo se hace en una sola transacción, junto con la actualización de los
+    metadatos (filas, checksum, fecha mínima y máxima cargada y fecha de la carga).
+
+    Ejemplo:
+    >>> motor_sql = create_engine('sqlite:///ventas.db')
+    >>> ExportarVentasIncremental(df_ventas, motor_sql, tabla_sql_ventas, Fuentes = cadena_por_fila)   # Primera carga
+    {'PARTICIONES': 21, 'ESCRITAS': 21, 'ELIMINADAS': 0, 'FILAS': 50000, 'SEGUNDOS': 2.009, 'FILAS POR SEGUNDO': 24894.0}
+    >>> ExportarVentasIncremental(df_ventas, motor_sql, tabla_sql_ventas, Fuentes = cadena_por_fila)   # Sin cambios
+    {'PARTICIONES': 21, 'ESCRITAS': 0, 'ELIMINADAS': 0, 'FILAS': 0, 'SEGUNDOS': 0.312, 'FILAS POR SEGUNDO': 0.0}
+    """
+
+    inicio = time.perf_counter()
+    df_sql = PrepararVentasSQL(df_ventas, Fuentes)
+    df_particiones, claves_filas = CalcularParticionesVentas(df_sql)
+    df_metadatos = LeerMetadatosCarga(motor_sql, Tabla, TablaMetadatos)
+
+    # Comparar las particiones actuales con las registradas en la última carga
+    df_comparacion = pd.merge(df_particiones, df_metadatos[['CadenaFuente', 'Periodo', 'Checksum']],
+                              how = 'outer', on = ['CadenaFuente', 'Periodo'], suffixes = ('', ' ANTERIOR'),
+                              indicator = True)
+    cadenas_actuales = set(df_particiones['CadenaFuente'])
+    df_escribir = df_comparacion[(df_comparacion['_merge'] == 'left_only') |
+                                 ((df_comparacion['_merge'] == 'both') &
+                                  (df_comparacion['Checksum'] != df_comparacion['Checksum ANTERIOR']))]
+    df_eliminar = df_comparacion[(df_comparacion['_merge'] == 'right_only') &
+                                 df_comparacion['CadenaFuente'].isin(cadenas_actuales)]
+
+    claves_escribir = pd.MultiIndex.from_frame(df_escribir[['CadenaFuente', 'Periodo']])
+    df_filas = df_sql[claves_filas.isin(claves_escribir)]
+
+    # Crear las tablas si no existen
+    df_sql.head(0).to_sql(Tabla, motor_sql, if_exists = 'append', index = False, dtype = TIPOS_SQL)
+
+    with motor_sql.begin() as conexion:
+
+        # Borrar el mes completo de cada partición que se va a reescribir o que ya no tiene ventas
+        for cadena, periodo in pd.concat([df_escribir, df_eliminar])[['CadenaFuente', 'Periodo']].itertuples(index = False):
+            condicion_cadena = 'CadenaFuente IS NULL' if cadena == '' else 'CadenaFuente = :cadena'
+            if periodo == PERIODO_SIN_FECHA:
+                fecha_inicio, fecha_fin = None, None
+                condicion_fecha = 'Fecha IS NULL'
+            else:
+                fecha_inicio, fecha_fin = _LimitesPeriodo(periodo)
+                condicion_fecha = 'Fecha >= :inicio AND Fecha < :fin'
+            conexion.execute(text(f'DELETE FROM {Tabla} WHERE {condicion_cadena} AND {condicion_fecha}'),
+                             {'cadena': cadena, 'inicio': fecha_inicio, 'fin': fecha_fin})
+
+        # Insertar las filas de las particiones nuevas o modificadas
+        _EscribirLotes(df_filas, conexion, Tabla, TamanoLote)
+
+        # Actualizar los metadatos de las particiones tocadas
+        _RegistrarMetadatosCarga(conexion, Tabla, TablaMetadatos,
+                                 df_particiones.merge(df_escribir[['CadenaFuente', 'Periodo']]),
+                                 pd.concat([df_escribir, df_eliminar])[['CadenaFuente', 'Periodo']])
+
+    segundos = time.perf_counter() - inicio
+    return {'PARTICIONES': len(df_particiones), 'ESCRITAS': len(df_escribir), 'ELIMINADAS': len(df_eliminar),
+            'FILAS': len(df_filas), 'SEGUNDOS': round(segundos, 3),
+            'FILAS POR SEGUNDO': round(len(df_filas) / segundos, 1) if segundos > 0 else float('inf')}
+
+
+def _LimitesPeriodo(periodo):
+    # Primer día del mes y primer día del mes siguiente para un periodo 'AAAA-MM'
+    ano, mes = int(periodo[:4]), int(periodo[5:7])
+    fecha_inicio = dt.date(ano, mes, 1)
+    fecha_fin = dt.date(ano + mes // 12, mes % 12 + 1, 1)
+    return fecha_inicio, fecha_fin
+
+
+def _RegistrarMetadatosCarga(conexion, Tabla, TablaMetadatos, df_cargadas, df_tocadas):
+    # Reemplazar en la tabla de metadatos las filas de las particiones tocadas por la carga
+    pd.DataFrame(columns = list(TIPOS_SQL_METADATOS)).to_sql(
+        TablaMetadatos, conexion, if_exists = 'append', index = False, dtype = TIPOS_SQL_METADATOS)
+
+    for cadena, periodo in df_tocadas.itertuples(index = False):
+        conexion.execute(text(f'DELETE FROM {TablaMetadatos} WHERE Tabla = :tabla '
+                              'AND CadenaFuente = :cadena AND Periodo = :periodo'),
+                         {'tabla': Tabla, 'cadena': cadena, 'periodo': periodo})
+
+    df_registro = df_cargadas.assign(Tabla = Tabla, FechaCarga = pd.Timestamp.now())
+    df_registro['FechaMin'] = pd.to_datetime(df_registro['FechaMin']).dt.date
+    df_registro['FechaMax'] = pd.to_datetime(df_registro['FechaMax']).dt.date
+    df_registro[list(TIPOS_SQL_METADATOS)].to_sql(TablaMetadatos, conexion, if_exists = 'append', index = False,
+                                                  dtype = TIPOS_SQL_METADATOS)
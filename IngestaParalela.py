@@ -0,0 +1,92 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from EsquemaVentas import ConcatenarVentas
+from PerfilEtapas import MedirLlamada, RutaPerfil
+
+
+def _EjecutarTarea(funcion, argumentos, Etiqueta = None, CarpetaPerfiles = None):
+    # Ejecutar una tarea de carga y medirla dentro del proceso trabajador
+    ruta_perfil = RutaPerfil(CarpetaPerfiles, Etiqueta) if CarpetaPerfiles is not None else None
+    with MedirLlamada(Etiqueta, ruta_perfil) as medicion:
+        df = funcion(*argumentos)
+    return df, medicion, os.getpid()
+
+
+def EjecutarIngesta(tareas, max_procesos = None, CarpetaPerfiles = None):
+    """
+    Ejecuta las tareas de carga en un grupo de procesos y combina los resultados por grupo.
+
+    Parámetros:
+    - tareas (list): Lista de tuplas (grupo, etiqueta, funcion, argumentos), como la que retorna
+      `RegistroCadenas.CrearTareasFuentes`.
+    - max_procesos (int, opcional): Número máximo de procesos. Por defecto se usa el número de núcleos
+      disponibles. Con 1 las tareas se ejecutan en el proceso actual, sin crear procesos adicionales.
+    - CarpetaPerfiles (str, opcional): Si se especifica, cada tarea se ejecuta con cProfile y su resultado se
+      guarda en esta carpeta como '<etiqueta>.prof'.
+
+    Retorna:
+    - resultados (dict): Diccionario grupo -> DataFrame con los resultados combinados de las tareas del grupo.
+      Si el grupo tiene una sola tarea, se guarda su resultado tal como fue retornado (por ejemplo, la tupla
+      (df_productos, df_sedes) del inventario).
+    - df_tiempos (pandas.DataFrame): DataFrame con la duración, el tiempo de CPU, el pico de memoria del proceso
+      que la ejecutó y el número de filas de cada tarea. El pico de memoria es el del proceso desde que inició,
+      por lo que en un proceso que ejecutó varias tareas incluye las anteriores.
+
+    Las tareas se envían todas al grupo de procesos, pero los resultados se recogen en el orden de la lista,
+    por lo que el resultado combinado es siempre el mismo sin importar qué tarea termine primero.
+    Los DataFrames de un mismo grupo se concatenan con `ConcatenarVentas()` ignorando el índice original.
+    Las funciones de carga deben estar definidas a nivel de módulo para poder enviarse a otros procesos.
+
+    Ejemplo:
+    >>> resultados, df_tiempos = EjecutarIngesta(tareas)
+    >>> print(df_tiempos)
+                   TAREA       GRUPO  SEGUNDOS  CPU SEGUNDOS  MB PICO RSS   FILAS    PID PERFIL
+    0            ALKOSTO     ALKOSTO     10.21         10.02        301.5   61910   4312   None
+    1          FALABELLA   FALABELLA      3.05          2.98        198.2   18327   4313   None
+    ...
+    """
+
+    if max_procesos is None:
+        max_procesos = min(os.cpu_count() or 1, len(tareas))
+
+    inicio = time.perf_counter()
+
+    if max_procesos <= 1:
+        salidas = [_EjecutarTarea(funcion, argumentos, etiqueta, CarpetaPerfiles)
+                   for grupo, etiqueta, funcion, argumentos in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers = max_procesos) as ejecutor:
+            futuros = [ejecutor.submit(_EjecutarTarea, funcion, argumentos, etiqueta, CarpetaPerfiles)
+                       for grupo, etiqueta, funcion, argumentos in tareas]
+            salidas = [futuro.result() for futuro in futuros]
+
+    duracion_total = time.perf_counter() - inicio
+
+    # Agrupar los resultados respetando el orden de las tareas
+    frames_por_grupo = {}
+    registros_tiempo = []
+    for (grupo, etiqueta, funcion, argumentos), (df, medicion, pid) in zip(tareas, salidas):
+        frames_por_grupo.setdefault(grupo, []).append(df)
+        filas = sum(len(parte) for parte in df) if isinstance(df, tuple) else len(df)
+        registros_tiempo.append({'TAREA': etiqueta, 'GRUPO': grupo, 'SEGUNDOS': medicion['SEGUNDOS'],
+                                 'CPU SEGUNDOS': medicion['CPU SEGUNDOS'], 'MB PICO RSS': medicion['MB PICO RSS'],
+                                 'FILAS': filas, 'PID': pid, 'PERFIL': medicion['PERFIL']})
+
+    resultados = {}
+    for grupo, frames in frames_por_grupo.items():
+        if len(frames) == 1:
+            resultados[grupo] = frames[0]
+        else:
+            resultados[grupo] = ConcatenarVentas(frames)
+
+    # Agregar una fila con la duración total de la ingesta
+    registros_tiempo.append({'TAREA': 'TOTAL', 'GRUPO': 'TOTAL', 'SEGUNDOS': duracion_total,
+                             'CPU SEGUNDOS': sum(registro['CPU SEGUNDOS'] for registro in registros_tiempo),
+                             'FILAS': sum(registro['FILAS'] for registro in registros_tiempo), 'PID': os.getpid()})
+    df_tiempos = pd.DataFrame(registros_tiempo)
+
+    return resultados, df_tiempos
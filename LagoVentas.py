@@ -0,0 +1,163 @@
+import os
+import glob
+import time
+
+import numpy as np
+import pandas as pd
+
+from EsquemaVentas import COLUMNAS_VENTAS, AplicarEsquema
+from AsignarInfoFecha import MESES, SEMANAS
+
+
+# Columnas por las que se particiona el lago: una carpeta por cadena y, dentro de ella, una por mes
+PARTICIONES_LAGO = ['CADENA', 'MES']
+
+# Número máximo de filas de cada grupo de filas de los archivos Parquet. Cada grupo guarda el mínimo y el máximo
+# de cada columna, que permiten saltar los grupos que no cumplen un filtro (por ejemplo, sobre 'FECHA').
+FILAS_GRUPO_LAGO = 100000
+
+# Etiqueta de las filas sin cadena en el nombre de los archivos
+SIN_CADENA = 'SIN CADENA'
+
+
+def _ParticionamientoLago():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    # Carpetas 'CADENA=<cadena>/MES=<mes>'; las filas sin cadena quedan en 'CADENA=__HIVE_DEFAULT_PARTITION__'
+    return ds.partitioning(pa.schema([(columna, pa.string()) for columna in PARTICIONES_LAGO]), flavor = 'hive')
+
+
+def _ArchivosFuente(Carpeta, Fuente):
+    # Archivos del lago escritos para una fuente, en cualquier partición
+    return glob.glob(os.path.join(glob.escape(Carpeta), '**', glob.escape(Fuente) + '-*.parquet'), recursive = True)
+
+
+def EscribirLagoVentas(df_ventas, Carpeta, Fuentes = None, FilasGrupo = FILAS_GRUPO_LAGO):
+    """
+    Guarda el formato de ventas en un conjunto de archivos Parquet particionado por cadena y mes.
+
+    Parámetros:
+    - df_ventas (pandas.DataFrame): DataFrame con el formato de ventas.
+    - Carpeta (str): Carpeta del lago de ventas. Se crea si no existe.
+    - Fuentes (array, opcional): Fuente de la que se cargó cada fila (por ejemplo, 'JUMBO'). Por defecto, la
+      columna 'CADENA' (las filas sin cadena quedan en la fuente `SIN_CADENA`).
+    - FilasGrupo (int): Número máximo de filas de cada grupo de filas de los archivos.
+
+    Retorna:
+    - reporte (dict): Número de filas y archivos escritos, archivos reemplazados y segundos de la escritura.
+
+    Las columnas son las de `COLUMNAS_VENTAS`, con los tipos del esquema (las categóricas se guardan como
+    diccionarios). Dentro de cada partición las filas se ordenan por fecha, de modo que las estadísticas de cada
+    grupo de filas permiten filtrar por rango de fechas sin leer los grupos que no corresponden.
+
+    Los archivos de cada fuente llevan el nombre de la fuente. Al volver a guardar una fuente se escriben sus
+    archivos nuevos y después se borran todos los anteriores de esa fuente, en cualquier partición, por lo que
+    se pueden actualizar solo las cadenas cargadas en una ejecución sin tocar las demás. Esto incluye las filas
+    cuyo punto de venta no está en el inventario, que quedan sin cadena pero conservan su fuente.
+
+    Ejemplo:
+    >>> EscribirLagoVentas(df_ventas, 'LagoVentas', Fuentes = cadena_por_fila)
+    {'FILAS': 183790, 'ARCHIVOS': 32, 'REEMPLAZADOS': 0, 'SEGUNDOS': 1.214}
+    >>> sorted(os.listdir(os.path.join('LagoVentas', 'CADENA=JUMBO')))
+    ['MES=ABRIL', 'MES=AGOSTO', 'MES=ENERO', 'MES=FEBRERO', 'MES=JULIO', 'MES=JUNIO', 'MES=MARZO', 'MES=MAYO']
+    """
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    inicio = time.perf_counter()
+    df_lago = df_ventas.reindex(columns = COLUMNAS_VENTAS)
+
+    if Fuentes is None:
+        Fuentes = df_lago['CADENA'].astype(object).where(df_lago['CADENA'].notna(), SIN_CADENA)
+    codigos_fuente, fuentes = pd.factorize(np.asarray(Fuentes, dtype = object))
+
+    # Sello de esta escritura en el nombre de los archivos, para distinguirlos de los anteriores de la misma fuente
+    sello = str(time.time_ns())
+    particionamiento = _ParticionamientoLago()
+
+    archivos, reemplazados = 0, 0
+    for codigo, fuente in enumerate(fuentes):
+        posiciones = np.flatnonzero(codigos_fuente == codigo)
+        df_fuente = df_lago.take(posiciones).sort_values('FECHA', kind = 'stable')
+
+        tabla = pa.Table.from_pandas(df_fuente, preserve_index = False)
+        for columna in PARTICIONES_LAGO:
+            i = tabla.schema.get_field_index(columna)
+            tabla = tabla.set_column(i, columna, pc.cast(tabla.column(columna), pa.string()))
+
+        anteriores = _ArchivosFuente(Carpeta, fuente)
+        escritos = []
+        ds.write_dataset(tabla, Carpeta, format = 'parquet', partitioning = particionamiento,
+                         basename_template = f'{fuente}-{sello}-{{i}}.parquet',
+                         existing_data_behavior = 'overwrite_or_ignore',
+                         max_rows_per_group = FilasGrupo, min_rows_per_group = min(FilasGrupo, len(tabla)),
+                         file_visitor = lambda archivo: escritos.append(archivo.path))
+
+        # Borrar los archivos anteriores de la fuente solo después de escribir los nuevos
+        for archivo in anteriores:
+            os.remove(archivo)
+        archivos += len(escritos)
+        reemplazados += len(anteriores)
+
+    # Borrar las carpetas de las particiones que quedaron vacías
+    for carpeta, _, _ in sorted(os.walk(Carpeta), reverse = True):
+        if carpeta != Carpeta and not os.listdir(carpeta):
+            os.rmdir(carpeta)
+
+    return {'FILAS': len(df_lago), 'ARCHIVOS': archivos, 'REEMPLAZADOS': reemplazados,
+            'SEGUNDOS': round(time.perf_counter() - inicio, 3)}
+
+
+def LeerLagoVentas(Carpeta, Cadenas = None, Meses = None, Columnas = None, Filtros = None):
+    """
+    Lee del lago de ventas solo las particiones, grupos de filas y columnas necesarios.
+
+    Parámetros:
+    - Carpeta (str): Carpeta del lago de ventas (ver `EscribirLagoVentas`).
+    - Cadenas (list, opcional): Cadenas a leer. Por defecto, todas (incluidas las filas sin cadena).
+    - Meses (list, opcional): Meses a leer (por ejemplo, ['ENERO', 'FEBRERO']). Por defecto, todos.
+    - Columnas (list, opcional): Columnas a leer. Por defecto, todas las de `COLUMNAS_VENTAS`.
+    - Filtros (list, opcional): Filtros adicionales como tuplas (columna, operador, valor), por ejemplo
+      [('FECHA', '>=', pd.Timestamp('2021-03-01'))].
+
+    Retorna:
+    - df_ventas (pandas.DataFrame): Ventas que cumplen los filtros, con las columnas en el orden de
+      `COLUMNAS_VENTAS` y los tipos de `AplicarEsquema`. 'MES' y 'NUMERO SEMANA' tienen las categorías de
+      `AsignarInfoFecha` ('MES' en orden de calendario), como las ventas cargadas de Excel.
+
+    Los filtros de cadena y mes se resuelven con los nombres de las carpetas, sin abrir los archivos de las demás
+    particiones. Los filtros sobre las demás columnas se aplican primero con las estadísticas de cada grupo de
+    filas, de modo que solo se leen los grupos que pueden tener filas que los cumplen. Solo se leen las columnas
+    pedidas (una columna de filtro no necesita estar entre ellas), y los archivos se abren con memoria mapeada,
+    por lo que el sistema operativo carga solo las páginas de las columnas y grupos leídos.
+
+    Ejemplo:
+    >>> df_ventas = LeerLagoVentas('LagoVentas', Cadenas = ['JUMBO'], Meses = ['MARZO'],
+    ...                            Columnas = ['CADENA', 'LINEA', 'PUNTO DE VENTA', 'UNIDADES'])
+    >>> porcentajes_por_sede = CalcularDistribucion(df_ventas)['PORCENTAJE']
+    """
+
+    import pyarrow.parquet as pq
+
+    filtros = list(Filtros or [])
+    if Cadenas is not None:
+        filtros.append(('CADENA', 'in', list(Cadenas)))
+    if Meses is not None:
+        filtros.append(('MES', 'in', list(Meses)))
+
+    columnas = [columna for columna in COLUMNAS_VENTAS if Columnas is None or columna in Columnas]
+    tabla = pq.read_table(Carpeta, columns = columnas, filters = filtros or None, memory_map = True,
+                          partitioning = _ParticionamientoLago())
+
+    df_ventas = AplicarEsquema(tabla.to_pandas().reindex(columns = columnas))
+
+    # Las particiones por mes se leen con las categorías en orden alfabético y solo con los meses leídos
+    if 'MES' in df_ventas.columns:
+        df_ventas['MES'] = pd.Categorical(df_ventas['MES'], categories = MESES, ordered = True)
+    if 'NUMERO SEMANA' in df_ventas.columns:
+        df_ventas['NUMERO SEMANA'] = pd.Categorical(df_ventas['NUMERO SEMANA'], categories = SEMANAS)
+
+    return df_ventas
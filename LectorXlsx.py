@@ -0,0 +1,129 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from EsquemaVentas import AplicarEsquema, ConcatenarVentas
+
+
+# Número de filas por bloque al leer las hojas
+TAMANO_BLOQUE_XLSX = 50000
+
+
+def ListarHojasXlsx(RutaArchivo):
+    """
+    Lista los nombres de las hojas de un libro de Excel sin cargar su contenido.
+
+    Parámetros:
+    - RutaArchivo (str): Ruta al archivo .xlsx.
+
+    Retorna:
+    - hojas (list): Nombre de cada hoja, en el orden en que aparecen en el libro.
+    """
+
+    from openpyxl import load_workbook
+
+    libro = load_workbook(RutaArchivo, read_only = True)
+    try:
+        return list(libro.sheetnames)
+    finally:
+        libro.close()
+
+
+def _ColumnaTipada(valores):
+    # Convertir los valores de una columna al tipo más específico que los representa a todos
+    # (entero, decimal, fecha o texto); las columnas con tipos mezclados quedan como objeto
+    return pd.Series(np.array(valores, dtype = object)).infer_objects()
+
+
+def LeerHojasXlsx(RutaArchivo, Hojas = None, TamanoBloque = TAMANO_BLOQUE_XLSX):
+    """
+    Lee las hojas de un libro de Excel por bloques de filas, una hoja tras otra.
+
+    Parámetros:
+    - RutaArchivo (str): Ruta al archivo .xlsx.
+    - Hojas (list, opcional): Nombres o posiciones de las hojas a leer, en ese orden. Por defecto, todas.
+    - TamanoBloque (int): Número de filas de cada bloque.
+
+    Retorna:
+    - bloques (generator): Generador de tuplas (hoja, df_bloque). La primera fila de cada hoja se usa como
+      encabezado; las columnas sin encabezado y las filas completamente vacías se omiten.
+
+    El libro se abre en modo de solo lectura, que recorre el XML de cada hoja sin construir el modelo de celdas.
+    Las filas de cada bloque se pasan directamente a columnas y cada columna se convierte a un solo tipo
+    (entero, decimal, fecha o texto), por lo que en memoria solo hay un bloque de objetos de Python a la vez,
+    sin importar el tamaño de la hoja ni el número de hojas del libro.
+
+    Ejemplo:
+    >>> for hoja, df_bloque in LeerHojasXlsx(os.path.join(carpeta_ventas, 'EXITO.xlsx'), TamanoBloque = 10000):
+    ...     print(hoja, len(df_bloque))
+    FRIOS 1123
+    MOBILE 4391
+    IT 201
+    LINEA BLANCA 10000
+    LINEA BLANCA 3651
+    ...
+    """
+
+    from openpyxl import load_workbook
+
+    libro = load_workbook(RutaArchivo, read_only = True, data_only = True)
+    try:
+        nombres = libro.sheetnames
+        hojas = nombres if Hojas is None else [nombres[hoja] if isinstance(hoja, int) else hoja for hoja in Hojas]
+
+        for hoja in hojas:
+            hoja_libro = libro[hoja]
+            # Las dimensiones guardadas en el archivo pueden ser incorrectas si lo generó otra aplicación
+            hoja_libro.reset_dimensions()
+            filas = hoja_libro.iter_rows(values_only = True)
+
+            encabezado = next(filas, None)
+            if encabezado is None:
+                continue
+            posiciones = [i for i, nombre in enumerate(encabezado) if nombre is not None]
+            columnas = [str(encabezado[i]) for i in posiciones]
+
+            hoja_vacia = True
+            while True:
+                bloque = list(itertools.islice(filas, TamanoBloque))
+                if not bloque:
+                    break
+
+                # Pasar las filas a columnas, completando las filas más cortas que el encabezado
+                valores = [[fila[i] if i < len(fila) else None for fila in bloque] for i in posiciones]
+                no_vacias = [any(valor is not None for valor in fila) for fila in bloque]
+                if not all(no_vacias):
+                    valores = [list(itertools.compress(columna, no_vacias)) for columna in valores]
+                if not valores or not valores[0]:
+                    continue
+
+                hoja_vacia = False
+                yield hoja, pd.DataFrame({nombre: _ColumnaTipada(columna)
+                                          for nombre, columna in zip(columnas, valores)})
+
+            # Una hoja con encabezado y sin filas produce un bloque vacío con sus columnas
+            if hoja_vacia:
+                yield hoja, pd.DataFrame(columns = columnas)
+    finally:
+        libro.close()
+
+
+def LeerHojaVentas(RutaArchivo, Hoja = 0, TamanoBloque = TAMANO_BLOQUE_XLSX):
+    """
+    Carga una hoja de ventas con la estructura del formato simple, aplicando los tipos del esquema por bloques.
+
+    Parámetros:
+    - RutaArchivo (str): Ruta al archivo .xlsx.
+    - Hoja (str o int): Nombre o posición de la hoja.
+    - TamanoBloque (int): Número de filas de cada bloque.
+
+    Retorna:
+    - df_hoja (pandas.DataFrame): Ventas de la hoja con los tipos de `AplicarEsquema`.
+
+    Cada bloque se convierte con `AplicarEsquema` en cuanto se lee, de modo que los textos repetidos pasan a
+    categorías antes de leer el siguiente bloque, y los bloques se unen con `ConcatenarVentas`.
+    """
+
+    list_df = [AplicarEsquema(df_bloque) for _, df_bloque in LeerHojasXlsx(RutaArchivo, [Hoja], TamanoBloque)]
+    return ConcatenarVentas(list_df)
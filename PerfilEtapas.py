@@ -0,0 +1,270 @@
+import os
+import re
+import sys
+import json
+import time
+import cProfile
+import platform
+import tracemalloc
+import contextlib
+import datetime as dt
+
+
+def CrearPerfil(CarpetaPerfiles = None, PerfilarFunciones = False, MedirAsignaciones = False):
+    """
+    Crea el registro de mediciones de una ejecución del flujo.
+
+    Parámetros:
+    - CarpetaPerfiles (str, opcional): Carpeta donde se guardan el reporte JSON y los archivos de cProfile.
+    - PerfilarFunciones (bool): Si es True, se guarda un archivo .prof de cProfile por cada etapa, que se puede
+      revisar con `pstats` o con herramientas como snakeviz.
+    - MedirAsignaciones (bool): Si es True, se activa tracemalloc para medir el pico de memoria asignada por cada
+      etapa. tracemalloc hace más lenta la ejecución, por lo que está desactivado por defecto.
+
+    Retorna:
+    - perfil (dict): Registro con el identificador de la ejecución, las opciones y la lista de etapas medidas.
+
+    Ejemplo:
+    >>> perfil = CrearPerfil('perfiles', PerfilarFunciones = True)
+    >>> with MedirEtapa(perfil, 'FECHAS', Entrada = df_ventas_simple) as etapa:
+    ...     df_ventas_simple = AsignarInfoFecha(df_ventas_simple)
+    ...     etapa['SALIDA'] = df_ventas_simple
+    >>> GuardarReporte(perfil)
+    'perfiles/reporte_20240131_101500.json'
+    """
+
+    if MedirAsignaciones and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    return {'ID': dt.datetime.now().strftime('%Y%m%d_%H%M%S'), 'INICIO': time.time(),
+            'CARPETA PERFILES': CarpetaPerfiles, 'PERFILAR FUNCIONES': PerfilarFunciones,
+            'MEDIR ASIGNACIONES': MedirAsignaciones, 'ETAPAS': []}
+
+
+def _MemoriaPico():
+    # Pico de memoria residente del proceso en MB desde que inició, o None si no se puede medir
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # En macOS ru_maxrss está en bytes; en Linux, en kilobytes
+        return pico / 1e6 if sys.platform == 'darwin' else pico / 1e3
+
+    # En Windows no existe el módulo resource; se usa psutil si está instalado
+    try:
+        import psutil
+    except ImportError:
+        return None
+    memoria = psutil.Process().memory_info()
+    return getattr(memoria, 'peak_wset', memoria.rss) / 1e6
+
+
+def _Tamano(objeto):
+    # Filas y MB de un DataFrame o Series, o la suma sobre una tupla, lista o diccionario de ellos
+    if isinstance(objeto, dict):
+        partes = list(objeto.values())
+    elif isinstance(objeto, (list, tuple)):
+        partes = list(objeto)
+    else:
+        partes = [objeto]
+
+    partes = [parte for parte in partes if hasattr(parte, 'memory_usage')]
+    if not partes:
+        return None, None
+
+    filas = sum(len(parte) for parte in partes)
+    memoria = 0
+    for parte in partes:
+        uso = parte.memory_usage(deep = True)
+        memoria += int(uso.sum()) if hasattr(uso, 'sum') else int(uso)
+    return filas, round(memoria / 1e6, 3)
+
+
+def RutaPerfil(CarpetaPerfiles, Nombre):
+    """
+    Construye la ruta del archivo de cProfile de una etapa o tarea, creando la carpeta si no existe.
+
+    Parámetros:
+    - CarpetaPerfiles (str): Carpeta de los archivos de cProfile.
+    - Nombre (str): Nombre de la etapa o tarea. Los caracteres no válidos en un nombre de archivo se reemplazan por '_'.
+
+    Retorna:
+    - ruta (str): Ruta '<CarpetaPerfiles>/<Nombre>.prof'.
+    """
+
+    os.makedirs(CarpetaPerfiles, exist_ok = True)
+    return os.path.join(CarpetaPerfiles, re.sub(r'[^\w.-]+', '_', Nombre).strip('_') + '.prof')
+
+
+@contextlib.contextmanager
+def MedirLlamada(Nombre, ArchivoPerfil = None, MedirAsignaciones = False):
+    """
+    Mide el bloque de código dentro del `with` y guarda las mediciones en el diccionario que retorna.
+
+    Parámetros:
+    - Nombre (str): Nombre de la medición.
+    - ArchivoPerfil (str, opcional): Si se especifica, se ejecuta el bloque con cProfile y se guarda el resultado
+      en esta ruta.
+    - MedirAsignaciones (bool): Si es True y tracemalloc está activo, se mide el pico de memoria asignada en el bloque.
+
+    Retorna:
+    - medicion (dict): Al salir del bloque contiene ETAPA, SEGUNDOS, CPU SEGUNDOS, MB PICO RSS (pico del proceso
+      desde que inició), MB AUMENTO PICO RSS, MB PICO TRACEMALLOC y PERFIL. Si dentro del bloque se asigna un
+      DataFrame (o una tupla de DataFrames) a la llave 'SALIDA', se registran sus filas y su memoria en
+      FILAS SALIDA y MB SALIDA, y se elimina la referencia.
+
+    Es la medición que usan tanto `MedirEtapa` en el proceso principal como cada tarea de la ingesta
+    dentro de los procesos trabajadores. El tiempo de CPU solo incluye el proceso actual.
+    """
+
+    medicion = {'ETAPA': Nombre}
+
+    medir_asignaciones = MedirAsignaciones and tracemalloc.is_tracing()
+    if medir_asignaciones:
+        tracemalloc.reset_peak()
+        memoria_inicial = tracemalloc.get_traced_memory()[0]
+
+    perfilador = cProfile.Profile() if ArchivoPerfil is not None else None
+    pico_inicial = _MemoriaPico()
+    inicio_cpu = time.process_time()
+    inicio = time.perf_counter()
+    if perfilador is not None:
+        perfilador.enable()
+
+    try:
+        yield medicion
+    finally:
+        if perfilador is not None:
+            perfilador.disable()
+        medicion['SEGUNDOS'] = round(time.perf_counter() - inicio, 4)
+        medicion['CPU SEGUNDOS'] = round(time.process_time() - inicio_cpu, 4)
+
+        pico = _MemoriaPico()
+        medicion['MB PICO RSS'] = None if pico is None else round(pico, 1)
+        medicion['MB AUMENTO PICO RSS'] = None if pico is None else round(pico - pico_inicial, 1)
+        medicion['MB PICO TRACEMALLOC'] = None
+        if medir_asignaciones:
+            medicion['MB PICO TRACEMALLOC'] = round((tracemalloc.get_traced_memory()[1] - memoria_inicial) / 1e6, 3)
+
+        medicion['PERFIL'] = None
+        if perfilador is not None:
+            perfilador.dump_stats(ArchivoPerfil)
+            medicion['PERFIL'] = ArchivoPerfil
+
+        if 'SALIDA' in medicion:
+            medicion['FILAS SALIDA'], medicion['MB SALIDA'] = _Tamano(medicion.pop('SALIDA'))
+
+
+@contextlib.contextmanager
+def MedirEtapa(perfil, Nombre, Entrada = None, Perfilar = True):
+    """
+    Mide una etapa del flujo y agrega sus mediciones al perfil.
+
+    Parámetros:
+    - perfil (dict o None): Registro creado con `CrearPerfil`. Si es None no se mide nada, de modo que las
+      etapas se pueden envolver siempre sin costo cuando la medición está desactivada.
+    - Nombre (str): Nombre de la etapa.
+    - Entrada (opcional): DataFrame (o tupla, lista o diccionario de DataFrames) que recibe la etapa, para
+      registrar FILAS ENTRADA y MB ENTRADA.
+    - Perfilar (bool): Permite desactivar cProfile en una etapa cuyas partes se perfilan por separado (por
+      ejemplo, la ingesta, que perfila cada tarea), ya que no puede haber dos perfiladores activos a la vez.
+
+    Retorna:
+    - etapa (dict): Diccionario de la medición (ver `MedirLlamada`). Además de 'SALIDA', se puede asignar la llave
+      'DETALLE' con una lista de diccionarios (por ejemplo, la medición de cada tarea de la ingesta).
+    """
+
+    if perfil is None:
+        etapa = {}
+        try:
+            yield etapa
+        finally:
+            etapa.clear()   # No conservar la referencia a la salida
+        return
+
+    filas_entrada, mb_entrada = _Tamano(Entrada)
+
+    ruta_perfil = None
+    if perfil['CARPETA PERFILES'] is not None and perfil['PERFILAR FUNCIONES'] and Perfilar:
+        ruta_perfil = RutaPerfil(perfil['CARPETA PERFILES'], f"{perfil['ID']}_{len(perfil['ETAPAS']):02d}_{Nombre}")
+
+    with MedirLlamada(Nombre, ruta_perfil, perfil['MEDIR ASIGNACIONES']) as etapa:
+        etapa['FILAS ENTRADA'], etapa['MB ENTRADA'] = filas_entrada, mb_entrada
+        try:
+            yield etapa
+        finally:
+            perfil['ETAPAS'].append(etapa)
+
+
+def ReportePerfil(perfil):
+    """
+    Resume las etapas medidas en un DataFrame.
+
+    Parámetros:
+    - perfil (dict): Registro creado con `CrearPerfil`.
+
+    Retorna:
+    - df_perfil (pandas.DataFrame): Una fila por etapa con sus mediciones, sin el detalle de las tareas.
+
+    Ejemplo:
+    >>> print(ReportePerfil(perfil))
+                   ETAPA  SEGUNDOS  CPU SEGUNDOS  MB PICO RSS  ...  FILAS SALIDA  MB SALIDA
+    0            INGESTA     23.12          0.41        512.3  ...        183790      6.912
+    1             FECHAS      0.05          0.05        512.3  ...        183790      7.100
+    ...
+    """
+
+    import pandas as pd
+
+    return pd.DataFrame([{llave: valor for llave, valor in etapa.items() if llave != 'DETALLE'}
+                         for etapa in perfil['ETAPAS']])
+
+
+def _ValorJson(valor):
+    # Convertir a tipos de Python los valores de numpy y pandas que json no sabe serializar
+    if hasattr(valor, 'item'):
+        return valor.item()
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    return str(valor)
+
+
+def GuardarReporte(perfil, RutaArchivo = None, **Datos):
+    """
+    Guarda las mediciones de la ejecución en un reporte JSON.
+
+    Parámetros:
+    - perfil (dict): Registro creado con `CrearPerfil`.
+    - RutaArchivo (str, opcional): Ruta del reporte. Por defecto 'reporte_<ID>.json' en la carpeta de perfiles
+      (o en el directorio actual si el perfil no tiene carpeta).
+    - **Datos: Información adicional de la ejecución que se agrega al reporte (por ejemplo, las cadenas cargadas).
+
+    Retorna:
+    - RutaArchivo (str): Ruta del reporte guardado.
+
+    El reporte incluye la versión de Python y de pandas, de modo que al comparar reportes de distintos meses
+    se pueda distinguir una regresión del código de un cambio en el entorno.
+    """
+
+    import pandas as pd
+
+    if RutaArchivo is None:
+        RutaArchivo = os.path.join(perfil['CARPETA PERFILES'] or os.getcwd(), f"reporte_{perfil['ID']}.json")
+    carpeta = os.path.dirname(RutaArchivo)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok = True)
+
+    reporte = {'ID': perfil['ID'],
+               'INICIO': dt.datetime.fromtimestamp(perfil['INICIO']).isoformat(timespec = 'seconds'),
+               'SEGUNDOS TOTALES': round(time.time() - perfil['INICIO'], 4),
+               'PYTHON': platform.python_version(), 'PANDAS': pd.__version__, 'PLATAFORMA': platform.platform(),
+               'PID': os.getpid(), **{llave.upper(): valor for llave, valor in Datos.items()},
+               'ETAPAS': perfil['ETAPAS']}
+
+    with open(RutaArchivo, 'w', encoding = 'utf-8') as archivo:
+        json.dump(reporte, archivo, ensure_ascii = False, indent = 2, default = _ValorJson)
+
+    return RutaArchivo
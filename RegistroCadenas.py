@@ -0,0 +1,135 @@
+import os
+
+
+# Carpeta con los archivos de ventas de las cadenas, relativa al directorio actual
+CARPETA_VENTAS = 'Ventas'
+
+# Registro de fuentes: nombre -> {'GRUPO', 'TIPO', 'RUTA', 'TAREAS'} (ver `RegistrarFuente`)
+FUENTES = {}
+
+
+def RegistrarFuente(Nombre, Grupo, Ruta, CrearTareas, Tipo = 'VENTAS'):
+    """
+    Agrega una fuente de datos al registro usado por la ingesta.
+
+    Parámetros:
+    - Nombre (str): Nombre corto de la fuente, usado en la línea de comandos (por ejemplo, 'jumbo').
+    - Grupo (str): Grupo con el que se combinan los resultados de sus tareas (por ejemplo, 'JUMBO').
+    - Ruta (str): Ruta por defecto al archivo o carpeta de la fuente, relativa al directorio actual.
+    - CrearTareas (function): Función que recibe la ruta y retorna la lista de tareas
+      (grupo, etiqueta, funcion, argumentos) de la fuente.
+    - Tipo (str): 'VENTAS' para las cadenas o 'DIMENSIONES' para el inventario.
+
+    `CrearTareas` debe importar el módulo de carga dentro de la función, de modo que importar el registro no
+    cargue las dependencias de ninguna fuente (por ejemplo, pyodbc para el inventario) hasta que se use.
+    Las funciones de carga que retorna deben estar definidas a nivel de módulo para poder enviarse a otros procesos.
+
+    Ejemplo:
+    >>> def _TareasOlimpica(Ruta):
+    ...     from CargarOlimpica import CargarOlimpica
+    ...     return [('OLIMPICA', 'OLIMPICA', CargarOlimpica, (Ruta,))]
+    >>> RegistrarFuente('olimpica', 'OLIMPICA', os.path.join(CARPETA_VENTAS, 'OLIMPICA.xlsx'), _TareasOlimpica)
+    """
+
+    FUENTES[Nombre.lower()] = {'GRUPO': Grupo, 'TIPO': Tipo, 'RUTA': Ruta, 'TAREAS': CrearTareas}
+
+
+def _TareasAlkosto(Ruta):
+    from CargarAlkosto import CargarAlkosto
+    return [('ALKOSTO', 'ALKOSTO', CargarAlkosto, (Ruta,))]
+
+
+def _TareasFalabella(Ruta):
+    from CargarFalabella import CargarFalabella
+    return [('FALABELLA', 'FALABELLA', CargarFalabella, (Ruta,))]
+
+
+def _TareasJumbo(Ruta):
+    from CargarJumbo import ListarArchivosJumbo, CargarArchivoJumbo
+
+    # Una tarea por cada archivo mensual de Jumbo
+    return [('JUMBO', 'JUMBO ' + os.path.basename(ruta_archivo), CargarArchivoJumbo, (ruta_archivo,))
+            for ruta_archivo in ListarArchivosJumbo(Ruta)]
+
+
+def _TareasExito(Ruta):
+    from CargarExito import ListarHojasExito, CargarHojaExito
+
+    # Una tarea por cada hoja de Éxito
+    return [('EXITO', 'EXITO ' + hoja, CargarHojaExito, (Ruta, hoja)) for hoja in ListarHojasExito(Ruta)]
+
+
+def _TareasInventario(Ruta):
+    from CargarInventario import CargarDimensionesInventario
+    return [('INVENTARIO', 'INVENTARIO', CargarDimensionesInventario, (Ruta,))]
+
+
+RegistrarFuente('alkosto', 'ALKOSTO', os.path.join(CARPETA_VENTAS, 'VENTAS ALKOSTO.xlsx'), _TareasAlkosto)
+RegistrarFuente('falabella', 'FALABELLA', os.path.join(CARPETA_VENTAS, 'VENTAS FALABELLA.xlsx'), _TareasFalabella)
+RegistrarFuente('jumbo', 'JUMBO', os.path.join(CARPETA_VENTAS, 'jumbo'), _TareasJumbo)
+RegistrarFuente('exito', 'EXITO', os.path.join(CARPETA_VENTAS, 'EXITO.xlsx'), _TareasExito)
+RegistrarFuente('inventario', 'INVENTARIO', 'BASE_INVENTARIO.accdb', _TareasInventario, Tipo = 'DIMENSIONES')
+
+
+def SeleccionarFuentes(Nombres = None, Tipo = None):
+    """
+    Valida y ordena una selección de fuentes del registro.
+
+    Parámetros:
+    - Nombres (str o list, opcional): Nombres de las fuentes, como lista o separados por comas
+      (por ejemplo, 'jumbo,exito'). Por defecto se seleccionan todas las fuentes registradas.
+    - Tipo (str, opcional): Si se especifica, solo se conservan las fuentes de ese tipo ('VENTAS' o 'DIMENSIONES').
+
+    Retorna:
+    - seleccion (list): Nombres de las fuentes en el orden del registro, sin repetir.
+
+    Lanza ValueError si algún nombre no está registrado.
+
+    Ejemplo:
+    >>> SeleccionarFuentes('exito,Jumbo')
+    ['jumbo', 'exito']
+    """
+
+    if Nombres is None:
+        nombres = list(FUENTES)
+    elif isinstance(Nombres, str):
+        nombres = [nombre.strip().lower() for nombre in Nombres.split(',') if nombre.strip()]
+    else:
+        nombres = [nombre.lower() for nombre in Nombres]
+
+    desconocidas = [nombre for nombre in nombres if nombre not in FUENTES]
+    if desconocidas:
+        raise ValueError(f"Fuentes no registradas: {', '.join(desconocidas)}. "
+                         f"Fuentes disponibles: {', '.join(FUENTES)}")
+
+    return [nombre for nombre in FUENTES
+            if nombre in nombres and (Tipo is None or FUENTES[nombre]['TIPO'] == Tipo)]
+
+
+def CrearTareasFuentes(Nombres, Rutas = None):
+    """
+    Construye la lista de tareas de carga de las fuentes seleccionadas.
+
+    Parámetros:
+    - Nombres (list): Nombres de las fuentes (ver `SeleccionarFuentes`).
+    - Rutas (dict, opcional): Diccionario nombre -> ruta para reemplazar la ruta por defecto de alguna fuente.
+
+    Retorna:
+    - tareas (list): Lista de tuplas (grupo, etiqueta, funcion, argumentos) para `EjecutarIngesta`.
+
+    Solo se importan los módulos de carga de las fuentes seleccionadas.
+
+    Ejemplo:
+    >>> tareas = CrearTareasFuentes(['jumbo', 'exito'])
+    >>> [etiqueta for grupo, etiqueta, funcion, argumentos in tareas]
+    ['JUMBO ABRIL.xlsx', ..., 'EXITO FRIOS', ...]
+    """
+
+    rutas = Rutas or {}
+
+    tareas = []
+    for nombre in Nombres:
+        fuente = FUENTES[nombre]
+        tareas.extend(fuente['TAREAS'](rutas.get(nombre, fuente['RUTA'])))
+
+    return tareas
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+
+def PosicionesDimension(llaves_hechos, llaves_dimension):
+    """
+    Calcula la fila de la tabla de dimensión que corresponde a cada fila de la tabla de hechos.
+
+    Parámetros:
+    - llaves_hechos (pandas.Series): Llave de cada fila de la tabla de hechos (por ejemplo, el EAN de cada venta).
+    - llaves_dimension (pandas.Series): Llave de cada fila de la tabla de dimensión. No puede tener llaves
+      repetidas; las filas con la llave vacía se ignoran, ya que ninguna venta se une con una llave vacía.
+
+    Retorna:
+    - posiciones (numpy.ndarray): Posición en la tabla de dimensión de cada fila de hechos, o -1 si la llave
+      no existe en la dimensión o está vacía.
+    - df_sin_dimension (pandas.DataFrame): Llaves de hechos que no existen en la dimensión, con el número de
+      filas de hechos que tienen cada una.
+
+    Las llaves de hechos se convierten primero a enteros con `pd.factorize()`, de modo que la búsqueda en el
+    índice de la dimensión se hace una sola vez por cada llave distinta y no por cada fila.
+    """
+
+    # Quitar las filas de la dimensión con la llave vacía (por ejemplo, los EAN del inventario que no son
+    # numéricos), conservando la posición de las demás filas
+    indice = pd.Index(np.asarray(llaves_dimension, dtype = object))
+    posiciones_validas = np.flatnonzero(indice.notna())
+    indice = indice[posiciones_validas]
+    if not indice.is_unique:
+        raise ValueError(f'La dimensión tiene valores repetidos en la llave {llaves_dimension.name!r}')
+
+    # Buscar cada llave distinta en el índice de la dimensión
+    codigos, llaves_unicas = pd.factorize(llaves_hechos)
+    posiciones_unicas = indice.get_indexer(np.asarray(llaves_unicas, dtype = object))
+    posiciones_unicas = np.append(posiciones_validas, -1)[posiciones_unicas]
+
+    # Pasar la posición de cada llave distinta a cada fila (el -1 agregado al final es para las llaves vacías)
+    posiciones = np.append(posiciones_unicas, -1)[codigos]
+
+    # Contar las filas de cada llave que no está en la dimensión
+    filas_por_llave = np.bincount(codigos[codigos >= 0], minlength = len(llaves_unicas))
+    sin_dimension = posiciones_unicas == -1
+    df_sin_dimension = pd.DataFrame({'LLAVE': llaves_hechos.name,
+                                     'VALOR': np.asarray(llaves_unicas, dtype = object)[sin_dimension],
+                                     'FILAS': filas_por_llave[sin_dimension]})
+
+    # Las filas con la llave vacía tampoco tienen dimensión
+    filas_vacias = int((codigos < 0).sum())
+    if filas_vacias:
+        df_sin_dimension.loc[len(df_sin_dimension)] = [llaves_hechos.name, None, filas_vacias]
+
+    return posiciones, df_sin_dimension.sort_values('FILAS', ascending = False, ignore_index = True)
+
+
+def UnirDimensiones(df_hechos, dimensiones, Columnas = None):
+    """
+    Asocia a la tabla de hechos los atributos de una o varias tablas de dimensión (equivalente a varios LEFT JOIN).
+
+    Parámetros:
+    - df_hechos (pandas.DataFrame): Tabla de hechos (por ejemplo, las ventas de todas las cadenas).
+    - dimensiones (list): Lista de tuplas (df_dimension, llave). Cada tabla de dimensión debe tener una sola fila
+      por llave, y sus demás columnas no deben existir en la tabla de hechos.
+    - Columnas (list, opcional): Columnas del resultado, en orden. Las columnas que no existen en la tabla de hechos
+      ni en las dimensiones quedan vacías. Por defecto, las columnas de hechos seguidas de las de cada dimensión.
+
+    Retorna:
+    - df_resultado (pandas.DataFrame): Tabla de hechos con los atributos de las dimensiones, en el mismo orden de
+      filas y con el mismo índice de `df_hechos`.
+    - df_sin_dimension (pandas.DataFrame): Llaves de hechos que no se encontraron en su dimensión y número de
+      filas afectadas (estas filas quedan con los atributos vacíos, como en un LEFT JOIN).
+
+    Para cada dimensión se calcula una vez la posición de cada fila de hechos en la dimensión con
+    `PosicionesDimension`, y cada atributo se toma por posición con `take`. Los atributos se reúnen en un
+    diccionario y el resultado se construye una sola vez al final, sin las copias intermedias completas de la
+    tabla de hechos que hace cada `pd.merge()`. Las columnas categóricas de las dimensiones siguen siendo categóricas.
+
+    Ejemplo:
+    >>> df_ventas, df_sin_dimension = UnirDimensiones(df_ventas_simple,
+    ...     [(df_productos, 'EAN'), (df_sedes, 'PUNTO DE VENTA')], Columnas = COLUMNAS_VENTAS)
+    >>> print(df_sin_dimension)
+                LLAVE          VALOR  FILAS
+    0             EAN  8806091263537     19
+    1             EAN  8806091060440     10
+    ...
+    5             EAN           None      1
+    6  PUNTO DE VENTA       WTC CALI    660
+    7  PUNTO DE VENTA       VCOUNTRY    391
+    8  PUNTO DE VENTA       VEMPRESA     41
+    """
+
+    columnas = {columna: df_hechos[columna] for columna in df_hechos.columns}
+    list_df_sin_dimension = []
+
+    for df_dimension, llave in dimensiones:
+        atributos = [columna for columna in df_dimension.columns if columna != llave]
+        repetidas = [columna for columna in atributos if columna in columnas]
+        if repetidas:
+            raise ValueError(f'Las columnas {repetidas} de la dimensión {llave!r} ya existen en la tabla de hechos')
+
+        posiciones, df_sin_dimension = PosicionesDimension(df_hechos[llave], df_dimension[llave])
+        list_df_sin_dimension.append(df_sin_dimension)
+
+        # Tomar cada atributo por posición (las posiciones -1 quedan vacías)
+        for columna in atributos:
+            columnas[columna] = df_dimension[columna].array.take(posiciones, allow_fill = True)
+
+    if Columnas is None:
+        Columnas = list(columnas)
+
+    # Construir el resultado una sola vez, en el orden de columnas pedido
+    vacia = np.full(len(df_hechos), np.nan)
+    df_resultado = pd.DataFrame({columna: columnas.get(columna, vacia) for columna in Columnas},
+                                index = df_hechos.index)
+
+    df_sin_dimension = pd.concat(list_df_sin_dimension, ignore_index = True) if list_df_sin_dimension \
+        else pd.DataFrame(columns = ['LLAVE', 'VALOR', 'FILAS'])
+    return df_resultado, df_sin_dimension
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Los módulos del proyecto están en la carpeta principal
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EsquemaVentas import COLUMNAS_VENTAS, AplicarEsquema
+
+
+def CrearVentasPrueba(Cadenas = ('FALABELLA', 'JUMBO'), FilasPorCadena = 40, Semilla = 0):
+    # Formato de ventas pequeño con dos meses por cadena. Algunas filas de cada cadena no tienen sede en el
+    # inventario y quedan sin CADENA, como las sedes de Falabella que no están en el inventario real.
+    rng = np.random.default_rng(Semilla)
+    list_df = []
+    for cadena in Cadenas:
+        fechas = pd.Timestamp('2021-01-25') + pd.to_timedelta(rng.integers(0, 20, FilasPorCadena), unit = 'D')
+        df = pd.DataFrame({columna: None for columna in COLUMNAS_VENTAS}, index = range(FilasPorCadena))
+        df = df.assign(**{'TIPO': 'OFFLINE', 'TIPO2': 'SO', 'CANAL': 'HYPER', 'CADENA': cadena,
+                          'PUNTO DE VENTA': [f'{cadena} {i % 3}' for i in range(FilasPorCadena)],
+                          'EAN': 7700000000000 + rng.integers(0, 5, FilasPorCadena),
+                          'MODELO': 'TV 55', 'LINEA': 'Television', 'UNIDADES': rng.integers(1, 9, FilasPorCadena),
+                          'VALOR TOTAL': np.round(rng.random(FilasPorCadena) * 1e6, 2), 'FECHA': fechas,
+                          'MES': np.where(fechas.month == 1, 'ENERO', 'FEBRERO')})
+        df.loc[df.index % 7 == 0, 'CADENA'] = None
+        list_df.append(df)
+    return AplicarEsquema(pd.concat(list_df, ignore_index = True))
+
+
+@pytest.fixture
+def df_ventas_prueba():
+    return CrearVentasPrueba()
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from conftest import CrearVentasPrueba
+from DistribucionVentas import CalcularPorcentajesPorSede
+from AsignacionTarget import AsignarTarget, ReasignarTarget, ActualizarTargetPorSede
+
+
+def _TargetPrueba(Unidades):
+    return pd.DataFrame({'ENERO': [Unidades, 2 * Unidades, 50], 'FEBRERO': [3 * Unidades, Unidades, 70]},
+                        index = pd.MultiIndex.from_tuples([('FALABELLA', 'Television'), ('JUMBO', 'Television'),
+                                                           ('JUMBO', 'Audio')], names = ['CADENA', 'LINEA']))
+
+
+def test_reasignar_conserva_las_demas_cadenas():
+    df_ventas = CrearVentasPrueba()
+    df_anterior, _ = AsignarTarget(_TargetPrueba(100), CalcularPorcentajesPorSede(df_ventas))
+
+    # Llegan ventas nuevas de Jumbo y cambia su target; Falabella no se vuelve a cargar
+    df_jumbo = CrearVentasPrueba(('JUMBO',), Semilla = 1)
+    df_target = _TargetPrueba(200)
+    df_target_por_sede, df_target_sin_distribucion = ReasignarTarget(df_anterior, df_target,
+                                                                     CalcularPorcentajesPorSede(df_jumbo), ['JUMBO'])
+
+    assert df_target_por_sede.loc['FALABELLA'].equals(df_anterior.loc['FALABELLA'])
+    assert df_target_por_sede.loc['JUMBO'].sum().tolist() == [400, 200]
+
+    # La línea sin ventas de Jumbo no se reparte y se informa
+    assert df_target_sin_distribucion.index.tolist() == [('JUMBO', 'Audio')]
+
+
+def test_actualizar_target_por_sede_con_algunas_cadenas(tmp_path):
+    ruta_archivo = str(tmp_path / 'TARGET POR SEDE.csv')
+    df_ventas = CrearVentasPrueba()
+    df_completo, _, _ = ActualizarTargetPorSede(_TargetPrueba(100), CalcularPorcentajesPorSede(df_ventas),
+                                                ruta_archivo)
+
+    df_jumbo = CrearVentasPrueba(('JUMBO',), Semilla = 1)
+    df_target_por_sede, _, df_target_largo = ActualizarTargetPorSede(
+        _TargetPrueba(200), CalcularPorcentajesPorSede(df_jumbo), ruta_archivo, Cadenas = ['JUMBO'])
+
+    # El target de Falabella guardado se conserva exactamente, y el archivo tiene las dos cadenas
+    assert df_target_por_sede.loc['FALABELLA'].equals(df_completo.loc['FALABELLA'])
+    df_guardado = pd.read_csv(ruta_archivo, float_precision = 'round_trip')
+    assert len(df_guardado) == len(df_target_largo) == 2 * len(df_target_por_sede)
+    assert df_guardado.groupby('CADENA')['TARGET UNIDADES'].sum().round(6).to_dict() == {'FALABELLA': 400,
+                                                                                         'JUMBO': 600}
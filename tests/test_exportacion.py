@@ -0,0 +1,42 @@
+import pandas as pd
+from sqlalchemy import create_engine
+
+from ExportarVentas import ExportarVentasSQL, PrepararVentasSQL
+
+
+def _LeerTabla(motor_sql, Tabla = 'Ventas'):
+    with motor_sql.connect() as conexion:
+        return pd.read_sql(f'SELECT * FROM {Tabla}', conexion)
+
+
+def _Ordenar(df):
+    return df.sort_values(list(df.columns)).reset_index(drop = True)
+
+
+def _Normalizar(df_sql):
+    # Llevar la tabla leída y la preparada a los mismos tipos para compararlas
+    df = df_sql.astype(object).where(df_sql.notna(), None)
+    df['Fecha'] = pd.to_datetime(df['Fecha']).dt.strftime('%Y-%m-%d')
+    df['Unidades'] = df['Unidades'].astype('int64')
+    df['ValorTotal'] = df['ValorTotal'].astype('float64')
+    return _Ordenar(df.fillna(''))
+
+
+def test_exportacion_por_lotes(tmp_path, df_ventas_prueba):
+    motor_sql = create_engine(f"sqlite:///{tmp_path / 'ventas.db'}")
+
+    reporte = ExportarVentasSQL(df_ventas_prueba, motor_sql, TamanoLote = 7, Escritores = 3)
+
+    df_tabla = _LeerTabla(motor_sql)
+    assert reporte['FILAS'] == len(df_ventas_prueba) == len(df_tabla)
+    assert reporte['LOTES'] == -(-len(df_ventas_prueba) // 7)
+    pd.testing.assert_frame_equal(_Normalizar(df_tabla), _Normalizar(PrepararVentasSQL(df_ventas_prueba)))
+
+
+def test_exportacion_reemplaza_tabla(tmp_path, df_ventas_prueba):
+    motor_sql = create_engine(f"sqlite:///{tmp_path / 'ventas.db'}")
+
+    ExportarVentasSQL(df_ventas_prueba, motor_sql, TamanoLote = 10)
+    ExportarVentasSQL(df_ventas_prueba.head(5), motor_sql, TamanoLote = 10, if_exists = 'replace')
+
+    assert len(_LeerTabla(motor_sql)) == 5
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from conftest import CrearVentasPrueba
+from ExportarVentas import ExportarVentasIncremental
+
+
+def _FilasPorFuente(motor_sql):
+    with motor_sql.connect() as conexion:
+        df = pd.read_sql("SELECT CadenaFuente, COALESCE(Cadena, '') AS Cadena, COUNT(*) AS Filas FROM Ventas "
+                         'GROUP BY CadenaFuente, Cadena', conexion)
+    return {(fila.CadenaFuente, fila.Cadena): fila.Filas for fila in df.itertuples()}
+
+
+def test_recarga_de_una_cadena_no_toca_las_demas(tmp_path):
+    motor_sql = create_engine(f"sqlite:///{tmp_path / 'ventas.db'}")
+    df_ventas = CrearVentasPrueba(('FALABELLA', 'JUMBO'))
+    fuentes = np.repeat(['FALABELLA', 'JUMBO'], len(df_ventas) // 2)
+
+    ExportarVentasIncremental(df_ventas, motor_sql, TamanoLote = 10, Fuentes = fuentes)
+    filas_iniciales = _FilasPorFuente(motor_sql)
+
+    # Las dos cadenas tienen filas sin 'Cadena' (puntos de venta que no están en el inventario)
+    assert filas_iniciales[('FALABELLA', '')] > 0 and filas_iniciales[('JUMBO', '')] > 0
+
+    # Volver a cargar solo Jumbo, con otras ventas
+    df_jumbo = CrearVentasPrueba(('JUMBO',), FilasPorCadena = 30, Semilla = 1)
+    reporte = ExportarVentasIncremental(df_jumbo, motor_sql, TamanoLote = 10,
+                                        Fuentes = np.repeat('JUMBO', len(df_jumbo)))
+    filas_finales = _FilasPorFuente(motor_sql)
+
+    assert reporte['ESCRITAS'] > 0
+    for (fuente, cadena), filas in filas_iniciales.items():
+        if fuente == 'FALABELLA':
+            assert filas_finales[(fuente, cadena)] == filas
+    assert sum(filas for (fuente, cadena), filas in filas_finales.items() if fuente == 'JUMBO') == len(df_jumbo)
+
+    # Los metadatos de carga solo tienen las particiones de la cadena de origen de cada carga
+    with motor_sql.connect() as conexion:
+        df_metadatos = pd.read_sql('SELECT CadenaFuente, SUM(Filas) AS Filas FROM VentasCargas '
+                                   'GROUP BY CadenaFuente', conexion).set_index('CadenaFuente')['Filas']
+    assert df_metadatos.to_dict() == {'FALABELLA': len(df_ventas) // 2, 'JUMBO': len(df_jumbo)}
+
+
+def test_exportacion_sin_cambios_no_escribe(tmp_path, df_ventas_prueba):
+    motor_sql = create_engine(f"sqlite:///{tmp_path / 'ventas.db'}")
+    fuentes = np.repeat(['FALABELLA', 'JUMBO'], len(df_ventas_prueba) // 2)
+
+    ExportarVentasIncremental(df_ventas_prueba, motor_sql, Fuentes = fuentes)
+    reporte = ExportarVentasIncremental(df_ventas_prueba, motor_sql, Fuentes = fuentes)
+
+    assert reporte['ESCRITAS'] == 0 and reporte['FILAS'] == 0
+
+
+def test_ventas_sin_fecha_en_su_propia_particion(tmp_path, df_ventas_prueba):
+    motor_sql = create_engine(f"sqlite:///{tmp_path / 'ventas.db'}")
+    fuentes = np.repeat(['FALABELLA', 'JUMBO'], len(df_ventas_prueba) // 2)
+    df_ventas_prueba.loc[[3, 5], 'FECHA'] = pd.NaT
+
+    reporte = ExportarVentasIncremental(df_ventas_prueba, motor_sql, Fuentes = fuentes)
+    assert reporte['FILAS'] == len(df_ventas_prueba)
+
+    # Cambiar las ventas sin fecha de Falabella: solo se reescribe esa partición, sin duplicar filas
+    df_ventas_prueba.loc[[3, 5], 'UNIDADES'] = 100
+    reporte = ExportarVentasIncremental(df_ventas_prueba, motor_sql, Fuentes = fuentes)
+    assert reporte['ESCRITAS'] == 1 and reporte['FILAS'] == 2
+
+    with motor_sql.connect() as conexion:
+        df_sin_fecha = pd.read_sql('SELECT CadenaFuente, Unidades FROM Ventas WHERE Fecha IS NULL', conexion)
+        filas = pd.read_sql('SELECT COUNT(*) AS Filas FROM Ventas', conexion)['Filas'].iloc[0]
+    assert df_sin_fecha.to_dict('list') == {'CadenaFuente': ['FALABELLA', 'FALABELLA'], 'Unidades': [100, 100]}
+    assert filas == len(df_ventas_prueba)
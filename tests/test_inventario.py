@@ -0,0 +1,51 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from CargarInventario import COLUMNAS_PRODUCTO, COLUMNAS_SEDE, CargarDimensionesInventario
+from EsquemaVentas import AplicarEsquema
+
+
+def _Inventario():
+    # Inventario pequeño con productos y sedes repetidos en distintos bloques y atributos distintos en las
+    # repeticiones, para comprobar que se conserva la primera aparición de cada llave
+    filas = []
+    for i in range(23):
+        ean = 7700000000000 + i % 7
+        sede = f'SEDE {i % 5}'
+        filas.append({'EAN': ean, 'REFERENCIA HOMOLOGADA': f'REF {i}', 'CATEGORIA': 'AV', 'SUBCATEGORIA': 'TV',
+                      'LINEA': f'LINEA {i % 3}', 'SUBLINEA': 'S', 'PUNTO DE VENTA': sede,
+                      'HOMOLOGA ALMACEN': 'SI', 'TIPO': 'OFFLINE', 'CANAL': 'HYPER', 'CADENA': f'CADENA {i % 2}',
+                      'SUBCADENA': 'NA', 'REGIONAL': 'CENTRO', 'CIUDAD': f'CIUDAD {i}', 'CORE STORE': 'NO',
+                      'PROMOTER': 'SI', 'EXISTENCIAS': i})
+    return pd.DataFrame(filas)
+
+
+@pytest.mark.parametrize('TamanoBloque', [1, 4, 50])
+def test_dimensiones_por_bloques_igual_a_drop_duplicates(TamanoBloque):
+    df_inventario = _Inventario()
+    conexion = sqlite3.connect(':memory:')
+    df_inventario.to_sql('INVENTARIO_2', conexion, index = False)
+
+    df_productos, df_sedes = CargarDimensionesInventario(conexion = conexion, TamanoBloque = TamanoBloque)
+
+    esperado_productos = AplicarEsquema(df_inventario.drop_duplicates(subset = ['EAN'])[COLUMNAS_PRODUCTO]
+                                        .reset_index(drop = True))
+    esperado_sedes = AplicarEsquema(df_inventario.drop_duplicates(subset = ['PUNTO DE VENTA'])[COLUMNAS_SEDE]
+                                    .reset_index(drop = True))
+    pd.testing.assert_frame_equal(df_productos, esperado_productos, check_categorical = False)
+    pd.testing.assert_frame_equal(df_sedes, esperado_sedes, check_categorical = False)
+
+    # La conexión recibida no se cierra
+    assert conexion.execute('SELECT COUNT(*) FROM INVENTARIO_2').fetchone()[0] == len(df_inventario)
+
+
+def test_inventario_vacio():
+    conexion = sqlite3.connect(':memory:')
+    _Inventario().head(0).to_sql('INVENTARIO_2', conexion, index = False)
+
+    df_productos, df_sedes = CargarDimensionesInventario(conexion = conexion)
+
+    assert list(df_productos.columns) == COLUMNAS_PRODUCTO and len(df_productos) == 0
+    assert list(df_sedes.columns) == COLUMNAS_SEDE and len(df_sedes) == 0
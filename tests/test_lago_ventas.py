@@ -0,0 +1,29 @@
+import pandas as pd
+
+from conftest import CrearVentasPrueba
+from AsignarInfoFecha import AsignarInfoFecha
+from LagoVentas import EscribirLagoVentas, LeerLagoVentas
+
+
+def test_lago_conserva_los_tipos(tmp_path):
+    df_ventas = AsignarInfoFecha(CrearVentasPrueba())
+    EscribirLagoVentas(df_ventas, str(tmp_path))
+
+    df_lago = LeerLagoVentas(str(tmp_path))
+    pd.testing.assert_series_equal(df_lago.dtypes, df_ventas.dtypes)
+    assert df_lago['MES'].cat.ordered and list(df_lago['MES'].cat.categories[:3]) == ['ENERO', 'FEBRERO', 'MARZO']
+
+    # Las mismas filas, aunque el lago las guarda ordenadas por cadena, mes y fecha
+    columnas = ['CADENA', 'FECHA', 'PUNTO DE VENTA', 'EAN', 'UNIDADES']
+    pd.testing.assert_frame_equal(
+        df_lago.astype({'CADENA': object}).sort_values(columnas, ignore_index = True),
+        df_ventas.astype({'CADENA': object}).sort_values(columnas, ignore_index = True))
+
+
+def test_lago_filtra_meses(tmp_path):
+    df_ventas = AsignarInfoFecha(CrearVentasPrueba())
+    EscribirLagoVentas(df_ventas, str(tmp_path))
+
+    df_lago = LeerLagoVentas(str(tmp_path), Cadenas = ['JUMBO'], Meses = ['FEBRERO'], Columnas = ['CADENA', 'MES'])
+    assert len(df_lago) == ((df_ventas['CADENA'] == 'JUMBO') & (df_ventas['MES'] == 'FEBRERO')).sum()
+    assert df_lago['MES'].dtype == df_ventas['MES'].dtype
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from UnionDimensiones import PosicionesDimension, UnirDimensiones
+
+
+def test_llaves_vacias_en_la_dimension():
+    # Dos EAN vacíos en la dimensión (EAN de texto convertidos a vacío por el esquema) no son repetidos
+    df_productos = pd.DataFrame({'EAN': pd.array([None, 11, None, 22], dtype = 'Int64'),
+                                 'LINEA': ['X', 'Audio', 'Y', 'Television']})
+    df_ventas = pd.DataFrame({'EAN': pd.array([22, 11, None, 33, 22], dtype = 'Int64'), 'UNIDADES': [1, 2, 3, 4, 5]})
+
+    posiciones, df_sin_dimension = PosicionesDimension(df_ventas['EAN'], df_productos['EAN'])
+    np.testing.assert_array_equal(posiciones, [3, 1, -1, -1, 3])
+    assert df_sin_dimension.set_index('VALOR', drop = False)['FILAS'].to_dict() == {33: 1, None: 1}
+
+    df_resultado, _ = UnirDimensiones(df_ventas, [(df_productos, 'EAN')])
+    assert df_resultado['LINEA'].tolist()[:2] == ['Television', 'Audio']
+    assert df_resultado['LINEA'].isna().tolist() == [False, False, True, True, False]
+
+
+def test_llaves_repetidas_en_la_dimension():
+    df_sedes = pd.DataFrame({'PUNTO DE VENTA': ['A', 'B', 'A'], 'CIUDAD': ['BOGOTA', 'CALI', 'MEDELLIN']})
+
+    with pytest.raises(ValueError, match = 'repetidos'):
+        PosicionesDimension(pd.Series(['A'], name = 'PUNTO DE VENTA'), df_sedes['PUNTO DE VENTA'])